@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import gc
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+# setup(param) -> function to be timed
+Setup = Callable[[Any], Callable[[], Any]]
+
+
+@dataclass
+class Benchmark:
+    """A benchmark of a function returned by the setup function."""
+
+    name: str
+    setup: Setup
+    params: list[Any] = field(default_factory=lambda: [None])
+    quick_params: list[Any] | None = None
+    # number of operations in one call, to report the time per operation
+    ops: Callable[[Any], int] = lambda param: 1
+    # if true, the memory retained per operation is also measured
+    memory: bool = False
+    # seconds per operation that the median time must not exceed
+    budget: float | None = None
+
+    def ids(self, quick: bool = False) -> list[tuple[str, Any]]:
+        params = self.quick_params if quick and self.quick_params else self.params
+        if params == [None]:
+            return [(self.name, None)]
+        return [(f"{self.name}[{param}]", param) for param in params]
+
+    def run(self, param: Any, repeat: int) -> dict[str, float]:
+        """
+        Run the benchmark and return the statistics in seconds per operation.
+
+        If ``memory`` is true, the bytes retained per operation are also returned.
+        """
+        nops = self.ops(param)
+        times: list[float] = []
+        for _ in range(repeat):
+            func = self.setup(param)
+            t0 = time.perf_counter()
+            func()
+            times.append((time.perf_counter() - t0) / nops)
+        stats = {
+            "min": min(times),
+            "median": statistics.median(times),
+            "mean": statistics.fmean(times),
+            "repeat": repeat,
+        }
+        if self.memory:
+            stats["memory"] = self.measure_memory(param) / nops
+        if self.budget is not None:
+            stats["budget"] = self.budget
+        return stats
+
+    def measure_memory(self, param: Any) -> int:
+        """Bytes allocated by one call and still alive after it."""
+        func = self.setup(param)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = func()
+            gc.collect()
+            retained = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        del result
+        return retained
+
+
+BENCHMARKS: list[Benchmark] = []
+
+
+def benchmark(
+    name: str,
+    params: list[Any] | None = None,
+    *,
+    quick_params: list[Any] | None = None,
+    ops: Callable[[Any], int] | None = None,
+    memory: bool = False,
+    budget: float | None = None,
+) -> Callable[[Setup], Setup]:
+    """
+    Register a setup function as a benchmark.
+
+    If ``memory`` is true, the memory retained by the timed function, including
+    its return value, is also measured. If ``budget`` is given, the median time
+    per operation is checked against it in seconds.
+    """
+
+    def wrapper(setup: Setup) -> Setup:
+        bench = Benchmark(
+            name, setup, params or [None], quick_params, memory=memory, budget=budget
+        )
+        if ops is not None:
+            bench.ops = ops
+        BENCHMARKS.append(bench)
+        return setup
+
+    return wrapper
+
+
+_QAPP = None
+
+
+def get_qapp():
+    """Get the QApplication, which is kept alive during the benchmarks."""
+    global _QAPP
+    from qtpy import QtCore, QtWidgets as QtW
+
+    if (app := QtW.QApplication.instance()) is None:
+        app = QtW.QApplication([])
+        QtCore.qInstallMessageHandler(_message_handler)
+    _QAPP = app
+    return app
+
+
+def _message_handler(mode, context, message: str) -> None:
+    # the offscreen platform warns about unsupported window operations
+    if "This plugin does not support" not in message:
+        print(message, file=sys.stderr)
+    return None
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from functools import lru_cache
+import random
+
+from qt_command_palette import Command, FuzzyMatcher
+from qt_command_palette._commands import Query
+from qt_command_palette._list import QCommandList
+from qt_command_palette._matcher import SearchTable, SubstringMatcher
+
+from ._core import benchmark, get_qapp
+
+_WORDS = [
+    "open", "save", "close", "file", "edit", "view", "toggle", "line", "comment",
+    "format", "document", "selection", "terminal", "panel", "search", "replace",
+]  # fmt: skip
+_QUERY = "toggle comment"
+
+
+def _make_list(n: int, matcher: str) -> QCommandList:
+    get_qapp()
+    rng = random.Random(0)
+    commands = [
+        Command(
+            lambda: None,
+            rng.choice(_WORDS).title(),
+            " ".join(rng.choices(_WORDS, k=3)) + f" {i}",
+        )
+        for i in range(n)
+    ]
+    qlist = QCommandList()
+    qlist.set_matcher(matcher)
+    qlist.extend_command(commands)
+    qlist.update_for_text("")  # build the search table
+    return qlist
+
+
+def _keystrokes(param) -> int:
+    return len(_QUERY)
+
+
+for _matcher in ["substring", "fuzzy"]:
+
+    @benchmark(
+        f"update_for_text[{_matcher}]",
+        [1_000, 10_000, 100_000],
+        quick_params=[1_000],
+        ops=_keystrokes,
+    )
+    def update_for_text(n: int, matcher: str = _matcher):
+        """Time per keystroke of typing the query."""
+        qlist = _make_list(n, matcher)
+
+        def run():
+            for i in range(1, len(_QUERY) + 1):
+                qlist.update_for_text(_QUERY[:i])
+
+        return run
+
+
+_RETYPED = ["save", "export", "toggle"]
+
+
+@benchmark("retype", [10_000, 100_000], quick_params=[10_000], ops=lambda n: 30)
+def retype(n: int):
+    """Time per query of switching between a few queries typed before."""
+    qlist = _make_list(n, "fuzzy")
+    for text in _RETYPED:
+        qlist.update_for_text(text)
+
+    def run():
+        for _ in range(10):
+            for text in _RETYPED:
+                qlist.update_for_text(text)
+
+    return run
+
+
+@benchmark("paint_rows", [1_000], ops=lambda n: 20)
+def paint_rows(n: int):
+    """Time per repaint of the list, including rendering the markup."""
+    qlist = _make_list(n, "fuzzy")
+    qlist.resize(400, 600)
+    qlist.update_for_text("tog com")
+
+    def run():
+        for _ in range(20):
+            qlist.grab()
+
+    return run
+
+
+_SCAN_QUERIES = ["to", "ed li", "panel 12", "sea rep", "9"]
+
+for _backend, _threshold in [("loop", None), ("numpy", 0)]:
+
+    @benchmark(
+        f"substring_scan[{_backend}]",
+        [10_000, 100_000],
+        quick_params=[10_000],
+        ops=lambda n: len(_SCAN_QUERIES),
+    )
+    def substring_scan(n: int, threshold: int | None = _threshold):
+        """Time per query of matching all the commands without the index."""
+        table = SearchTable(_make_list(n, "substring").all_commands)
+        matcher = SubstringMatcher(numpy_threshold=threshold)
+        queries = [Query(text) for text in _SCAN_QUERIES]
+        matcher.match(queries[0], table, range(len(table)), 20)  # build signatures
+
+        def run():
+            for query in queries:
+                matcher.match(query, table, range(len(table)), 20)
+
+        return run
+
+
+# per-keystroke budget of fuzzy scoring and selection at 50k commands
+KEYSTROKE_BUDGET = 5e-3
+_TYPED = ["export", "toggle view", "close window", "opl"]
+
+
+@lru_cache(maxsize=1)
+def _budget_table() -> SearchTable:
+    rng = random.Random(0)
+    verbs = [
+        "open", "save", "export", "import", "toggle", "show", "hide", "close",
+        "run", "debug", "format", "select", "copy", "paste", "delete", "rename",
+        "find", "replace", "zoom", "reset",
+    ]  # fmt: skip
+    nouns = [
+        "file", "window", "panel", "layer", "image", "table", "view", "editor",
+        "terminal", "settings", "theme", "plugin", "project", "selection",
+        "history", "cursor", "tab", "workspace", "graph", "console",
+    ]  # fmt: skip
+    groups = [
+        "File", "Edit", "View", "Layers", "Image", "Plugins", "Window", "Help",
+        "Tools", "Analysis",
+    ]  # fmt: skip
+    commands = [
+        Command(
+            lambda: None,
+            rng.choice(groups),
+            f"{rng.choice(verbs).title()} {rng.choice(nouns)} {i}",
+        )
+        for i in range(50_000)
+    ]
+    table = SearchTable(commands)
+    table.char_masks()  # built once per version of the commands
+    return table
+
+
+@lru_cache(maxsize=None)
+def _narrowed(text: str) -> list[int]:
+    """Candidates of the query, narrowed down keystroke by keystroke."""
+    table = _budget_table()
+    if not text:
+        return list(range(len(table)))
+    candidates = _narrowed(text[:-1])
+    return FuzzyMatcher().match(Query(text), table, candidates, 80)[0]
+
+
+@benchmark(
+    "fuzzy_keystroke",
+    [text[:n] for text in _TYPED for n in range(1, len(text) + 1)],
+    quick_params=["e", "export"],
+    budget=KEYSTROKE_BUDGET,
+)
+def fuzzy_keystroke(text: str):
+    """Time of one keystroke at 50k commands, narrowed down as the list does."""
+    table = _budget_table()
+    matcher = FuzzyMatcher()
+    if len(text) > 1:
+        # the previous keystroke, whose matches are the candidates
+        query = Query(text[:-1])
+        candidates = matcher.match(query, table, _narrowed(text[:-2]), 80)[0]
+    else:
+        candidates = range(len(table))
+    query = Query(text)
+
+    def run():
+        matcher.match(query, table, candidates, 80)
+
+    return run
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import itertools
+
+from qt_command_palette import Command
+from qt_command_palette._api import CommandPalette
+from qt_command_palette._table import CommandTable
+
+from ._core import benchmark
+
+_counter = itertools.count()
+
+
+def _define(i: int):
+    def fn():
+        """Generated command."""
+
+    fn.__name__ = f"command_{i}"
+    return fn
+
+
+def _per_command(n: int) -> int:
+    return n
+
+
+@benchmark(
+    "register",
+    [1_000, 10_000, 100_000],
+    quick_params=[1_000],
+    ops=_per_command,
+    memory=True,
+)
+def register(n: int):
+    palette = CommandPalette(f"bench-register-{next(_counter)}")
+    funcs = [_define(i) for i in range(n)]
+
+    def run():
+        for func in funcs:
+            palette.register(func, "Group")
+
+    return run
+
+
+@benchmark(
+    "register_many",
+    [1_000, 10_000, 100_000],
+    quick_params=[1_000],
+    ops=_per_command,
+    memory=True,
+)
+def register_many(n: int):
+    palette = CommandPalette(f"bench-register-many-{next(_counter)}")
+    funcs = [_define(i) for i in range(n)]
+
+    def run():
+        palette.register_many(funcs)
+
+    return run
+
+
+def _generated_commands(n: int):
+    for i in range(n):
+        yield Command(_noop, "Group", f"generated command {i}")
+
+
+def _noop():
+    pass
+
+
+@benchmark(
+    "command_list",
+    [100_000],
+    quick_params=[1_000],
+    ops=_per_command,
+    memory=True,
+)
+def command_list(n: int):
+    """Memory of the commands kept as objects, with their search keys."""
+
+    def run():
+        commands = list(_generated_commands(n))
+        for cmd in commands:
+            cmd.search_key
+        return commands
+
+    return run
+
+
+@benchmark(
+    "command_table",
+    [100_000],
+    quick_params=[1_000],
+    ops=_per_command,
+    memory=True,
+)
+def command_table(n: int):
+    """Memory of the commands kept in the columns of a table."""
+
+    def run():
+        return CommandTable(_generated_commands(n))
+
+    return run
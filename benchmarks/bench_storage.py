@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from qt_command_palette._storage import Storage
+
+from ._core import benchmark
+
+
+def _chain(depth: int) -> Storage:
+    """A storage whose getter "v{depth}" depends on "v{depth - 1}" and so on."""
+    storage = Storage()
+    storage.mark_constant("v0", 0)
+    for i in range(1, depth + 1):
+        ns: dict = {}
+        exec(f"def v{i}(v{i - 1}):\n    return v{i - 1} + 1", ns)
+        storage.mark_getter(ns[f"v{i}"])
+    return storage
+
+
+@benchmark("storage_call", [1, 10, 100], ops=lambda depth: 1_000)
+def storage_call(depth: int):
+    """Time per call of a function that depends on a chain of getters."""
+    storage = _chain(depth)
+    ns: dict = {}
+    exec(f"def target(v{depth}):\n    return v{depth}", ns)
+    target = ns["target"]
+
+    def run():
+        for _ in range(1_000):
+            storage.call(target)
+
+    return run
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import itertools
+
+from qt_command_palette._api import CommandPalette
+
+from ._core import benchmark, get_qapp
+
+_counter = itertools.count()
+
+
+def _palette(ncommands: int) -> CommandPalette:
+    palette = CommandPalette(f"bench-widget-{next(_counter)}")
+
+    def fn():
+        pass
+
+    palette.register_many(
+        [
+            {"func": fn, "title": "Group", "desc": f"command {i}"}
+            for i in range(ncommands)
+        ]
+    )
+    return palette
+
+
+for _method in ["show", "show_center"]:
+
+    @benchmark(
+        f"{_method}", [1_000, 10_000, 100_000], quick_params=[1_000], ops=lambda n: 10
+    )
+    def show(n: int, method: str = _method):
+        """Latency of showing the palette, including filtering the empty query."""
+        from qtpy import QtWidgets as QtW
+
+        app = get_qapp()
+        parent = QtW.QWidget()
+        parent.resize(600, 400)
+        palette = _palette(n)
+        palette.install(parent)
+        widget = palette.get_widget(parent)
+
+        def run():
+            for _ in range(10):
+                getattr(widget, method)()
+                app.processEvents()
+                widget.hide()
+            parent.deleteLater()
+
+        return run
+
+
+@benchmark("reopen", [1_000, 10_000, 100_000], quick_params=[1_000], ops=lambda n: 10)
+def reopen(n: int):
+    """Latency of showing the palette again without any change since it was shown."""
+    from qtpy import QtWidgets as QtW
+
+    app = get_qapp()
+    parent = QtW.QWidget()
+    parent.resize(600, 400)
+    palette = _palette(n)
+    palette.install(parent)
+    widget = palette.get_widget(parent)
+    widget.show()
+    app.processEvents()
+    widget.hide()
+
+    def run():
+        for _ in range(10):
+            widget.show()
+            app.processEvents()
+            widget.hide()
+        parent.deleteLater()
+
+    return run
+
+
+@benchmark("update", [10, 100], ops=lambda n: n)
+def update(nparents: int):
+    """Time per parent of refreshing all the palettes of a command palette."""
+    from qtpy import QtWidgets as QtW
+
+    get_qapp()
+    palette = _palette(1_000)
+    parents = [QtW.QWidget() for _ in range(nparents)]
+    for parent in parents:
+        palette.install(parent)
+    palette.prewarm()
+
+    def run():
+        palette.update()
+        for parent in parents:
+            parent.deleteLater()
+
+    return run
+
+
+@benchmark("install", [10, 100], ops=lambda n: n)
+def install(nparents: int):
+    """Time per parent of installing a command palette."""
+    from qtpy import QtWidgets as QtW
+
+    get_qapp()
+    palette = _palette(1_000)
+    parents = [QtW.QWidget() for _ in range(nparents)]
+
+    def run():
+        for parent in parents:
+            palette.install(parent, "Ctrl+Shift+P")
+
+    return run
@@ -0,0 +1,173 @@
+"""
+Run the benchmarks headlessly and store the results.
+
+Usage
+-----
+$ python -m benchmarks.run  # save the results to benchmarks/results/<commit>.json
+$ python -m benchmarks.run --quick --filter update_for_text
+$ python -m benchmarks.run --compare benchmarks/results/<old>.json
+$ python -m benchmarks.run --filter fuzzy_keystroke  # fails if over the budget
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from . import bench_filter, bench_register, bench_storage, bench_widget  # noqa
+from ._core import BENCHMARKS
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+REGRESSION_THRESHOLD = 1.2
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(__file__),
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return out.stdout.strip()
+
+
+def _environment() -> dict[str, str]:
+    import qtpy
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "qt_api": qtpy.API_NAME,
+        "qt": qtpy.QT_VERSION or "",
+    }
+
+
+def run_benchmarks(
+    pattern: str = "", quick: bool = False, repeat: int = 5
+) -> dict[str, dict[str, float]]:
+    """Run the benchmarks whose names contain the pattern."""
+    results: dict[str, dict[str, float]] = {}
+    for bench in BENCHMARKS:
+        for name, param in bench.ids(quick):
+            if pattern not in name:
+                continue
+            results[name] = stats = bench.run(param, repeat)
+            line = f"{name:<40} {_format_time(stats['median']):>12}"
+            if "memory" in stats:
+                line += f" {stats['memory']:>10.1f} B"
+            if stats["median"] > stats.get("budget", float("inf")):
+                line += f"  (over budget of {_format_time(stats['budget'])})"
+            print(line, flush=True)
+    return results
+
+
+def over_budget(results: dict[str, dict[str, float]]) -> list[str]:
+    """Return the names of the benchmarks slower than their budgets."""
+    return [
+        name
+        for name, stats in results.items()
+        if stats["median"] > stats.get("budget", float("inf"))
+    ]
+
+
+def compare(
+    base: dict[str, dict[str, float]], new: dict[str, dict[str, float]]
+) -> list[str]:
+    """Print the comparison and return the names of the regressed benchmarks."""
+    regressed: list[str] = []
+    print(f"{'benchmark':<40} {'base':>12} {'new':>12} {'ratio':>8}")
+    for name, stats in new.items():
+        if name not in base:
+            continue
+        ratio = stats["median"] / base[name]["median"]
+        mark = ""
+        if ratio > REGRESSION_THRESHOLD:
+            regressed.append(name)
+            mark = "  (slower)"
+        elif ratio < 1 / REGRESSION_THRESHOLD:
+            mark = "  (faster)"
+        print(
+            f"{name:<40} {_format_time(base[name]['median']):>12} "
+            f"{_format_time(stats['median']):>12} {ratio:>7.2f}x{mark}"
+        )
+    return regressed
+
+
+def _format_time(sec: float) -> str:
+    if sec < 1e-3:
+        return f"{sec * 1e6:.1f} us"
+    elif sec < 1:
+        return f"{sec * 1e3:.2f} ms"
+    return f"{sec:.2f} s"
+
+
+def _load(path: str) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-k", "--filter", default="", help="run matching benchmarks")
+    parser.add_argument("--quick", action="store_true", help="use small sizes only")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", help="path of the result JSON file")
+    parser.add_argument("--no-save", action="store_true", help="do not save results")
+    parser.add_argument("--compare", help="result JSON file to compare with")
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help=f"exit with 1 if {REGRESSION_THRESHOLD}x slower than the compared",
+    )
+    parser.add_argument(
+        "--ignore-budget",
+        action="store_true",
+        help="do not exit with 1 if a benchmark is slower than its budget",
+    )
+    args = parser.parse_args(argv)
+
+    from ._core import get_qapp
+
+    get_qapp()
+    commit = _git_commit()
+    results = run_benchmarks(args.filter, quick=args.quick, repeat=args.repeat)
+    if not args.no_save:
+        output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "commit": commit,
+                    "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "quick": args.quick,
+                    "environment": _environment(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"saved to {output}")
+    if args.compare:
+        regressed = compare(_load(args.compare)["results"], results)
+        if regressed and args.fail_on_regression:
+            return 1
+    if (slow := over_budget(results)) and not args.ignore_budget:
+        print(f"over budget: {', '.join(slow)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
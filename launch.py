@@ -32,13 +32,13 @@ if __name__ == "__main__":
     group_0 = palette.add_group("Example")
     group_1 = palette.add_group("Something new")
 
-    for txt in ["foo", "bar", "baz"]:
-        group_0.register(define(txt))
+    group_0.register_many([define(txt) for txt in ["foo", "bar", "baz"]])
 
     group_0.register(define("only if checked"), when=_checkbox.isChecked)
 
-    for txt in ["hello world", "goobye world", "hello again"]:
-        group_1.register(define(txt))
+    group_1.register_many(
+        [define(txt) for txt in ["hello world", "goobye world", "hello again"]]
+    )
 
     group_1.register(define("only if checked"), when=_checkbox.isChecked)
 
@@ -1,5 +1,23 @@
-from ._api import get_palette, add_group, register
+from ._api import get_palette, add_group, register, register_lazy
 from ._commands import Command
+from ._provider import CommandProvider
+from ._matcher import Matcher, SubstringMatcher, FuzzyMatcher
+from ._sharded import ShardedMatcher
 from ._storage import get_storage
+from ._stats import Instrumentation, get_instrumentation
 
-__all__ = ["Command", "get_palette", "add_group", "register", "get_storage"]
+__all__ = [
+    "Command",
+    "CommandProvider",
+    "Matcher",
+    "SubstringMatcher",
+    "FuzzyMatcher",
+    "ShardedMatcher",
+    "get_palette",
+    "add_group",
+    "register",
+    "register_lazy",
+    "get_storage",
+    "Instrumentation",
+    "get_instrumentation",
+]
@@ -1,14 +1,31 @@
 from __future__ import annotations
 
 from enum import Enum
-from functools import wraps
-from typing import Any, Callable, TypeVar, overload, TYPE_CHECKING
+import json
+import os
+import re
+from typing import Any, Callable, Iterable, Mapping, TypeVar, overload, TYPE_CHECKING
 import weakref
 import inspect
-from ._commands import Command
+from ._commands import Command, ExecutionPolicy, LazyFunction
+from ._context import ContextKeys, WhenClause
+from ._cache import LRUCache
+from ._matcher import (
+    RESULT_CACHE_SIZE,
+    Matcher,
+    MatchResult,
+    SubstringMatcher,
+    as_matcher,
+)
+from ._history import PersistentHistory, UsageHistory
+from ._provider import CommandProvider
 from ._storage import Storage
+from ._store import CommandStore
+from ._table import CommandTable
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from ._executor import CommandExecutor
     from ._widget import QCommandPalette
     from qtpy import QtWidgets as QtW
 
@@ -27,7 +44,8 @@ def register_with_func(
     title: str | None = None,
     desc: str | None = None,
     tooltip: str | None = None,
-    when: Callable[[], bool] = _always_true,
+    when: Callable[[], bool] | str = _always_true,
+    policy: str | None = None,
 ):
     """Template function to provide signature to register() with 'func' argument."""
 
@@ -37,11 +55,37 @@ def register_without_func(
     title: str | None = None,
     desc: str | None = None,
     tooltip: str | None = None,
-    when: Callable[[], bool] = _always_true,
+    when: Callable[[], bool] | str = _always_true,
+    policy: str | None = None,
 ):
     """Template function to provide signature to register() without 'func' argument."""
 
 
+# keys of an entry of register_many
+_ENTRY_KEYS = frozenset(["func", "title", "desc", "tooltip", "when", "policy"])
+
+
+def _read_manifest(path: str | os.PathLike) -> Any:
+    """Read a JSON or TOML manifest file."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    elif ext == ".toml":
+        try:
+            import tomllib
+        except ImportError:  # python < 3.11
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ImportError(
+                    "Reading TOML manifests requires python>=3.11 or tomli."
+                ) from None
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    raise ValueError(f"Manifest must be a JSON or TOML file, got {path!r}")
+
+
 class Alignment(Enum):
     """Alignment flag of the palette."""
 
@@ -57,26 +101,137 @@ _default = _Default()
 
 
 class CommandPalette:
-    """The command palette interface."""
+    """
+    The command palette interface.
+
+    If ``compact`` is true, the commands are stored in the columns of a command
+    table instead of a list of command objects, which takes less memory for
+    large generated catalogs.
+    """
 
     def __init__(
-        self, name: str, *, alignment: str | Alignment = Alignment.parent
+        self,
+        name: str,
+        *,
+        alignment: str | Alignment = Alignment.parent,
+        matcher: Matcher | str | None = None,
+        compact: bool = False,
     ) -> None:
-        self._commands: list[Command] = []
+        self._store = CommandStore(CommandTable() if compact else ())
         self._parent_to_palette_map: dict[int, QCommandPalette] = {}
         self._palette_to_parent_map: WVDict = weakref.WeakValueDictionary()
+        # parents installed on, whose widgets are not built yet
+        self._uninitialized_parents: WVDict = weakref.WeakValueDictionary()
         self._name = name
         self._alignment = Alignment(alignment)
+        if matcher is None:
+            matcher = SubstringMatcher()
+        self._matcher = as_matcher(matcher)
+        self._async_filtering: tuple[bool, int] = (False, 30)
+        self._max_rows: int | None = None
+        self._executor: CommandExecutor | None = None
+        self._context = ContextKeys()
+        self._history = UsageHistory()
+        self._providers: list[CommandProvider] = []
+        self._results: LRUCache[tuple, MatchResult] = LRUCache(RESULT_CACHE_SIZE)
 
     @property
     def alignment(self) -> Alignment:
         """Alignment flag of the palette."""
         return self._alignment
 
+    @property
+    def executor(self) -> CommandExecutor:
+        """
+        The executor of the commands.
+
+        Connect to its ``started``, ``finished`` and ``errored`` signals to be
+        notified of the command executions.
+        """
+        if self._executor is None:
+            from ._executor import CommandExecutor
+
+            self._executor = CommandExecutor()
+        return self._executor
+
+    def set_max_concurrent(self, value: int) -> None:
+        """
+        Set the maximum number of commands running in the background.
+
+        The limit of the existing executor is changed, so that the connections to
+        its signals are kept.
+        """
+        if self._executor is None:
+            from ._executor import CommandExecutor
+
+            self._executor = CommandExecutor(max_concurrent=value)
+        else:
+            self._executor.set_max_concurrent(value)
+        return None
+
+    @property
+    def context(self) -> ContextKeys:
+        """
+        The context keys used to evaluate the ``when`` clauses of the commands.
+
+        >>> palette.context["hasSelection"] = True
+        >>> palette.context.add_getter("readOnly", lambda: editor.isReadOnly())
+        >>> palette.context.invalidate("readOnly")  # notify the value changed
+        """
+        return self._context
+
+    @property
+    def history(self) -> UsageHistory:
+        """The usage history used to rank the recently used commands first."""
+        return self._history
+
+    def use_persistent_history(
+        self, directory: str | os.PathLike | None = None
+    ) -> PersistentHistory:
+        """
+        Save the usage history of this palette to a file.
+
+        The file is named after the palette and placed in ``directory``, which is
+        "~/.qt_command_palette" by default. It is read lazily when the history is
+        used for the first time.
+        """
+        if directory is None:
+            directory = os.path.join(os.path.expanduser("~"), ".qt_command_palette")
+        filename = re.sub(r"[^\w.-]", "_", self._name) + ".history"
+        history = PersistentHistory.instance(os.path.join(directory, filename))
+        self._history = history
+        for p in self._palette_to_parent_map.values():
+            self.get_widget(p)._list.set_history(history)
+        return history
+
+    @property
+    def matcher(self) -> Matcher:
+        """The matcher used to filter and rank the commands."""
+        return self._matcher
+
+    @property
+    def result_cache(self) -> LRUCache[tuple, MatchResult]:
+        """
+        The cache of the match results of the recent queries.
+
+        The results are keyed by the query and the version of the commands, so that
+        registering, removing or sorting commands never returns a stale result.
+        When the usage history is changed, only the cached matches are ranked
+        again. Its ``hits`` and ``misses`` count the lookups.
+        """
+        return self._results
+
+    def set_result_cache_size(self, maxsize: int | None) -> None:
+        """Set the maximum number of the cached match results (None for no limit)."""
+        self._results = LRUCache(maxsize)
+        for p in self._palette_to_parent_map.values():
+            self.get_widget(p)._list.set_result_cache(self._results)
+        return None
+
     @property
     def commands(self) -> list[Command]:
         """List of all the commands."""
-        return self._commands.copy()
+        return self._store.commands
 
     @overload
     def register(
@@ -85,7 +240,8 @@ class CommandPalette:
         title: str | None,
         desc: str | None = None,
         tooltip: str | None = None,
-        when: Callable[[], bool] = _always_true,
+        when: Callable[[], bool] | str = _always_true,
+        policy: str | None = None,
     ) -> _F:
         ...
 
@@ -95,12 +251,39 @@ class CommandPalette:
         title: str | None,
         desc: str | None = None,
         tooltip: str | None = None,
-        when: Callable[[], bool] = _always_true,
+        when: Callable[[], bool] | str = _always_true,
+        policy: str | None = None,
     ) -> Callable[[_F], _F]:
         ...
 
     def register(self, *args, **kwargs):
-        """Register a function to the command palette."""
+        """
+        Register a function to the command palette.
+
+        Parameters
+        ----------
+        func : callable, optional
+            The function to register. If not given, a decorator is returned.
+        title : str, optional
+            Title of the command, such as the group name.
+        desc : str, optional
+            Description of the command. The function name is used by default.
+        tooltip : str, optional
+            Tooltip of the command. The function docstring is used by default.
+        when : callable or str, optional
+            The command is enabled only if this function returns True, or if this
+            clause of context keys, such as ``"hasSelection and not readOnly"``, is
+            true. The enabled state is evaluated once when the palette is shown,
+            and again only if the context keys it depends on are invalidated (see
+            ``CommandPalette.context``).
+        policy : str, optional
+            How the command is executed. "sync" calls the function in the GUI
+            thread, "thread" in a thread pool and "process" in a process pool
+            (the function and its arguments must be picklable). Coroutine
+            functions run in an asyncio event loop in a background thread by
+            default ("asyncio"). Executing a command returns a future of the
+            result; see ``CommandPalette.executor`` for the signals.
+        """
         if len(args) > 0 and callable(args[0]):
             bound = register_with_func.bind(*args, **kwargs)
         else:
@@ -114,30 +297,215 @@ class CommandPalette:
         title: str | None = bound_args["title"]
         desc: str | None = bound_args["desc"]
         tooltip: str | None = bound_args["tooltip"]
-        when: Callable[..., bool] = bound_args["when"]
+        when: Callable[..., bool] | str = bound_args["when"]
+        policy: str | None = bound_args["policy"]
+
+        def wrapper(func: _F) -> _F:
+            cmd = self._create_command(func, title, desc, tooltip, when, policy)
+            self._store.append(cmd)
+            return func
+
+        return wrapper if func is None else wrapper(func)
+
+    def register_lazy(
+        self,
+        path: str,
+        title: str | None = None,
+        desc: str | None = None,
+        tooltip: str | None = None,
+        when: Callable[[], bool] | str = _always_true,
+        policy: str | None = None,
+    ) -> Command:
+        """
+        Register a function by its "module:qualname" path.
+
+        The module is imported when the command is executed, or when its tooltip
+        is shown if ``tooltip`` is not given. Other parameters are the same as
+        ``register``.
+
+        Examples
+        --------
+        >>> palette.register_lazy("my_plugin.commands:run", "My Plugin")
+        """
+        func = LazyFunction(path)
+        cmd = self._create_command(func, title, desc, tooltip, when, policy)
+        self._store.append(cmd)
+        return cmd
+
+    def register_many(
+        self, entries: Iterable[Callable | Mapping[str, Any]]
+    ) -> list[Command]:
+        """
+        Register many functions at once.
+
+        The commands are added to the palette in one batch.
+
+        Parameters
+        ----------
+        entries : iterable of callable or dict
+            Functions to register, or dicts of the arguments of ``register``. The
+            "func" value of a dict is a function or a "module:qualname" path to be
+            imported lazily.
+
+        Examples
+        --------
+        >>> palette.register_many([
+        ...     func_0,
+        ...     {"func": func_1, "title": "My Commands", "when": "hasSelection"},
+        ...     {"func": "my_plugin.commands:run", "desc": "Run My Plugin"},
+        ... ])
+        """
+        commands = [self._command_from_entry(entry) for entry in entries]
+        self._store.extend(commands)
+        return commands
+
+    def load_manifest(
+        self, source: str | os.PathLike | Mapping[str, Any] | list
+    ) -> list[Command]:
+        """
+        Register the commands declared in a manifest.
+
+        A manifest is a JSON or TOML file with a "commands" array of the entries
+        of ``register_many``. The functions are given by "module:qualname" paths
+        and imported lazily.
+
+        Examples
+        --------
+        >>> palette.load_manifest("commands.toml")
 
+        where "commands.toml" is
+
+        .. code-block:: toml
+
+            [[commands]]
+            func = "my_plugin.commands:run"
+            title = "My Plugin"
+            when = "hasSelection"
+        """
+        if isinstance(source, (str, os.PathLike)):
+            source = _read_manifest(source)
+        if isinstance(source, Mapping):
+            source = source.get("commands", [])
+        for entry in source:
+            if not isinstance(entry, Mapping) or not isinstance(entry.get("func"), str):
+                raise ValueError(f"Invalid manifest entry: {entry!r}")
+        return self.register_many(source)
+
+    def register_provider(
+        self,
+        func: Callable[[str], Any],
+        title: str | None = None,
+        *,
+        batch_size: int = 50,
+        policy: str | None = None,
+    ) -> CommandProvider:
+        """
+        Register a function that provides commands depending on the input text.
+
+        The function is called with the input text whenever it changes, and returns
+        an iterable or an async iterable of ``Command`` objects or functions. It is
+        pulled in a background thread and the commands are appended to the list as
+        they arrive. The provider is cancelled when the text changes again or the
+        palette is hidden, which stops the iteration and closes the generator.
+
+        Parameters
+        ----------
+        func : callable
+            Function of the input text that provides the commands.
+        title : str, optional
+            Title of the provided commands that have no title.
+        batch_size : int, default 50
+            Maximum number of the commands appended to the list at once.
+        policy : str, optional
+            How the provided commands are executed. See ``register``.
+
+        Examples
+        --------
+        >>> @palette.register_provider
+        ... def open_recent(text: str):
+        ...     for path in recent_files():
+        ...         if text in path:
+        ...             yield Command(partial(open_file, path), "Open Recent", path)
+        """
+        if policy is not None:
+            ExecutionPolicy(policy)  # validate the name
+        provider = CommandProvider(
+            func,
+            title or "",
+            batch_size=batch_size,
+            wrap=lambda cmd, title: self._wrap_provided(cmd, title, policy),
+        )
+        self._providers.append(provider)
+        return provider
+
+    def remove_provider(self, provider: CommandProvider) -> None:
+        """Remove a provider registered by ``register_provider``."""
+        self._providers.remove(provider)
+        for widget in self._parent_to_palette_map.values():
+            widget._list.cancel_providers()
+        return None
+
+    def _wrap_provided(
+        self, provided: Command, title: str, policy: str | None
+    ) -> Command:
+        """Create a command that executes a provided command with the executor."""
+        submit = _Submit(self, provided.function, policy)
+        return Command(submit, title, provided.desc, provided.tooltip, provided.when)
+
+    def _command_from_entry(
+        self, entry: Callable | Mapping[str, Any], title: str | None = None
+    ) -> Command:
+        """Create a command from an entry of register_many."""
+        if callable(entry):
+            return self._create_command(entry, title, None, None, _always_true, None)
+        kwargs = dict(entry)
+        if unknown := kwargs.keys() - _ENTRY_KEYS:
+            raise ValueError(f"Unknown keys {sorted(unknown)} in entry {entry!r}")
+        func = kwargs.pop("func", None)
+        if isinstance(func, str):
+            func = LazyFunction(func)
+        elif not callable(func):
+            raise ValueError(f"Entry {entry!r} needs a 'func' to register.")
+        return self._create_command(
+            func,
+            kwargs.get("title", title),
+            kwargs.get("desc"),
+            kwargs.get("tooltip"),
+            kwargs.get("when", _always_true),
+            kwargs.get("policy"),
+        )
+
+    def _create_command(
+        self,
+        func: Callable | LazyFunction,
+        title: str | None,
+        desc: str | None,
+        tooltip: str | None,
+        when: Callable[[], bool] | str,
+        policy: str | None,
+    ) -> Command:
+        """Create a command that executes the function with the executor."""
         if title is None:
             title = ""
-
-        def wrapper(func: _F) -> _F:
-            nonlocal title, desc, tooltip
+        if isinstance(when, str):
+            when = WhenClause(when)
+        if isinstance(func, LazyFunction):
+            if desc is None:
+                desc = func.name
+            if tooltip is None:
+                tooltip = func.doc
+            if policy is not None:
+                ExecutionPolicy(policy)  # validate the name
+            submit = _Submit(self, func, policy)
+        else:
             if desc is None:
                 desc = getattr(func, "__name__", repr(func))
             if tooltip is None:
                 tooltip = getattr(func, "__doc__", "") or ""
+            Storage.instance(self._name).validate(func)
+            submit = _Submit(self, func, ExecutionPolicy.for_function(func, policy))
 
-            storage = Storage.instance(self._name)
-
-            @wraps(func)
-            def _func(qpallete):
-                parent = self._palette_to_parent_map[id(qpallete)]
-                return storage.call(func, parent)
-
-            cmd = Command(_func, title, desc, tooltip, when)
-            self._commands.append(cmd)
-            return func
-
-        return wrapper if func is None else wrapper(func)
+        return Command(submit, title, desc, tooltip, when)
 
     def add_group(self, title: str) -> CommandGroup:
         """Add a group to the command palette."""
@@ -150,46 +518,89 @@ class CommandPalette:
         _id = id(parent)
         if (widget := self._parent_to_palette_map.get(_id)) is None:
             widget = QCommandPalette()
-            widget.extend_command(self._commands)
+            widget._list.set_store(self._store)
+            widget._list.set_matcher(self._matcher)
+            widget._list.set_context(self._context)
+            widget._list.set_history(self._history)
+            widget._list.set_providers(self._providers)
+            if self._max_rows is not None:
+                widget._list.set_max_rows(self._max_rows)
+            widget._list.set_result_cache(self._results)
+            enabled, debounce = self._async_filtering
+            widget.set_async_filtering(enabled, debounce=debounce)
             self._parent_to_palette_map[_id] = widget
             self._palette_to_parent_map[id(widget)] = parent
+            if self._uninitialized_parents.pop(_id, None) is not None:
+                widget.install_to(parent)
         return widget
 
     def show_widget(self, parent: Any = _default) -> None:
         """Show command palette widget."""
+        Storage.instance(self._name).new_session()
         if self.alignment is Alignment.parent:
             self.get_widget(parent).show()
         else:
             self.get_widget(parent).show_center()
         return None
 
-    def install(self, parent: QtW.QWidget, keys: str | None = None) -> None:
+    def install(
+        self, parent: QtW.QWidget, keys: str | None = None, *, prewarm: bool = False
+    ) -> None:
         """
         Install command palette on a Qt widget.
 
+        The palette widget is built when it is shown for the first time.
+
         Parameters
         ----------
         parent : QtW.QWidget
             The widget to install on.
         keys : str, optional
             If given, this key sequence will be used to show the command palette.
+        prewarm : bool, default False
+            If true, the palette widget is built when the event loop is idle, so
+            that the first show is instant.
         """
-        widget = self.get_widget(parent)
-        widget.install_to(parent)
+        _id = id(parent)
+        if _id in self._parent_to_palette_map:
+            self._parent_to_palette_map[_id].install_to(parent)
+        else:
+            self._uninitialized_parents[_id] = parent
+            if prewarm:
+                _call_when_idle(self._prewarm_next)
         if keys is not None:
             _register_shortcut(keys, parent, lambda: self.show_widget(parent))
         return None
 
+    def prewarm(self) -> None:
+        """Build the palette widgets of all the installed parents."""
+        for parent in list(self._uninitialized_parents.values()):
+            self.get_widget(parent)
+        return None
+
+    def _prewarm_next(self) -> None:
+        # build one widget at a time, not to block the event loop
+        for parent in self._uninitialized_parents.values():
+            self.get_widget(parent)
+            break
+        if len(self._uninitialized_parents) > 0:
+            _call_when_idle(self._prewarm_next)
+        return None
+
     def update(self, parent: QtW.QWidget | None = None):
-        """Update command palette install to the given parent widget."""
+        """
+        Refresh the matches displayed in the command palette widgets.
+
+        All the widgets view the command store of this palette, so registered
+        commands are available without calling this method.
+        """
         if parent is None:
-            for p in self._palette_to_parent_map.values():
-                self.update(p)
-            return None
-        _id = id(parent)
-        widget = self._parent_to_palette_map[_id]
-        widget.clear_commands()
-        widget.extend_command(self._commands)
+            widgets = list(self._parent_to_palette_map.values())
+        else:
+            widgets = [self._parent_to_palette_map.get(id(parent))]
+        for widget in widgets:
+            if widget is not None:  # not built yet
+                widget._list.update_for_text(widget._line.text())
         return None
 
     def sort(
@@ -201,16 +612,102 @@ class CommandPalette:
             def rule(cmd: Command):
                 return cmd.title + cmd.desc
 
-        self._commands.sort(key=rule, reverse=reverse)
+        self._store.sort(key=rule, reverse=reverse)
+        return None
+
+    def set_matcher(self, matcher: Matcher | str) -> None:
+        """
+        Set the matcher used to filter and rank the commands.
+
+        Parameters
+        ----------
+        matcher : Matcher or str
+            A matcher instance, "substring" to display all the commands that
+            contain the input words in the list order, or "fuzzy" to rank the
+            commands by fuzzy matching.
+        """
+        self._matcher = as_matcher(matcher)
+        for p in self._palette_to_parent_map.values():
+            self.get_widget(p)._list.set_matcher(self._matcher)
+        return None
+
+    def set_async_filtering(self, enabled: bool = True, *, debounce: int = 30):
+        """
+        Enable or disable filtering commands in a background thread.
+
+        Parameters
+        ----------
+        enabled : bool, default True
+            If true, commands are filtered in a background thread and only the
+            result of the latest input text is displayed.
+        debounce : int, default 30
+            Text changes within this interval (in milliseconds) are coalesced
+            into one filtering.
+        """
+        self._async_filtering = (enabled, debounce)
+        for p in self._palette_to_parent_map.values():
+            self.get_widget(p).set_async_filtering(enabled, debounce=debounce)
         return None
 
     def set_max_rows(self, value: int) -> None:
         """Set the maximum number of rows in the command palette."""
+        if value < 0:
+            raise ValueError("max_rows must be non-negative")
+        self._max_rows = value
         for p in self._palette_to_parent_map.values():
             self.get_widget(p)._list.set_max_rows(value)
         return None
 
 
+class _Submit:
+    """
+    The function of a palette command.
+
+    Called with the palette widget, it resolves the arguments of the registered
+    function from the storage and submits it to the executor. A policy given by
+    name is determined when called, as a lazy function is not imported yet. The
+    executed command is given by the caller and not kept, as it may be a view of
+    a command table.
+    """
+
+    __slots__ = ("palette", "func", "policy")
+
+    def __init__(
+        self,
+        palette: CommandPalette,
+        func: Callable | LazyFunction,
+        policy: ExecutionPolicy | str | None,
+    ) -> None:
+        self.palette = palette
+        self.func = func
+        self.policy = policy
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.func!r})"
+
+    def __getattr__(self, name: str) -> Any:
+        # as functools.wraps does
+        if name in ("__name__", "__qualname__"):
+            return getattr(self.func, name)
+        raise AttributeError(name)
+
+    @property
+    def __wrapped__(self) -> Callable:
+        return self.func
+
+    def __call__(self, qpallete, command: Command | None = None) -> Future:
+        palette = self.palette
+        parent = palette._palette_to_parent_map[id(qpallete)]
+        func = self.func
+        if isinstance(func, LazyFunction):
+            func = func.resolve()
+        policy = self.policy
+        if not isinstance(policy, ExecutionPolicy):
+            policy = ExecutionPolicy.for_function(func, policy)
+        args = Storage.instance(palette._name).resolve_args(func, parent)
+        return palette.executor.submit(command, func, args, policy)
+
+
 class CommandGroup:
     def __init__(self, title: str, parent: CommandPalette) -> None:
         self._palette_ref = weakref.ref(parent)
@@ -237,7 +734,8 @@ class CommandGroup:
         func: _F,
         desc: str | None = None,
         tooltip: str | None = None,
-        when: Callable[[], bool] = _always_true,
+        when: Callable[[], bool] | str = _always_true,
+        policy: str | None = None,
     ) -> _F:
         ...
 
@@ -246,7 +744,8 @@ class CommandGroup:
         self,
         desc: str | None = None,
         tooltip: str | None = None,
-        when: Callable[[], bool] = _always_true,
+        when: Callable[[], bool] | str = _always_true,
+        policy: str | None = None,
     ) -> Callable[[_F], _F]:
         ...
 
@@ -263,6 +762,30 @@ class CommandGroup:
 
         return self.palette.register(*args, **kwargs)
 
+    def register_many(
+        self, entries: Iterable[Callable | Mapping[str, Any]]
+    ) -> list[Command]:
+        """Register many functions to this group at once."""
+        palette = self.palette
+        commands: list[Command] = []
+        for entry in entries:
+            if isinstance(entry, Mapping) and "title" in entry:
+                raise ValueError(f"Entry of a group cannot have a title: {entry!r}")
+            commands.append(palette._command_from_entry(entry, self.title))
+        palette._store.extend(commands)
+        return commands
+
+    def register_lazy(
+        self,
+        path: str,
+        desc: str | None = None,
+        tooltip: str | None = None,
+        when: Callable[[], bool] | str = _always_true,
+        policy: str | None = None,
+    ) -> Command:
+        """Register a function by its "module:qualname" path to this group."""
+        return self.palette.register_lazy(path, self.title, desc, tooltip, when, policy)
+
 
 def _register_shortcut(keys: str, parent: QtW.QWidget, target: Callable):
     """Register a callback to a key-binding globally."""
@@ -278,6 +801,14 @@ def _register_shortcut(keys: str, parent: QtW.QWidget, target: Callable):
     return None
 
 
+def _call_when_idle(callback: Callable[[], Any]) -> None:
+    """Call the callback after the pending events are processed."""
+    from qtpy import QtCore
+
+    QtCore.QTimer.singleShot(0, callback)
+    return None
+
+
 _GLOBAL_PALETTES: dict[str, CommandPalette] = {}
 _DEFAULT_PALETTE = CommandPalette(name="default")
 
@@ -286,10 +817,13 @@ def get_palette(
     name: str | None = None,
     *,
     alignment: str | Alignment = Alignment.parent,
+    compact: bool = False,
 ) -> CommandPalette:
     """
     Get the global command palette object.
 
+    ``compact`` is used when the palette is created; see ``CommandPalette``.
+
     Examples
     --------
     >>> palette = get_palette()  # get the default palette
@@ -303,7 +837,7 @@ def get_palette(
         raise TypeError(f"Expected str, got {type(name).__name__}")
     if (palette := _GLOBAL_PALETTES.get(name, None)) is None:
         palette = _GLOBAL_PALETTES[name] = CommandPalette(
-            name=name, alignment=alignment
+            name=name, alignment=alignment, compact=compact
         )
     else:
         palette._alignment = alignment
@@ -327,7 +861,8 @@ def register(
     title: str | None,
     desc: str | None = None,
     tooltip: str | None = None,
-    when: Callable[[], bool] = _always_true,
+    when: Callable[[], bool] | str = _always_true,
+    policy: str | None = None,
 ) -> _F:
     ...
 
@@ -337,7 +872,8 @@ def register(
     title: str | None,
     desc: str | None = None,
     tooltip: str | None = None,
-    when: Callable[[], bool] = _always_true,
+    when: Callable[[], bool] | str = _always_true,
+    policy: str | None = None,
 ) -> Callable[[_F], _F]:
     ...
 
@@ -356,3 +892,21 @@ def register(*args, **kwargs):
     ...     print("Hello World!")
     """
     return get_palette().register(*args, **kwargs)
+
+
+def register_lazy(
+    path: str,
+    title: str | None = None,
+    desc: str | None = None,
+    tooltip: str | None = None,
+    when: Callable[[], bool] | str = _always_true,
+    policy: str | None = None,
+) -> Command:
+    """
+    Register a function by its "module:qualname" path to the global command palette.
+
+    Examples
+    --------
+    >>> register_lazy("my_plugin.commands:run", "My Plugin")
+    """
+    return get_palette().register_lazy(path, title, desc, tooltip, when, policy)
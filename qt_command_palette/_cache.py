@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import threading
+import time
+from typing import Any, Generic, Hashable, TypeVar
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+_MISSING: Any = object()
+
+
+class LRUCache(Generic[_K, _V]):
+    """
+    A thread-safe mapping that keeps the ``maxsize`` most recently used items.
+
+    If ``ttl`` is given, items older than ``ttl`` seconds are treated as missing.
+    The numbers of the hits and misses of ``get`` are counted.
+    """
+
+    def __init__(self, maxsize: int | None = 128, ttl: float | None = None) -> None:
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: OrderedDict[_K, tuple[_V, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(maxsize={self._maxsize}, ttl={self._ttl}, "
+            f"<{len(self)} items>)"
+        )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: _K) -> bool:
+        with self._lock:
+            return self._lookup(key) is not _MISSING
+
+    @property
+    def maxsize(self) -> int | None:
+        """The maximum number of items."""
+        return self._maxsize
+
+    @property
+    def ttl(self) -> float | None:
+        """Time to live of the items in seconds."""
+        return self._ttl
+
+    @property
+    def hits(self) -> int:
+        """The number of the items found by ``get``."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """The number of the items not found by ``get``."""
+        return self._misses
+
+    def get(self, key: _K, default: Any = None) -> _V | Any:
+        """Get the item and mark it as the most recently used one."""
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self._misses += 1
+                return default
+            self._hits += 1
+            return value
+
+    def _lookup(self, key: _K) -> _V | Any:
+        """Get the item, or _MISSING; the lock has to be held."""
+        try:
+            value, expires = self._data[key]
+        except KeyError:
+            return _MISSING
+        if self._ttl is not None and expires < time.monotonic():
+            del self._data[key]
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: _K, value: _V) -> None:
+        """Add an item, evicting the least recently used one if full."""
+        if self._ttl is not None:
+            expires = time.monotonic() + self._ttl
+        else:
+            expires = 0.0
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            if self._maxsize is not None and len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+        return None
+
+    def pop(self, key: _K, default: Any = None) -> _V | Any:
+        """Remove the item."""
+        with self._lock:
+            try:
+                return self._data.pop(key)[0]
+            except KeyError:
+                return default
+
+    def clear(self) -> None:
+        """Remove all the items."""
+        with self._lock:
+            self._data.clear()
+        return None
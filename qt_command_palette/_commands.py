@@ -1,36 +1,303 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Callable, Generic, TypeVar
+from enum import Enum
+import importlib
+import inspect
+import re
+import sys
+import threading
+from typing import Any, Callable, Generic, Mapping, TypeVar, TYPE_CHECKING
+import weakref
 
+from ._context import WhenClause
+
+if TYPE_CHECKING:
+    from ._store import CommandStore
 
 _R = TypeVar("_R")
 
 
-@dataclass
+def _always_true() -> bool:
+    return True
+
+
+def _intern(text: str) -> str:
+    # titles are shared by many commands
+    return sys.intern(text) if type(text) is str else text
+
+
 class Command(Generic[_R]):
-    """A command representation."""
+    """
+    A command representation.
+
+    Commands are slotted and their titles are interned, so that a palette of many
+    commands stays small in memory.
+    """
+
+    __slots__ = (
+        "function",
+        "_title",
+        "_desc",
+        "tooltip",
+        "when",
+        "_fmt",
+        "_search_key",
+        "_stores",
+        "__weakref__",
+    )
 
-    function: Callable[..., _R]
-    title: str
-    desc: str
-    tooltip: str = ""
-    when: Callable[..., bool] = field(default=lambda: True)
+    def __init__(
+        self,
+        function: Callable[..., _R],
+        title: str,
+        desc: str,
+        tooltip: str | Callable[[], str] = "",
+        when: Callable[..., bool] | WhenClause = _always_true,
+    ) -> None:
+        self.function = function
+        self._title = _intern(title)
+        self._desc = desc
+        self.tooltip = tooltip
+        self.when = when
+        self._fmt: str | None = None
+        self._search_key: str | None = None
+        # weak references to the stores of the command, notified of renames
+        self._stores: tuple[weakref.ref[CommandStore], ...] = ()
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(function={self.function!r}, title={self.title!r}, "
+            f"desc={self.desc!r}, tooltip={self.tooltip!r}, when={self.when!r})"
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is self.__class__:
+            return self._fields() == other._fields()
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
 
     def __call__(self, *args, **kwargs) -> _R:
         return self.function(*args, **kwargs)
 
+    def _fields(self) -> tuple:
+        return (self.function, self._title, self._desc, self.tooltip, self.when)
+
+    @property
+    def title(self) -> str:
+        """Title of the command, such as the group name."""
+        return self._title
+
+    @title.setter
+    def title(self, value: str) -> None:
+        self._title = _intern(value)
+        self._renamed()
+
+    @property
+    def desc(self) -> str:
+        """Description of the command."""
+        return self._desc
+
+    @desc.setter
+    def desc(self, value: str) -> None:
+        self._desc = value
+        self._renamed()
+
+    def _renamed(self) -> None:
+        self._fmt = self._search_key = None  # invalidate cached texts
+        for ref in self._stores:
+            if (store := ref()) is not None:
+                store._changed()
+        return None
+
     def fmt(self) -> str:
         """Format command for display in the palette."""
-        if self.title:
-            return f"{self.title}: {self.desc}"
-        return self.desc
+        if (text := self._fmt) is None:
+            if self._title:
+                text = f"{self._title}: {self._desc}"
+            else:
+                text = self._desc
+            self._fmt = text
+        return text
 
-    def matches(self, input_text: str) -> bool:
+    @property
+    def search_key(self) -> str:
+        """The case-folded text used for matching."""
+        if (key := self._search_key) is None:
+            key = self._search_key = self.fmt().lower()
+        return key
+
+    def get_tooltip(self) -> str:
+        """Get the tooltip text, which may be loaded lazily."""
+        if callable(self.tooltip):
+            self.tooltip = self.tooltip()
+        return self.tooltip
+
+    def matches(self, input_text: str | Query) -> bool:
         """Return True if the command matches the input text."""
-        fmt = self.fmt().lower()
-        words = input_text.lower().split(" ")
-        return all(word in fmt for word in words)
+        if not isinstance(input_text, Query):
+            input_text = Query(input_text)
+        return input_text.matches(self)
+
+    def enabled(self, context: Mapping[str, Any] | None = None) -> bool:
+        """
+        Return True if the command is enabled.
 
-    def enabled(self) -> bool:
-        """Return True if the command is enabled."""
+        A when clause is evaluated with the given context keys.
+        """
+        if isinstance(self.when, WhenClause):
+            return self.when.evaluate(context if context is not None else {})
         return self.when()
+
+
+class Query:
+    """
+    A compiled query.
+
+    A query is built once from the input text and can be reused to match many
+    commands.
+    """
+
+    __slots__ = ("_text", "_words", "_pattern")
+
+    def __init__(self, text: str) -> None:
+        self._text = text
+        self._words = tuple(word for word in text.lower().split(" ") if word)
+        self._pattern: re.Pattern | None = None
+
+    def __repr__(self) -> str:
+        return f"Query({self._text!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Query):
+            return self._words == other._words
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._words)
+
+    @property
+    def text(self) -> str:
+        """The original input text."""
+        return self._text
+
+    @property
+    def words(self) -> tuple[str, ...]:
+        """Case-folded non-empty words of the query."""
+        return self._words
+
+    def pattern(self) -> re.Pattern:
+        """The case-insensitive pattern that finds any of the words in a text."""
+        if self._pattern is None:
+            # longer words first, so that the longest occurrence is found
+            words = sorted(self._words, key=len, reverse=True)
+            self._pattern = re.compile(
+                "|".join(re.escape(word) for word in words), re.IGNORECASE
+            )
+        return self._pattern
+
+    def matches(self, cmd: Command) -> bool:
+        """Return True if the command matches this query."""
+        key = cmd.search_key
+        for word in self._words:
+            if word not in key:
+                return False
+        return True
+
+    def refines(self, other: Query) -> bool:
+        """
+        Return True if this query is a refinement of the other query.
+
+        A refinement never matches a command that the other query does not match,
+        so the matches of ``other`` can be narrowed down instead of scanning all
+        the commands again.
+        """
+        for old_word in other._words:
+            if not any(old_word in word for word in self._words):
+                return False
+        return True
+
+
+class ExecutionPolicy(Enum):
+    """How a command is executed."""
+
+    sync = "sync"  # call in the GUI thread
+    thread = "thread"  # call in a thread pool
+    process = "process"  # call in a process pool
+    asyncio = "asyncio"  # run the coroutine in the asyncio event loop thread
+
+    @classmethod
+    def for_function(cls, func: Callable, policy: str | None) -> ExecutionPolicy:
+        """Determine the execution policy of the function."""
+        is_coroutine = inspect.iscoroutinefunction(func)
+        if policy is None:
+            return cls.asyncio if is_coroutine else cls.sync
+        policy = cls(policy)
+        if is_coroutine != (policy is cls.asyncio):
+            raise ValueError(
+                f"Policy {policy.value!r} cannot be used for {func!r}. Only "
+                "coroutine functions can be executed with 'asyncio' policy."
+            )
+        return policy
+
+
+class LazyFunction:
+    """
+    A function specified by a "module:qualname" path, imported on first use.
+
+    >>> func = LazyFunction("my_plugin.commands:run")  # not imported yet
+    >>> func()  # my_plugin.commands is imported here
+    """
+
+    __slots__ = ("_path", "_func", "_lock")
+
+    def __init__(self, path: str) -> None:
+        module, sep, qualname = path.partition(":")
+        if not sep or not module or not qualname:
+            raise ValueError(f"Expected 'module:qualname', got {path!r}")
+        self._path = path
+        self._func: Callable[..., Any] | None = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._path!r})"
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    @property
+    def path(self) -> str:
+        """The "module:qualname" path of the function."""
+        return self._path
+
+    @property
+    def name(self) -> str:
+        """Name of the function, available without importing."""
+        return self._path.rsplit(":", 1)[1].rsplit(".", 1)[-1]
+
+    def is_resolved(self) -> bool:
+        """True if the function is already imported."""
+        return self._func is not None
+
+    def resolve(self) -> Callable[..., Any]:
+        """Import the module and return the function."""
+        if (func := self._func) is not None:
+            return func
+        with self._lock:
+            if self._func is None:
+                module_name, _, qualname = self._path.partition(":")
+                obj: Any = importlib.import_module(module_name)
+                for attr in qualname.split("."):
+                    obj = getattr(obj, attr)
+                if not callable(obj):
+                    raise TypeError(f"{self._path!r} is not callable")
+                self._func = obj
+            return self._func
+
+    def doc(self) -> str:
+        """Import the function and return its docstring."""
+        try:
+            func = self.resolve()
+        except Exception:
+            # the error is raised when the command is executed
+            return ""
+        return getattr(func, "__doc__", "") or ""
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import ast
+import re
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Mapping
+import weakref
+
+from . import _stats
+
+if TYPE_CHECKING:
+    from ._commands import Command
+
+    _Callback = Callable[["frozenset[str] | None"], None]
+
+# nodes allowed in a when clause
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BoolOp,
+    ast.And,
+    ast.Or,
+    ast.UnaryOp,
+    ast.Not,
+    ast.Compare,
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+    ast.In,
+    ast.NotIn,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.Tuple,
+    ast.List,
+)
+
+# string literals are matched first so that the operators in them are kept
+_OPERATOR_PATTERN = re.compile(r"('[^']*'|\"[^\"]*\")|&&|\|\||!(?!=)")
+_OPERATORS = {"&&": " and ", "||": " or ", "!": " not "}
+_LITERALS = {"true": True, "false": False}
+
+
+def _translate_operator(m: re.Match) -> str:
+    if m.group(1) is not None:
+        return m.group(1)
+    return _OPERATORS[m.group(0)]
+
+
+class WhenClause:
+    """
+    A compiled ``when`` clause of a command.
+
+    A clause is an expression of context keys, such as ``"hasSelection and not
+    readOnly"`` or ``"mode == 'edit' || mode in ('insert', 'replace')"``. Both the
+    Python operators and the ``&&``, ``||`` and ``!`` operators are supported. An
+    undefined context key evaluates to None.
+    """
+
+    __slots__ = ("_expr", "_keys", "_code")
+
+    def __init__(self, expr: str) -> None:
+        source = _OPERATOR_PATTERN.sub(_translate_operator, expr).strip()
+        try:
+            tree = ast.parse(source, mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Invalid when clause: {expr!r}") from e
+        keys: set[str] = set()
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                raise ValueError(
+                    f"{type(node).__name__} is not allowed in a when clause: {expr!r}"
+                )
+            if isinstance(node, ast.Name) and node.id not in _LITERALS:
+                keys.add(node.id)
+        self._expr = expr
+        self._keys = frozenset(keys)
+        self._code = compile(tree, f"<when {expr!r}>", "eval")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._expr!r})"
+
+    @property
+    def expr(self) -> str:
+        """The source expression."""
+        return self._expr
+
+    @property
+    def keys(self) -> frozenset[str]:
+        """Context keys the clause depends on."""
+        return self._keys
+
+    def evaluate(self, context: Mapping[str, Any]) -> bool:
+        """Evaluate the clause with the given context key values."""
+        return bool(eval(self._code, {"__builtins__": {}}, _Namespace(context)))
+
+
+class _Namespace(dict):
+    """The local namespace to evaluate a when clause in."""
+
+    def __init__(self, context: Mapping[str, Any]) -> None:
+        self._context = context
+
+    def __missing__(self, key: str) -> Any:
+        if key in _LITERALS:
+            return _LITERALS[key]
+        return self._context.get(key)
+
+
+class ContextKeys(Mapping[str, Any]):
+    """
+    Context keys of an application.
+
+    Values are set by ``context[key] = value``, or computed on demand by a getter
+    added by ``add_getter``. The application has to call ``invalidate`` when the
+    value of a getter may have changed.
+    """
+
+    def __init__(self) -> None:
+        self._values: dict[str, Any] = {}
+        self._getters: dict[str, Callable[[], Any]] = {}
+        self._callbacks: list[weakref.WeakMethod | Callable] = []
+
+    def __repr__(self) -> str:
+        keys = sorted(set(self._values) | set(self._getters))
+        return f"{type(self).__name__}({keys!r})"
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._values:
+            return self._values[key]
+        return self._getters[key]()
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._values and self._values[key] is value:
+            return None
+        self._getters.pop(key, None)
+        self._values[key] = value
+        self._notify(frozenset([key]))
+        return None
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._values:
+            del self._values[key]
+        else:
+            del self._getters[key]
+        self._notify(frozenset([key]))
+        return None
+
+    def __iter__(self):
+        yield from self._values
+        yield from self._getters
+
+    def __len__(self) -> int:
+        return len(self._values) + len(self._getters)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values or key in self._getters
+
+    def add_getter(self, key: str, getter: Callable[[], Any]) -> None:
+        """Add a context key whose value is given by calling the getter."""
+        self._values.pop(key, None)
+        self._getters[key] = getter
+        self._notify(frozenset([key]))
+        return None
+
+    def invalidate(self, *keys: str) -> None:
+        """
+        Notify that the values of the context keys may have changed.
+
+        If no key is given, all the keys, including the ones that ``when``
+        callables depend on, are invalidated.
+        """
+        self._notify(frozenset(keys) if keys else None)
+        return None
+
+    def connect(self, callback: _Callback) -> None:
+        """Connect a callback called with the changed keys (None for all)."""
+        if hasattr(callback, "__self__"):
+            # do not keep the widget alive
+            callback = weakref.WeakMethod(callback)
+        self._callbacks.append(callback)
+        return None
+
+    def disconnect(self, callback: _Callback) -> None:
+        """Disconnect a callback."""
+        for i, cb in enumerate(self._callbacks):
+            if isinstance(cb, weakref.WeakMethod):
+                cb = cb()
+            if cb == callback:
+                del self._callbacks[i]
+                return None
+        return None
+
+    def _notify(self, keys: frozenset[str] | None) -> None:
+        alive = []
+        for cb in self._callbacks:
+            func = cb() if isinstance(cb, weakref.WeakMethod) else cb
+            if func is None:
+                continue
+            func(keys)
+            alive.append(cb)
+        self._callbacks = alive
+        return None
+
+
+class EnabledCache:
+    """
+    Enabled states of commands memoized during a palette session.
+
+    Context keys are looked up at most once per session. When some keys are
+    invalidated, only the commands whose clauses depend on them, and the ones
+    with ``when`` callables, are evaluated again.
+    """
+
+    def __init__(self, context: Mapping[str, Any] | None = None) -> None:
+        self._context: Mapping[str, Any] = context if context is not None else {}
+        self._key_values: dict[str, Any] = {}
+        # id -> (command, state); the command is kept to check the identity
+        self._states: dict[int, tuple[Command, bool]] = {}
+        self._dependents: dict[str, set[int]] = {}
+        self._opaque: set[int] = set()  # commands with when callables
+
+    @property
+    def context(self) -> Mapping[str, Any]:
+        """The context keys to evaluate the clauses with."""
+        return self._context
+
+    def set_context(self, context: Mapping[str, Any]) -> None:
+        self._context = context
+        self.clear()
+        return None
+
+    def enabled(self, cmd: Command) -> bool:
+        """Return True if the command is enabled."""
+        _id = id(cmd)
+        if (item := self._states.get(_id)) is not None and item[0] is cmd:
+            return item[1]
+        when = cmd.when
+        with _stats.measure(_stats.WHEN):
+            if isinstance(when, WhenClause):
+                state = when.evaluate(_SessionContext(self))
+                for key in when.keys:
+                    self._dependents.setdefault(key, set()).add(_id)
+            else:
+                state = bool(when())
+                self._opaque.add(_id)
+        self._states[_id] = (cmd, state)
+        return state
+
+    def invalidate(self, keys: Iterable[str] | None = None) -> None:
+        """Invalidate the commands depending on the keys (all if None)."""
+        if keys is None:
+            return self.clear()
+        states = self._states
+        for key in keys:
+            self._key_values.pop(key, None)
+            for _id in self._dependents.pop(key, ()):
+                states.pop(_id, None)
+        for _id in self._opaque:
+            states.pop(_id, None)
+        self._opaque.clear()
+        return None
+
+    def clear(self) -> None:
+        """Clear all the memoized states to start a new session."""
+        self._key_values.clear()
+        self._states.clear()
+        self._dependents.clear()
+        self._opaque.clear()
+        return None
+
+
+class _SessionContext(Mapping[str, Any]):
+    """Context keys memoized in an enabled cache."""
+
+    __slots__ = ("_cache",)
+
+    def __init__(self, cache: EnabledCache) -> None:
+        self._cache = cache
+
+    def __getitem__(self, key: str) -> Any:
+        values = self._cache._key_values
+        try:
+            return values[key]
+        except KeyError:
+            value = values[key] = self._cache._context[key]
+            return value
+
+    def __iter__(self):
+        return iter(self._cache._context)
+
+    def __len__(self) -> int:
+        return len(self._cache._context)
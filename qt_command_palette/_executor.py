@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+import logging
+import threading
+import time
+from typing import Any, Callable, NamedTuple
+
+from qtpy import QtCore
+from qtpy.QtCore import Signal
+
+from . import _stats
+from ._commands import Command, ExecutionPolicy
+
+logger = logging.getLogger(__name__)
+
+
+class _Job(NamedTuple):
+    command: Command | None
+    func: Callable[..., Any]
+    args: list[Any]
+    policy: ExecutionPolicy
+    future: Future
+
+
+class CommandExecutor(QtCore.QObject):
+    """
+    The executor of the palette commands.
+
+    Commands that are not executed synchronously run in a thread pool, a process
+    pool or an asyncio event loop running in a background thread. At most
+    ``max_concurrent`` of them are in flight at the same time; others are queued.
+    The results are reported by the signals, which are delivered in the thread of
+    this object.
+    """
+
+    started = Signal(object)  # Command
+    finished = Signal(object, object)  # Command, result
+    errored = Signal(object, object)  # Command, exception
+
+    def __init__(self, max_concurrent: int = 4, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be positive")
+        self._max_concurrent = max_concurrent
+        self._lock = threading.Lock()
+        self._running = 0
+        self._queue: deque[_Job] = deque()
+        self._thread_pool: ThreadPoolExecutor | None = None
+        self._process_pool: ProcessPoolExecutor | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def max_concurrent(self) -> int:
+        """Maximum number of commands in flight."""
+        return self._max_concurrent
+
+    def set_max_concurrent(self, value: int) -> None:
+        """
+        Change the maximum number of commands in flight.
+
+        Queued commands are started if the limit is raised. If it is lowered,
+        running commands are not interrupted, and no more are started until
+        fewer than ``value`` of them are running.
+        """
+        if value < 1:
+            raise ValueError("max_concurrent must be positive")
+        jobs: list[_Job] = []
+        pools: list[Executor] = []
+        with self._lock:
+            if value == self._max_concurrent:
+                return None
+            self._max_concurrent = value
+            # pools are sized by the limit; running commands finish in the old ones
+            if self._thread_pool is not None:
+                pools.append(self._thread_pool)
+                self._thread_pool = None
+            if self._process_pool is not None:
+                pools.append(self._process_pool)
+                self._process_pool = None
+            while self._queue and self._running < value:
+                jobs.append(self._queue.popleft())
+                self._running += 1
+        for pool in pools:
+            pool.shutdown(wait=False)
+        for job in jobs:
+            self._start(job)
+        return None
+
+    def in_flight(self) -> int:
+        """Number of commands running in the background."""
+        return self._running
+
+    def submit(
+        self,
+        command: Command | None,
+        func: Callable[..., Any],
+        args: list[Any],
+        policy: ExecutionPolicy | str = ExecutionPolicy.sync,
+    ) -> Future:
+        """
+        Execute the function of a command.
+
+        Returns a future of the result. A synchronous command is executed before
+        returning; an exception it raises is reported and re-raised. The command
+        is None if the function is not called from a command palette.
+        """
+        policy = ExecutionPolicy(policy)
+        future: Future = Future()
+        if policy is ExecutionPolicy.sync:
+            future.set_running_or_notify_cancel()
+            self.started.emit(command)
+            try:
+                with _stats.measure(_stats.EXECUTE):
+                    out = func(*args)
+            except Exception as e:
+                future.set_exception(e)
+                self.errored.emit(command, e)
+                raise
+            future.set_result(out)
+            self.finished.emit(command, out)
+            return future
+
+        job = _Job(command, func, args, policy, future)
+        with self._lock:
+            if self._running >= self._max_concurrent:
+                self._queue.append(job)
+                return future
+            self._running += 1
+        self._start(job)
+        return future
+
+    def shutdown(self) -> None:
+        """Shutdown the background workers."""
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False)
+            self._process_pool = None
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+        return None
+
+    def _start(self, job: _Job) -> None:
+        if not job.future.set_running_or_notify_cancel():
+            # cancelled while queued
+            return self._release()
+        self.started.emit(job.command)
+        start = time.perf_counter()
+        try:
+            if job.policy is ExecutionPolicy.asyncio:
+                inner = asyncio.run_coroutine_threadsafe(
+                    job.func(*job.args), self._get_loop()
+                )
+            else:
+                inner = self._get_pool(job.policy).submit(job.func, *job.args)
+        except Exception as e:
+            inner = Future()
+            inner.set_exception(e)
+        inner.add_done_callback(lambda f: self._on_done(job, f, start))
+        return None
+
+    def _on_done(self, job: _Job, inner: Future, start: float) -> None:
+        # called in the worker thread
+        if (instrumentation := _stats.active()) is not None:
+            instrumentation.record(_stats.EXECUTE, time.perf_counter() - start)
+        if inner.cancelled():
+            job.future.cancel()
+        elif (exc := inner.exception()) is not None:
+            name = job.func if job.command is None else job.command.fmt()
+            logger.error(f"command {name!r} failed", exc_info=exc)
+            # signal first, so that it is delivered once the future is done
+            self.errored.emit(job.command, exc)
+            job.future.set_exception(exc)
+        else:
+            out = inner.result()
+            self.finished.emit(job.command, out)
+            job.future.set_result(out)
+        self._release()
+        return None
+
+    def _release(self) -> None:
+        """Release a slot of running commands and start the next one."""
+        with self._lock:
+            if not self._queue or self._running > self._max_concurrent:
+                self._running -= 1
+                return None
+            job = self._queue.popleft()
+        self._start(job)
+        return None
+
+    def _get_pool(self, policy: ExecutionPolicy) -> Executor:
+        # may be called from a worker thread when a queued command is started
+        with self._lock:
+            if policy is ExecutionPolicy.thread:
+                if self._thread_pool is None:
+                    self._thread_pool = ThreadPoolExecutor(
+                        max_workers=self._max_concurrent,
+                        thread_name_prefix="qt_command_palette",
+                    )
+                return self._thread_pool
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self._max_concurrent
+                )
+            return self._process_pool
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the asyncio event loop running in the background thread."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="qt_command_palette_asyncio",
+                    daemon=True,
+                )
+                thread.start()
+                self._loop = loop
+            return self._loop
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import atexit
+from collections import OrderedDict
+import logging
+import mmap
+import os
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Iterator, NamedTuple
+
+if TYPE_CHECKING:
+    from ._commands import Command
+    from ._matcher import SearchTable
+
+logger = logging.getLogger(__name__)
+
+
+class Usage(NamedTuple):
+    """Usage of a command."""
+
+    score: float  # decayed count of the executions at the time of the last use
+    last_used: float  # time of the last use in seconds since the epoch
+
+
+class UsageHistory:
+    """
+    Recency and frequency of the command executions.
+
+    Commands are identified by their formatted texts. Each execution adds one to
+    a counter that decays exponentially with ``half_life`` seconds, so that the
+    "frecency" of a command reflects both how often and how recently it is used.
+    Recording an execution is O(1); at most ``maxsize`` commands are remembered
+    and the least recently used one is forgotten first.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 512,
+        half_life: float = 7 * 24 * 3600,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        if half_life <= 0:
+            raise ValueError("half_life must be positive")
+        self._maxsize = maxsize
+        self._half_life = half_life
+        self._clock = clock
+        self._usages: OrderedDict[str, Usage] = OrderedDict()
+        self._version = 0
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{len(self)} commands>)"
+
+    def __len__(self) -> int:
+        return len(self._get_usages())
+
+    def __contains__(self, cmd: Command) -> bool:
+        return cmd.fmt() in self._get_usages()
+
+    @property
+    def version(self) -> int:
+        """The version number, incremented by every change."""
+        return self._version
+
+    def record(self, cmd: Command) -> None:
+        """Record an execution of the command."""
+        return self._record(cmd.fmt(), self._clock())
+
+    def frecency(self, cmd: Command) -> float:
+        """The decayed count of the executions of the command."""
+        if (usage := self._get_usages().get(cmd.fmt())) is None:
+            return 0.0
+        return self._decayed(usage, self._clock())
+
+    def most_recent(self) -> Iterator[str]:
+        """Iterate over the texts of the commands, most recently used first."""
+        return reversed(self._get_usages().keys())
+
+    def boosts(self, table: SearchTable) -> dict[int, float]:
+        """Map the indices of the used commands in the table to their frecency."""
+        usages = self._get_usages()
+        if not usages:
+            return {}
+        now = self._clock()
+        decayed = self._decayed
+        # only the used texts are looked up, not all the texts of the table
+        return {
+            i: decayed(usage, now)
+            for text, usage in usages.items()
+            for i in table.find_text(text)
+        }
+
+    def clear(self) -> None:
+        """Forget all the usages."""
+        self._get_usages().clear()
+        self._version += 1
+        return None
+
+    def _get_usages(self) -> OrderedDict[str, Usage]:
+        return self._usages
+
+    def _record(self, text: str, now: float) -> None:
+        self._apply(self._get_usages(), text, now)
+        self._version += 1
+        return None
+
+    def _apply(self, usages: OrderedDict[str, Usage], text: str, now: float) -> None:
+        """Apply an execution to the usages."""
+        if (usage := usages.get(text)) is not None:
+            score = self._decayed(usage, now) + 1.0
+            usages.move_to_end(text)
+        else:
+            score = 1.0
+        usages[text] = Usage(score, now)
+        if len(usages) > self._maxsize:
+            usages.popitem(last=False)
+        return None
+
+    def _decayed(self, usage: Usage, now: float) -> float:
+        return usage.score * 0.5 ** (max(now - usage.last_used, 0.0) / self._half_life)
+
+
+# record types of the history log
+_SNAPSHOT = "S"  # S<TAB>score<TAB>last_used<TAB>text
+_EVENT = "E"  # E<TAB>time<TAB>text
+
+
+def _escape(text: str) -> str:
+    return text.encode("unicode_escape").decode("ascii")
+
+
+def _unescape(text: str) -> str:
+    return text.encode("ascii").decode("unicode_escape")
+
+
+class PersistentHistory(UsageHistory):
+    """
+    A usage history saved to an append-only log file.
+
+    The file is read when the history is used for the first time. Executions are
+    appended to the file by a background thread, so recording never waits for the
+    disk. When the log grows, it is compacted into a snapshot of the current
+    usages, which is written to a temporary file and atomically replaces the log.
+    Incomplete lines left by a crash are ignored.
+    """
+
+    _INSTANCES: dict[str, PersistentHistory] = {}
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        maxsize: int = 512,
+        half_life: float = 7 * 24 * 3600,
+        clock: Callable[[], float] = time.time,
+        compact_threshold: int = 4096,
+    ) -> None:
+        super().__init__(maxsize=maxsize, half_life=half_life, clock=clock)
+        self._path = os.fspath(path)
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        self._compact_threshold = compact_threshold
+        self._nevents = 0  # number of events in the log since the last snapshot
+        self._torn = False  # true if the last line of the log is incomplete
+        self._queue: queue.Queue[Callable[[], None] | None] = queue.Queue()
+        self._writer: threading.Thread | None = None
+
+    @classmethod
+    def instance(cls, path: str | os.PathLike) -> PersistentHistory:
+        """Get the history of the file, shared in this process."""
+        path = os.path.abspath(path)
+        if (history := cls._INSTANCES.get(path)) is None:
+            history = cls._INSTANCES[path] = cls(path)
+        return history
+
+    @property
+    def path(self) -> str:
+        """Path to the log file."""
+        return self._path
+
+    def clear(self) -> None:
+        super().clear()
+        self._submit(self._write_snapshot, [])
+        return None
+
+    def flush(self) -> None:
+        """Wait for all the pending writes to finish."""
+        if self._writer is not None:
+            self._queue.join()
+        return None
+
+    def close(self) -> None:
+        """Flush the pending writes and stop the writer thread."""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        return None
+
+    def _get_usages(self) -> OrderedDict[str, Usage]:
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self._load()
+                    self._loaded = True
+        return self._usages
+
+    def _record(self, text: str, now: float) -> None:
+        super()._record(text, now)
+        self._nevents += 1
+        if self._nevents > self._compact_threshold:
+            self._compact()
+        else:
+            self._submit(self._append, f"{_EVENT}\t{now!r}\t{_escape(text)}\n")
+        return None
+
+    def _compact(self) -> None:
+        lines = [
+            f"{_SNAPSHOT}\t{usage.score!r}\t{usage.last_used!r}\t{_escape(text)}\n"
+            for text, usage in self._usages.items()
+        ]
+        self._nevents = 0
+        self._submit(self._write_snapshot, lines)
+        return None
+
+    def _load(self) -> None:
+        try:
+            with open(self._path, "rb") as f:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        data = mm[:]
+                except ValueError:  # empty file cannot be mapped
+                    data = b""
+        except FileNotFoundError:
+            return None
+        usages = self._usages
+        nevents = 0
+        lines = data.decode("utf-8", errors="replace").split("\n")
+        # the last line is empty, or incomplete if the writer crashed
+        self._torn = bool(lines.pop())
+        for line in lines:
+            fields = line.split("\t")
+            try:
+                if fields[0] == _EVENT and len(fields) == 3:
+                    self._apply(usages, _unescape(fields[2]), float(fields[1]))
+                    nevents += 1
+                elif fields[0] == _SNAPSHOT and len(fields) == 4:
+                    text = _unescape(fields[3])
+                    usages[text] = Usage(float(fields[1]), float(fields[2]))
+                    usages.move_to_end(text)
+            except ValueError:
+                continue  # broken line
+        while len(usages) > self._maxsize:
+            usages.popitem(last=False)
+        self._nevents = nevents
+        if nevents > self._compact_threshold:
+            self._compact()
+        return None
+
+    def _submit(self, func: Callable[..., None], *args) -> None:
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._run_writer,
+                name="qt_command_palette_history",
+                daemon=True,
+            )
+            self._writer.start()
+            atexit.register(self.close)
+        self._queue.put(lambda: func(*args))
+        return None
+
+    def _run_writer(self) -> None:
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    return None
+                task()
+            except Exception:
+                logger.exception(f"Failed to write history to {self._path!r}")
+            finally:
+                self._queue.task_done()
+
+    def _append(self, line: str) -> None:
+        # called in the writer thread
+        dirname = os.path.dirname(self._path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        if self._torn:
+            line = "\n" + line  # terminate the incomplete line first
+        with open(self._path, "a", encoding="utf-8") as f:
+            f.write(line)
+            self._torn = False
+            f.flush()
+            os.fsync(f.fileno())
+        return None
+
+    def _write_snapshot(self, lines: list[str]) -> None:
+        # called in the writer thread
+        dirname = os.path.dirname(self._path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        tmp = f"{self._path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._path)
+        self._torn = False
+        return None
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from array import array
+import threading
+from typing import Iterable
+
+_EMPTY = array("q")
+
+
+def trigrams(text: str) -> set[str]:
+    """The set of the 3-character substrings of the text."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """
+    An inverted index from the trigrams of the search keys to the commands.
+
+    Commands are identified by integer ids that must increase in the order they
+    are added, so that each posting list is a sorted array. Looking up a query
+    returns a superset of the commands containing all its words of three or more
+    characters, which still have to be verified. Added commands are indexed
+    lazily on the next lookup, and removed ones are skipped until the postings are
+    rebuilt.
+    """
+
+    def __init__(self, items: Iterable[tuple[int, str]] = ()) -> None:
+        self._postings: dict[str, array] = {}
+        self._keys: dict[int, str] = {}  # id -> indexed key
+        self._pending: list[int] = []  # ids not indexed yet
+        self._removed: set[int] = set()  # indexed ids to be skipped
+        self._lock = threading.Lock()
+        self.update(items)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{len(self)} keys>)"
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, uid: int) -> bool:
+        return uid in self._keys
+
+    def key(self, uid: int) -> str | None:
+        """The indexed key of the id."""
+        return self._keys.get(uid)
+
+    def add(self, uid: int, key: str) -> None:
+        """Add a search key."""
+        with self._lock:
+            self._keys[uid] = key
+            self._pending.append(uid)
+        return None
+
+    def update(self, items: Iterable[tuple[int, str]]) -> None:
+        """Add search keys."""
+        with self._lock:
+            for uid, key in items:
+                self._keys[uid] = key
+                self._pending.append(uid)
+        return None
+
+    def remove(self, uid: int) -> None:
+        """Remove a search key."""
+        with self._lock:
+            if self._keys.pop(uid, None) is None:
+                return None
+            if not self._pending or uid < self._pending[0]:
+                self._removed.add(uid)
+            if len(self._removed) > len(self._keys):
+                self._rebuild()
+        return None
+
+    def clear(self) -> None:
+        """Remove all the keys."""
+        with self._lock:
+            self._postings.clear()
+            self._keys.clear()
+            self._pending.clear()
+            self._removed.clear()
+        return None
+
+    def lookup(self, words: Iterable[str]) -> set[int] | None:
+        """
+        Find the candidate ids of the keys that contain all the words.
+
+        Returns None if no word is long enough to narrow down the candidates.
+        """
+        grams: set[str] = set()
+        for word in words:
+            grams.update(trigrams(word))
+        if not grams:
+            return None
+        with self._lock:
+            self._flush()
+            postings = sorted(
+                (self._postings.get(gram, _EMPTY) for gram in grams), key=len
+            )
+            found = set(postings[0])
+            for posting in postings[1:]:
+                if not found or len(posting) > 4 * len(found):
+                    # verifying the candidates is cheaper than intersecting
+                    break
+                found.intersection_update(posting)
+            found.difference_update(self._removed)
+        return found
+
+    def _flush(self) -> None:
+        """Index the pending keys."""
+        postings = self._postings
+        keys = self._keys
+        for uid in self._pending:
+            if (key := keys.get(uid)) is None:
+                continue  # removed before indexed
+            for gram in trigrams(key):
+                if (posting := postings.get(gram)) is None:
+                    posting = postings[gram] = array("q")
+                posting.append(uid)
+        self._pending.clear()
+        return None
+
+    def _rebuild(self) -> None:
+        """Build the postings again without the removed ids."""
+        self._postings.clear()
+        self._removed.clear()
+        self._pending = sorted(self._keys)
+        return None
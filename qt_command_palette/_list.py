@@ -1,16 +1,36 @@
 from __future__ import annotations
-from typing import Any, TYPE_CHECKING, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TYPE_CHECKING, Iterator, Sequence
+import html
 import logging
-import re
+import operator
 
 from qtpy import QtWidgets as QtW, QtCore, QtGui
 from qtpy.QtCore import Qt, Signal, Property
 
-from ._commands import Command
+from . import _stats
+from ._api import _Submit
+from ._cache import LRUCache
+from ._commands import Command, Query
+from ._context import ContextKeys, EnabledCache
+from ._matcher import (
+    RESULT_CACHE_SIZE,
+    Matcher,
+    MatchResult,
+    SearchTable,
+    SubstringMatcher,
+    as_matcher,
+)
+from ._history import UsageHistory
+from ._provider import CommandProvider, ProviderStream
+from ._store import CommandStore
 
 logger = logging.getLogger(__name__)
 MATCH_COLOR = "blue"
 DISABLED_COLOR = "gray"
+MAX_NARROWING_DEPTH = 32
+MARKUP_CACHE_SIZE = 1024
+_DOCUMENT_MARGIN = 2
 
 
 def bold_colored(text: str, color: str) -> str:
@@ -21,93 +41,190 @@ def colored(text: str, color: str) -> str:
     return f"<font color={color!r}>{text}</font>"
 
 
+def colored_text(text: str, input_text: str, color: str = MATCH_COLOR) -> str:
+    """Return the HTML text with the characters matched to the input colored."""
+    return render_markup(
+        text, SubstringMatcher().highlight(Query(input_text), text), color
+    )
+
+
+def render_markup(text: str, spans: list[tuple[int, int]], color: str) -> str:
+    """Return the escaped HTML text with the spans colored."""
+    output_texts: list[str] = []
+    last_end = 0
+    for start, stop in spans:
+        output_texts.append(html.escape(text[last_end:start]))
+        output_texts.append(bold_colored(html.escape(text[start:stop]), color))
+        last_end = stop
+    output_texts.append(html.escape(text[last_end:]))
+    return "".join(output_texts)
+
+
 class QCommandMatchModel(QtCore.QAbstractListModel):
-    """A list model for the command palette."""
+    """A list model of the commands that match the input text."""
 
     def __init__(self, parent: QtW.QWidget = None):
         super().__init__(parent)
-        self._commands: list[Command] = []
+        self._matches: list[Command] = []
         self._max_matches = 80
 
     def rowCount(self, parent: QtCore.QModelIndex = None) -> int:
-        return self._max_matches
+        return len(self._matches)
 
     def data(self, index: QtCore.QModelIndex, role: int = ...) -> Any:
-        return QtCore.QVariant()
+        if not index.isValid() or index.row() >= len(self._matches):
+            return None
+        cmd = self._matches[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return cmd.fmt()
+        elif role == Qt.ItemDataRole.ToolTipRole:
+            return cmd.get_tooltip()
+        elif role == Qt.ItemDataRole.UserRole:
+            return cmd
+        return None
 
     def flags(self, index: QtCore.QModelIndex) -> Qt.ItemFlag:
         return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
 
+    def command_at(self, row: int) -> Command:
+        """The matched command at the given row."""
+        return self._matches[row]
 
-class QCommandLabel(QtW.QLabel):
-    """The label widget to display a command in the palette."""
+    def set_command_at(self, row: int, cmd: Command) -> None:
+        """Replace the matched command at the given row."""
+        self._matches[row] = cmd
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+        return None
 
-    def __init__(self, cmd: Command | None = None):
-        super().__init__()
-        if cmd is not None:
-            self.set_command(cmd)
-        else:
-            self._command_text = ""
-
-    def command(self) -> Command:
-        """Command bound to this label."""
-        return self._command
-
-    def set_command(self, cmd: Command) -> None:
-        """Set command to this widget."""
-        command_text = cmd.fmt()
-        self._command_text = command_text
-        self._command = cmd
-        self.setText(command_text)
-        self.setToolTip(cmd.tooltip)
-
-    def command_text(self) -> str:
-        """The original command text."""
-        return self._command_text
-
-    def set_text_colors(self, input_text: str, /, color: str = MATCH_COLOR):
-        """Set label text color based on the input text."""
-        if input_text == "":
+    def set_matches(self, matches: list[Command]) -> None:
+        """Set the matched commands to be displayed."""
+        if len(matches) == len(self._matches) and all(
+            map(operator.is_, matches, self._matches)
+        ):
+            # the same commands, such as the ones of the empty query on reopening
+            self._matches = matches
             return None
-        text = self.command_text()
-        words = input_text.split(" ")
-        pattern = re.compile("|".join(words), re.IGNORECASE)
-
-        output_texts: list[str] = []
-        last_end = 0
-        for match_obj in pattern.finditer(text):
-            output_texts.append(text[last_end : match_obj.start()])
-            word = match_obj.group()
-            colored_word = bold_colored(word, color)
-            output_texts.append(colored_word)
-            last_end = match_obj.end()
-        output_texts.append(text[last_end:])
+        self.beginResetModel()
+        self._matches = matches
+        self.endResetModel()
+        return None
 
-        self.setText("".join(output_texts))
+    def append_matches(self, matches: list[Command]) -> None:
+        """Append commands to the displayed ones."""
+        if not matches:
+            return None
+        nrows = len(self._matches)
+        self.beginInsertRows(QtCore.QModelIndex(), nrows, nrows + len(matches) - 1)
+        self._matches.extend(matches)
+        self.endInsertRows()
         return None
 
-    def set_disabled(self) -> None:
-        """Set the label to disabled."""
-        text = self.command_text()
-        self.setText(colored(text, DISABLED_COLOR))
+
+class QCommandDelegate(QtW.QStyledItemDelegate):
+    """The delegate that paints a command with the matched characters colored."""
+
+    def paint(
+        self,
+        painter: QtGui.QPainter,
+        option: QtW.QStyleOptionViewItem,
+        index: QtCore.QModelIndex,
+    ) -> None:
+        cmd: Command = index.data(Qt.ItemDataRole.UserRole)
+        if cmd is None:
+            return super().paint(painter, option, index)
+        qlist = self.parent()
+        assert isinstance(qlist, QCommandList)
+        markup = qlist.markup(cmd)
+
+        # draw the background without the text
+        self.initStyleOption(option, index)
+        option.text = ""
+        style = option.widget.style() if option.widget else QtW.QApplication.style()
+        style.drawControl(
+            QtW.QStyle.ControlElement.CE_ItemViewItem, option, painter, option.widget
+        )
+
+        doc = QtGui.QTextDocument()
+        doc.setDefaultFont(option.font)
+        doc.setDocumentMargin(_DOCUMENT_MARGIN)
+        doc.setHtml(markup)
+        ctx = QtGui.QAbstractTextDocumentLayout.PaintContext()
+        if option.state & QtW.QStyle.StateFlag.State_Selected:
+            ctx.palette.setColor(
+                QtGui.QPalette.ColorRole.Text,
+                option.palette.color(QtGui.QPalette.ColorRole.HighlightedText),
+            )
+        else:
+            ctx.palette.setColor(
+                QtGui.QPalette.ColorRole.Text,
+                option.palette.color(QtGui.QPalette.ColorRole.Text),
+            )
+        painter.save()
+        painter.translate(option.rect.topLeft())
+        painter.setClipRect(option.rect.translated(-option.rect.topLeft()))
+        doc.documentLayout().draw(painter, ctx)
+        painter.restore()
         return None
 
+    def sizeHint(
+        self, option: QtW.QStyleOptionViewItem, index: QtCore.QModelIndex
+    ) -> QtCore.QSize:
+        height = option.fontMetrics.height() + 2 * _DOCUMENT_MARGIN
+        return QtCore.QSize(option.rect.width(), height)
+
 
 class QCommandList(QtW.QListView):
     commandClicked = Signal(int)  # one of the items is clicked
+    _filterFinished = Signal(int, object)  # emitted from the filter thread
+    _providerBatch = Signal(int, object)  # emitted from the provider threads
 
     def __init__(self, parent: QtW.QWidget | None = None) -> None:
         super().__init__(parent)
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         self.setModel(QCommandMatchModel(self))
+        self.setItemDelegate(QCommandDelegate(self))
+        self.setUniformItemSizes(True)
         self.setSelectionMode(QtW.QAbstractItemView.SelectionMode.NoSelection)
         self._selected_index = 0
-        self._label_widgets: list[QCommandLabel] = []
+        self._input_text = ""
+        self._query = Query("")
+        # (query words, command text, enabled, color) -> HTML
+        self._markup_cache: LRUCache[tuple, str] = LRUCache(MARKUP_CACHE_SIZE)
         self._current_max_index = 0
-        for i in range(self.model()._max_matches):
-            lw = QCommandLabel()
-            self._label_widgets.append(lw)
-            self.setIndexWidget(self.model().index(i), lw)
+        self._matcher: Matcher = SubstringMatcher()
+        self._store = CommandStore()
+        self._search_table: SearchTable | None = None
+        self._history = UsageHistory()
+        self._history_version = -1
+        # frecency of the used commands in the search table
+        self._boost: dict[int, float] = {}
+        # stack of (query, all matches, best matches) of successively refined queries
+        self._match_stack: list[tuple[Query, list[int], list[int]]] = []
+        # best matches of the empty query, displayed when the palette is opened
+        self._empty_best: list[int] | None = None
+        # (store version, query words) -> result
+        self._results: LRUCache[tuple, MatchResult] = LRUCache(RESULT_CACHE_SIZE)
+        self._result: MatchResult | None = None  # cached result being displayed
+        # background filtering
+        self._generation = 0
+        self._filter_executor: ThreadPoolExecutor | None = None
+        self._pending_filter: Future | None = None
+        # enabled states memoized during a session
+        self._enabled_cache = EnabledCache()
+        # query-dependent commands streamed by the providers
+        self._providers: list[CommandProvider] = []
+        self._streams: list[ProviderStream] = []
+        self._provided: list[Command] = []
+        self._provider_text: str | None = None  # text the provided commands are for
+        self._provider_generation = 0
+        self._filterFinished.connect(
+            self._on_filter_finished, Qt.ConnectionType.QueuedConnection
+        )
+        self._providerBatch.connect(
+            self._on_provider_batch, Qt.ConnectionType.QueuedConnection
+        )
+        self.destroyed.connect(self._cancel_streams)
         self.pressed.connect(self._on_clicked)
 
         self._match_color = QtGui.QColor("#468cc6")
@@ -121,6 +238,72 @@ class QCommandList(QtW.QListView):
     def matchColor(self, color: QtGui.QColor):
         self._match_color = color
 
+    def matcher(self) -> Matcher:
+        """The matcher used to filter and rank the commands."""
+        return self._matcher
+
+    def set_matcher(self, matcher: Matcher | str) -> None:
+        """Set the matcher used to filter and rank the commands."""
+        self._matcher = as_matcher(matcher)
+        self._clear_matches()
+        self._results.clear()
+        self._markup_cache.clear()
+        return None
+
+    def set_context(self, context: ContextKeys) -> None:
+        """Set the context keys used to evaluate the when clauses."""
+        old = self._enabled_cache.context
+        if isinstance(old, ContextKeys):
+            old.disconnect(self._on_context_changed)
+        self._enabled_cache.set_context(context)
+        context.connect(self._on_context_changed)
+        self.viewport().update()
+        return None
+
+    def markup(self, cmd: Command) -> str:
+        """The HTML text of the command, with the matched characters colored."""
+        text = cmd.fmt()
+        enabled = self.command_enabled(cmd)
+        color = self._match_color.name()
+        key = (self._query.words, text, enabled, color)
+        if (markup := self._markup_cache.get(key)) is None:
+            with _stats.measure(_stats.HIGHLIGHT):
+                if enabled:
+                    markup = render_markup(text, self._highlight(text), color)
+                else:
+                    markup = colored(html.escape(text), DISABLED_COLOR)
+            self._markup_cache.put(key, markup)
+        return markup
+
+    def _highlight(self, text: str) -> list[tuple[int, int]]:
+        if (result := self._result) is not None:
+            if (spans := result.spans.get(text)) is None:
+                spans = result.spans[text] = self._matcher.highlight(self._query, text)
+            return spans
+        return self._matcher.highlight(self._query, text)
+
+    def command_enabled(self, cmd: Command) -> bool:
+        """True if the command is enabled in the current session."""
+        return self._enabled_cache.enabled(cmd)
+
+    def reset_session(self) -> None:
+        """
+        Start a new session; the ``when`` callables are evaluated again.
+
+        The states of the when clauses are kept if the context keys notify their
+        changes, and evaluated again otherwise.
+        """
+        if isinstance(self._enabled_cache.context, ContextKeys):
+            self._enabled_cache.invalidate(())
+        else:
+            self._enabled_cache.clear()
+        return None
+
+    def _on_context_changed(self, keys: frozenset[str] | None) -> None:
+        self._enabled_cache.invalidate(keys)
+        self.viewport().update()
+        return None
+
     def _on_clicked(self, index: QtCore.QModelIndex) -> None:
         if index.isValid():
             self.commandClicked.emit(index.row())
@@ -142,98 +325,324 @@ class QCommandList(QtW.QListView):
 
     @property
     def all_commands(self) -> list[Command]:
-        return self.model()._commands
+        return self._store.commands
+
+    def store(self) -> CommandStore:
+        """The command store this list views."""
+        return self._store
+
+    def set_store(self, store: CommandStore) -> None:
+        """Set the command store, which may be shared with other lists."""
+        self._store = store
+        self._clear_matches()
+        self._results.clear()
+        return None
+
+    def history(self) -> UsageHistory:
+        """The usage history used to rank the commands."""
+        return self._history
+
+    def set_history(self, history: UsageHistory) -> None:
+        """Set the usage history, which may be shared with other lists."""
+        self._history = history
+        self._history_version = -1
+        self._results.clear()
+        return None
+
+    def result_cache(self) -> LRUCache[tuple, MatchResult]:
+        """The cache of the match results of the recent queries."""
+        return self._results
+
+    def set_result_cache(self, cache: LRUCache[tuple, MatchResult]) -> None:
+        """Set the cache of the match results, which may be shared with other lists."""
+        self._results = cache
+        self._result = None
+        return None
+
+    def providers(self) -> list[CommandProvider]:
+        """The providers of the query-dependent commands."""
+        return self._providers
+
+    def set_providers(self, providers: list[CommandProvider]) -> None:
+        """Set the list of the providers, which may be shared with other lists."""
+        self.cancel_providers()
+        self._providers = providers
+        return None
+
+    def cancel_providers(self) -> None:
+        """Cancel the running providers and forget the provided commands."""
+        self._cancel_streams()
+        self._provided = []
+        self._provider_text = None
+        return None
+
+    def has_pending_providers(self) -> bool:
+        """True if some providers are still running."""
+        return any(not stream.done() for stream in self._streams)
 
     def add_command(self, command: Command) -> None:
-        self.all_commands.append(command)
+        self._store.append(command)
         return None
 
     def extend_command(self, commands: list[Command]) -> None:
         """Extend the list of commands."""
-        self.all_commands.extend(commands)
+        self._store.extend(commands)
         return None
 
     def clear_commands(self) -> None:
         """Clear all the command"""
-        return self.all_commands.clear()
+        return self._store.clear()
 
     def command_at(self, index: int) -> Command:
-        return self.indexWidget(self.model().index(index)).command()
+        return self.model().command_at(index)
 
     def set_command_at(self, index: int, cmd: Command) -> None:
-        self.indexWidget(self.model().index(index)).set_command(cmd)
+        self.model().set_command_at(index, cmd)
         return None
 
     def iter_command(self) -> Iterator[Command]:
-        for i in range(self.model().rowCount()):
-            if not self.isRowHidden(i):
-                yield self.command_at(i)
+        yield from self.model()._matches
+
+    def execute(self, index: int | None = None) -> Any:
+        """
+        Execute the currently selected command.
 
-    def execute(self, index: int | None = None) -> None:
-        """Execute the currently selected command."""
+        Returns the output of the command, which is a future of the result for the
+        commands registered to a palette.
+        """
         if index is None:
             index = self._selected_index
+        if not 0 <= index < self.model().rowCount():
+            return None
         cmd = self.command_at(index)
         logger.debug(f"executing command: {cmd.fmt()}")
-        cmd(self.parent())
-        # move to the top
-        self.all_commands.remove(cmd)
-        self.all_commands.insert(0, cmd)
-        return None
+        if isinstance(func := cmd.function, _Submit):
+            # the executor reports the command as displayed, which may be a view
+            out = func(self.parent(), cmd)
+        else:
+            out = cmd(self.parent())
+        self._history.record(cmd)
+        return out
 
     def can_execute(self, index: int | None = None) -> bool:
         if index is None:
             index = self._selected_index
+        if not 0 <= index < self.model().rowCount():
+            return False
         cmd = self.command_at(index)
-        return cmd.enabled()
+        return self.command_enabled(cmd)
 
     def update_for_text(self, input_text: str) -> None:
         """Update the list to match the input text."""
+        self._generation += 1  # results of pending background filtering are stale
+        if self._pending_filter is not None:
+            self._pending_filter.cancel()
+            self._pending_filter = None
+        query = Query(input_text)
+        self._set_matches(query, self._find_matches(query))
+        return None
+
+    def update_for_text_async(self, input_text: str) -> None:
+        """
+        Update the list to match the input text in a background thread.
+
+        The list is updated when the filtering is finished, unless the input text
+        is updated again in the meantime.
+        """
+        self._generation += 1
+        generation = self._generation
+        query = Query(input_text)
+        table, candidates, best = self._lookup_matches(query)
+        if best is not None:
+            self._pending_filter = None
+            self._set_matches(query, [table.commands[i] for i in best])
+            return None
+
+        matcher = self._matcher
+        max_results = self.model()._max_matches
+        boost = self._boost
+        version = self._store.version  # the indices are valid for this version
+
+        def _run():
+            if generation != self._generation:
+                return None  # superseded before started
+            with _stats.measure(_stats.MATCH):
+                matches, best = matcher.match(
+                    query, table, candidates, max_results, boost
+                )
+            self._filterFinished.emit(
+                generation, (query, table, version, matches, best)
+            )
+            return None
+
+        if self._pending_filter is not None:
+            self._pending_filter.cancel()
+        self._pending_filter = self._get_filter_executor().submit(_run)
+        return None
+
+    def has_pending_filter(self) -> bool:
+        """True if background filtering is not finished yet."""
+        return self._pending_filter is not None
+
+    def _get_filter_executor(self) -> ThreadPoolExecutor:
+        if self._filter_executor is None:
+            self._filter_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="qt_command_palette"
+            )
+            executor = self._filter_executor
+            self.destroyed.connect(lambda: executor.shutdown(wait=False))
+        return self._filter_executor
+
+    def _on_filter_finished(self, generation: int, result: tuple) -> None:
+        query, table, version, matches, best = result
+        if generation != self._generation:
+            return None  # superseded by another input text
+        if table is not self._search_table or version != self._store.version:
+            # the commands are changed while filtering; the indices are stale
+            return self.update_for_text_async(query.text)
+        self._pending_filter = None
+        self._push_matches(query, matches, best)
+        self._set_matches(query, [table.commands[i] for i in best])
+        return None
+
+    def _set_matches(self, query: Query, matches: list[Command]) -> None:
         self._selected_index = 0
+        self._input_text = query.text
+        self._query = query
+        if self._providers:
+            if query.text != self._provider_text:
+                self._start_providers(query.text)
+            matches = matches + self._provided
+        with _stats.measure(_stats.UPDATE):
+            self.model().set_matches(matches)
+            self._current_max_index = len(matches)
+            self.update_selection()
+            self.scrollToTop()
+        return None
+
+    def _start_providers(self, text: str) -> None:
+        self.cancel_providers()
+        self._provider_text = text
+        generation = self._provider_generation
+
+        def _emit(batch: list[Command]) -> None:
+            try:
+                self._providerBatch.emit(generation, batch)
+            except RuntimeError:  # the list is already deleted
+                pass
+
+        self._streams = [provider.stream(text, _emit) for provider in self._providers]
+        return None
+
+    def _cancel_streams(self) -> None:
+        self._provider_generation += 1  # batches already emitted are stale
+        for stream in self._streams:
+            stream.cancel()
+        self._streams = []
+        return None
+
+    def _on_provider_batch(self, generation: int, batch: list[Command]) -> None:
+        if generation != self._provider_generation:
+            return None  # cancelled
         max_matches = self.model()._max_matches
-        row = 0
-        for cmd in self.all_commands:
-            if cmd.matches(input_text):
-                self.setRowHidden(row, False)
-                lw = self.indexWidget(self.model().index(row))
-                lw.set_command(cmd)
-                if cmd.enabled():
-                    lw.set_text_colors(input_text, color=self.matchColor.name())
-                else:
-                    lw.set_disabled()
-                row += 1
+        batch = batch[: max_matches - len(self._provided)]
+        self._provided.extend(batch)
+        model = self.model()
+        was_empty = model.rowCount() == 0
+        with _stats.measure(_stats.UPDATE):
+            model.append_matches(batch)
+            self._current_max_index = model.rowCount()
+            if was_empty:
+                self.update_selection()
+        if len(self._provided) >= max_matches:
+            self._cancel_streams()
+        return None
 
-                if row >= max_matches:
-                    self._current_max_index = max_matches
-                    break
-        else:
-            self._current_max_index = row
-            for row in range(row, max_matches):
-                self.setRowHidden(row, True)
-        self.update_selection()
-        self.update()
+    def _lookup_matches(
+        self, query: Query
+    ) -> tuple[SearchTable, Sequence[int], list[int] | None]:
+        """
+        Look up the cached matches of the query.
+
+        Returns the search table, the candidate indices that need to be matched,
+        and the best matches if the query is already matched.
+        """
+        table = self._store.search_table()
+        history = self._history
+        if table is not self._search_table or history.version != self._history_version:
+            # the store or the history is changed
+            self._search_table = table
+            self._history_version = history.version
+            self._boost = history.boosts(table)
+            self._clear_matches()
+        candidates: Sequence[int] = range(len(table))
+        self._result = None
+        if not query.words:
+            return table, candidates, self._empty_best
+        stack = self._match_stack
+        while stack:
+            last_query, last_matches, last_best = stack[-1]
+            if last_query == query:
+                return table, last_matches, last_best
+            if self._matcher.refines(query, last_query):
+                # only the previous matches need to be checked
+                candidates = last_matches
+                break
+            stack.pop()
+        if (result := self._results.get(self._result_key(query))) is not None:
+            if result.ranked_with(self._boost, self.model()._max_matches):
+                self._result = result
+                return table, candidates, result.best
+            # the history is changed; only the matches need to be ranked again
+            return table, result.matches, None
+        return table, candidates, None
+
+    def _push_matches(self, query: Query, matches: list[int], best: list[int]):
+        if not query.words:
+            self._empty_best = best
+            return None
+        self._result = MatchResult(
+            matches, best, self._boost, self.model()._max_matches
+        )
+        self._results.put(self._result_key(query), self._result)
+        stack = self._match_stack
+        while stack and not self._matcher.refines(query, stack[-1][0]):
+            stack.pop()
+        stack.append((query, matches, best))
+        if len(stack) > MAX_NARROWING_DEPTH:
+            del stack[0]
         return None
 
+    def _result_key(self, query: Query) -> tuple:
+        """The key of the query in the result cache."""
+        return (self._store.version, query.words)
+
+    def _find_matches(self, query: Query) -> list[Command]:
+        """Return the best matches of the query to be displayed."""
+        table, candidates, best = self._lookup_matches(query)
+        if best is None:
+            with _stats.measure(_stats.MATCH):
+                matches, best = self._matcher.match(
+                    query, table, candidates, self.model()._max_matches, self._boost
+                )
+            self._push_matches(query, matches, best)
+        return [table.commands[i] for i in best]
+
     def set_max_rows(self, max_rows: int) -> None:
+        """Set the maximum number of the matched commands to be displayed."""
         if max_rows < 0:
             raise ValueError("max_rows must be non-negative")
-        old = self.model()._max_matches
-        if max_rows == old:
-            return None
-        elif max_rows < old:
-            self.model().beginRemoveRows(QtCore.QModelIndex(), max_rows, old - 1)
-            self.model()._max_matches = max_rows
-            self.model().endRemoveRows()
-        else:
-            self.model().beginInsertRows(QtCore.QModelIndex(), old, max_rows - 1)
-            self.model()._max_matches = max_rows
-            self.model().endInsertRows()
+        self.model()._max_matches = max_rows
+        self._clear_matches()
+        return None
+
+    def _clear_matches(self) -> None:
+        """Forget the cached matches."""
+        self._match_stack.clear()
+        self._empty_best = None
         return None
 
     if TYPE_CHECKING:
 
         def model(self) -> QCommandMatchModel:
             ...
-
-        def indexWidget(self, index: QtCore.QModelIndex) -> QCommandLabel:
-            ...
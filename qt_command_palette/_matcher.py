@@ -0,0 +1,724 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import heapq
+import math
+from operator import itemgetter
+import re
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+from . import _vectorized
+from ._commands import Command, Query
+from ._index import TrigramIndex
+from ._table import CommandTable
+
+_first = itemgetter(0)
+# sort key of the matches that are not boosted
+_UNBOOSTED = -math.inf
+
+# number of candidates above which the NumPy prefilter is used
+NUMPY_THRESHOLD = 20_000
+# number of candidates above which the fuzzy matcher uses NumPy
+FUZZY_NUMPY_THRESHOLD = 1_000
+# default number of the match results cached per palette
+RESULT_CACHE_SIZE = 128
+
+
+class SearchTable:
+    """
+    Column-wise search data of a sequence of commands.
+
+    Matchers work on indices of this table, so that the per-command attributes
+    are looked up only once when the table is built. A table of a large command
+    store also has the trigram index of the store and the ids of the commands in
+    the index. The bigram signatures and the position masks of the keys used by
+    NumPy, and the indices of the texts, are computed on first use.
+
+    The columns are snapshots of the commands when the table is built, but the
+    commands of a ``CommandTable`` are looked up in the live table. The indices
+    are only valid while the version of the store is unchanged.
+    """
+
+    __slots__ = (
+        "commands",
+        "_texts",
+        "_build_texts",
+        "keys",
+        "title_lengths",
+        "index",
+        "uids",
+        "_positions",
+        "_text_indices",
+        "_duplicates",
+        "_signatures",
+        "_char_masks",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        commands: Iterable[Command],
+        index: TrigramIndex | None = None,
+        uids: list[int] | None = None,
+    ) -> None:
+        if isinstance(commands, CommandTable):
+            # use the columns; the commands are handed out as views on demand
+            self.commands: Sequence[Command] = commands
+            self._texts: list[str] | None = None  # only needed by some matchers
+            self._build_texts: Callable[[], list[str]] | None = commands.text_builder()
+            self.keys = commands.keys.copy()
+            self.title_lengths = commands.title_lengths()
+        else:
+            self.commands = list(commands)
+            self._texts = [cmd.fmt() for cmd in self.commands]
+            self._build_texts = None
+            self.keys = [cmd.search_key for cmd in self.commands]
+            self.title_lengths = [len(cmd.title) for cmd in self.commands]
+        self.index = index
+        self.uids = uids
+        self._positions: dict[int, int] | None = None
+        self._text_indices: dict[str, int] | None = None
+        self._duplicates: dict[str, list[int]] = {}
+        self._signatures = None
+        self._char_masks: _vectorized.CharMasks | None = None
+
+    @classmethod
+    def from_columns(
+        cls, keys: list[str], texts: list[str], title_lengths: list[int]
+    ) -> SearchTable:
+        """Build a table of the columns only, without the command objects."""
+        self = cls(())
+        self._texts = texts
+        self.keys = keys
+        self.title_lengths = title_lengths
+        return self
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def texts(self) -> list[str]:
+        """The formatted texts of the commands."""
+        if (texts := self._texts) is None:
+            if (build := self._build_texts) is None:
+                return self._texts  # built by another thread in the meantime
+            texts = self._texts = build()
+            self._build_texts = None
+        return texts
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{len(self)} commands>)"
+
+    def lookup(self, words: Sequence[str]) -> list[int] | None:
+        """
+        Find the candidate indices of the commands that contain all the words.
+
+        Returns None if the table has no index or the words are too short to use
+        it. The candidates are sorted but still have to be verified.
+        """
+        if self.index is None or self.uids is None:
+            return None
+        found = self.index.lookup(words)
+        if found is None or len(found) * 2 > len(self):
+            return None  # scanning is as fast as sorting the candidates
+        if self._positions is None:
+            self._positions = {uid: i for i, uid in enumerate(self.uids)}
+        positions = self._positions
+        # the index may have ids of the commands added after this table is built
+        return sorted(positions[uid] for uid in found if uid in positions)
+
+    def find_text(self, text: str) -> list[int]:
+        """Find the indices of the commands of the formatted text."""
+        if (text_indices := self._text_indices) is None:
+            texts = self.texts
+            # reversed, so that the first index of a text is kept
+            text_indices = dict(zip(reversed(texts), range(len(texts) - 1, -1, -1)))
+            if len(text_indices) < len(texts):
+                for i, each in enumerate(texts):
+                    if (first := text_indices[each]) != i:
+                        self._duplicates.setdefault(each, [first]).append(i)
+            self._text_indices = text_indices
+        if (duplicates := self._duplicates.get(text)) is not None:
+            return duplicates
+        if (i := text_indices.get(text)) is None:
+            return []
+        return [i]
+
+    def prefilter(
+        self, words: Sequence[str], candidates: Sequence[int]
+    ) -> list[int] | None:
+        """
+        Drop the candidates that cannot contain all the words, using NumPy.
+
+        Returns None if NumPy is not installed, the words are too short to
+        filter or most of the candidates remain. The remaining candidates are in
+        the same order but still have to be verified.
+        """
+        if not _vectorized.available():
+            return None
+        if self._signatures is None:
+            self._signatures = _vectorized.signatures(self.keys)
+        return _vectorized.prefilter(self._signatures, words, candidates)
+
+    def char_masks(self) -> _vectorized.CharMasks | None:
+        """The position masks of the keys, or None if NumPy is not installed."""
+        if not _vectorized.available():
+            return None
+        if (masks := self._char_masks) is None:
+            masks = self._char_masks = _vectorized.CharMasks(
+                self.keys, self.texts, self.title_lengths
+            )
+        return masks
+
+
+class MatchResult:
+    """
+    The cached result of a query: the matches, the best ones and their spans.
+
+    All the matches are kept in the list order, so that only they need to be
+    ranked again when the frecency of the commands is changed.
+    """
+
+    __slots__ = ("matches", "best", "boost", "max_results", "spans")
+
+    def __init__(
+        self,
+        matches: list[int],
+        best: list[int],
+        boost: Mapping[int, float],
+        max_results: int,
+    ) -> None:
+        self.matches = matches
+        self.best = best
+        # the frecency and the number of the results the best ones are ranked with
+        self.boost = boost
+        self.max_results = max_results
+        # command text -> spans, filled as the rows are painted
+        self.spans: dict[str, list[tuple[int, int]]] = {}
+
+    def ranked_with(self, boost: Mapping[int, float], max_results: int) -> bool:
+        """True if the best matches are ranked with the frecency and the size."""
+        return max_results == self.max_results and boost == self.boost
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{len(self.best)} matches>)"
+
+
+class Matcher(ABC):
+    """Base class of the command matchers."""
+
+    @abstractmethod
+    def match(
+        self,
+        query: Query,
+        table: SearchTable,
+        candidates: Sequence[int],
+        max_results: int,
+        boost: Mapping[int, float] | None = None,
+    ) -> tuple[list[int], list[int]]:
+        """
+        Match the commands to the query.
+
+        Parameters
+        ----------
+        query : Query
+            The compiled query.
+        table : SearchTable
+            The search table of all the commands.
+        candidates : sequence of int
+            Indices of the candidate commands in the table, in the list order.
+        max_results : int
+            The maximum number of commands to be displayed.
+        boost : mapping of int to float, optional
+            Frecency of the recently used commands, mapped from their indices.
+            Matchers should rank these commands higher.
+
+        Returns
+        -------
+        (list of int, list of int)
+            Indices of all the matched commands in the list order, and indices of
+            the best matches to be displayed (at most ``max_results``).
+        """
+
+    def rank(
+        self,
+        query: Query,
+        table: SearchTable,
+        candidates: Sequence[int],
+        max_results: int,
+        boost: Mapping[int, float] | None = None,
+    ) -> tuple[list[int], list[tuple[float, int]]]:
+        """
+        Match the commands, and return the best matches with their sort keys.
+
+        Same as ``match``, except that the best matches are (key, index) pairs
+        sorted by the descending key, with ties in the list order. The best
+        matches of disjoint parts of a table can then be merged by their keys.
+        Matchers that implement this method can be used by ``ShardedMatcher``.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support ranking")
+
+    def refines(self, query: Query, other: Query) -> bool:
+        """True if all the matches of ``query`` are also matches of ``other``."""
+        return query.refines(other)
+
+    def highlight(self, query: Query, text: str) -> list[tuple[int, int]]:
+        """
+        Find the spans of the text to be highlighted.
+
+        Returns sorted, non-overlapping (start, stop) pairs. By default, the
+        occurrences of the query words are highlighted.
+        """
+        return _substring_spans(query, text)
+
+
+class SubstringMatcher(Matcher):
+    """
+    The default matcher.
+
+    A command matches if all the words of the query are found in the command text.
+    The recently used commands are displayed first in the order of frecency, and
+    the others in the list order. If the search table has a trigram index, the
+    candidates are narrowed down by the index before the words are checked.
+
+    Parameters
+    ----------
+    numpy_threshold : int or None, default 20000
+        If NumPy is installed and there are at least this many candidates, the
+        ones that cannot match are dropped by a vectorized prefilter before the
+        words are checked. The results are the same either way. None disables
+        the prefilter.
+    """
+
+    def __init__(self, *, numpy_threshold: int | None = NUMPY_THRESHOLD) -> None:
+        self.numpy_threshold = numpy_threshold
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+    def match(
+        self,
+        query: Query,
+        table: SearchTable,
+        candidates: Sequence[int],
+        max_results: int,
+        boost: Mapping[int, float] | None = None,
+    ) -> tuple[list[int], list[int]]:
+        matches, best = self.rank(query, table, candidates, max_results, boost)
+        return matches, [i for _, i in best]
+
+    def rank(
+        self,
+        query: Query,
+        table: SearchTable,
+        candidates: Sequence[int],
+        max_results: int,
+        boost: Mapping[int, float] | None = None,
+    ) -> tuple[list[int], list[tuple[float, int]]]:
+        keys = table.keys
+        if (
+            len(candidates) == len(table)
+            and (found := table.lookup(query.words)) is not None
+        ):
+            # all the commands are candidates; narrow them down by the index
+            candidates = found
+        if (
+            self.numpy_threshold is not None
+            and len(candidates) >= self.numpy_threshold
+            and (narrowed := table.prefilter(query.words, candidates)) is not None
+        ):
+            candidates = narrowed
+        matches = list(candidates)
+        for word in query.words:
+            matches = [i for i in matches if word in keys[i]]
+        return matches, _promote(matches, boost, max_results)
+
+
+class FuzzyMatcher(Matcher):
+    """
+    A matcher that ranks commands by fuzzy matching.
+
+    Each word of the query has to appear in the command text as a subsequence.
+    Contiguous hits, hits at word starts or camelCase humps, and hits in the
+    description rather than the title are rewarded. Ties are resolved by the list
+    order.
+
+    Parameters
+    ----------
+    word_start_bonus : float, default 8.0
+        Bonus for a character matched at the start of a word.
+    camel_bonus : float, default 6.0
+        Bonus for a character matched at a camelCase hump.
+    consecutive_bonus : float, default 4.0
+        Bonus for a character matched right after the previous one. Such a
+        character also inherits the bonus of the first character of the run.
+    title_bonus : float, default 0.0
+        Bonus for a query word whose first character is matched in the title.
+    desc_bonus : float, default 4.0
+        Bonus for a query word whose first character is matched in the
+        description.
+    gap_penalty : float, default 3.0
+        Penalty for each gap between matched characters.
+    history_bonus : float, default 8.0
+        Bonus for a recently used command, multiplied by log2(1 + frecency).
+    numpy_threshold : int or None, default 1000
+        If NumPy is installed and there are at least this many candidates, the
+        commands are matched and scored by bit operations on whole arrays of
+        the character positions. The results are the same either way. None
+        disables it.
+    """
+
+    def __init__(
+        self,
+        *,
+        word_start_bonus: float = 8.0,
+        camel_bonus: float = 6.0,
+        consecutive_bonus: float = 4.0,
+        title_bonus: float = 0.0,
+        desc_bonus: float = 4.0,
+        gap_penalty: float = 3.0,
+        history_bonus: float = 8.0,
+        numpy_threshold: int | None = FUZZY_NUMPY_THRESHOLD,
+    ) -> None:
+        self.word_start_bonus = word_start_bonus
+        self.camel_bonus = camel_bonus
+        self.consecutive_bonus = consecutive_bonus
+        self.title_bonus = title_bonus
+        self.desc_bonus = desc_bonus
+        self.gap_penalty = gap_penalty
+        self.history_bonus = history_bonus
+        self.numpy_threshold = numpy_threshold
+        # the latest candidates and matches with their arrays, for reuse as candidates
+        self._recent: list[tuple[list[int], Any]] = []
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_recent"] = []
+        return state
+
+    def score(self, query: Query, cmd: Command) -> float | None:
+        """Score the command, or return None if it does not match the query."""
+        key = cmd.search_key
+        for word in query.words:
+            if not _subsequence_filter(word)(key):
+                return None
+        return self._scorer(query)(key, cmd.fmt(), len(cmd.title))
+
+    def _scorer(self, query: Query) -> Callable[[str, str, int], float]:
+        """Compile a function that scores a command known to match the query."""
+        word_start_bonus = self.word_start_bonus
+        camel_bonus = self.camel_bonus
+        consecutive_bonus = self.consecutive_bonus
+        title_bonus = self.title_bonus
+        desc_bonus = self.desc_bonus
+        gap_penalty = self.gap_penalty
+        subsequence = _is_subsequence
+
+        def boundary_bonus(text: str, pos: int) -> float:
+            if pos == 0 or not text[pos - 1].isalnum():
+                return word_start_bonus
+            elif text[pos].isupper() and text[pos - 1].islower():
+                return camel_bonus
+            return 0.0
+
+        def contiguous_score(nchars: int, bonus: float) -> float:
+            # characters following the first one inherit its bonus
+            return nchars + bonus + (nchars - 1) * max(bonus, consecutive_bonus)
+
+        # (word, score of a contiguous hit at a word start)
+        compiled = [
+            (word, contiguous_score(len(word), word_start_bonus))
+            for word in query.words
+        ]
+
+        def _score(key: str, text: str, title_length: int) -> float:
+            if len(key) != len(text):
+                # lower() changed the length; boundaries cannot be aligned
+                text = key
+            score = 0.0
+            for word, word_start_score in compiled:
+                if (pos := key.find(word)) >= 0:
+                    # contiguous hit; prefer an occurrence at a word start
+                    if pos == 0 or not text[pos - 1].isalnum():
+                        score += word_start_score
+                    else:
+                        first = pos
+                        while (bonus := boundary_bonus(text, pos)) == 0.0:
+                            pos = key.find(word, pos + 1)
+                            if pos < 0:
+                                pos = first
+                                break
+                        score += contiguous_score(len(word), bonus)
+                else:
+                    # subsequence hit; prefer to start at a word start
+                    pos = index = key.find(word[0])
+                    run_bonus = boundary_bonus(text, index)
+                    while run_bonus == 0.0:
+                        index = key.find(word[0], index + 1)
+                        if index < 0 or not subsequence(word, key, index):
+                            index = pos
+                            break
+                        run_bonus = boundary_bonus(text, index)
+                    pos = index
+                    score += 1.0 + run_bonus
+                    for nth in range(1, len(word)):
+                        char = word[nth]
+                        next_index = key.find(char, index + 1)
+                        if next_index == index + 1:
+                            score += 1.0 + max(run_bonus, consecutive_bonus)
+                        else:
+                            run_bonus = boundary_bonus(text, next_index)
+                            # look ahead for a hit at a word start
+                            ahead = next_index
+                            while run_bonus == 0.0:
+                                ahead = key.find(char, ahead + 1)
+                                if ahead < 0:
+                                    break
+                                if (
+                                    bonus := boundary_bonus(text, ahead)
+                                ) and subsequence(word[nth:], key, ahead):
+                                    next_index = ahead
+                                    run_bonus = bonus
+                            score += 1.0 + run_bonus - gap_penalty
+                        index = next_index
+                if pos < title_length:
+                    score += title_bonus
+                else:
+                    score += desc_bonus
+            return score
+
+        return _score
+
+    def highlight(self, query: Query, text: str) -> list[tuple[int, int]]:
+        """Highlight the contiguous hits and the characters of subsequence hits."""
+        key = text.lower()
+        if len(key) != len(text):
+            return _substring_spans(query, text)
+        marked = bytearray(len(text))
+        for word in query.words:
+            if (pos := key.find(word)) >= 0:
+                marked[pos : pos + len(word)] = b"\x01" * len(word)
+                continue
+            index = -1
+            for nth, char in enumerate(word):
+                prev, index = index, key.find(char, index + 1)
+                if index < 0:
+                    break
+                if index != prev + 1 and not _at_boundary(text, index):
+                    # look ahead for a hit at a word start, as the scorer does
+                    ahead = index
+                    while (ahead := key.find(char, ahead + 1)) >= 0:
+                        if _at_boundary(text, ahead) and _is_subsequence(
+                            word[nth:], key, ahead
+                        ):
+                            index = ahead
+                            break
+                marked[index] = 1
+        spans: list[tuple[int, int]] = []
+        start = -1
+        for i, flag in enumerate(marked):
+            if flag and start < 0:
+                start = i
+            elif not flag and start >= 0:
+                spans.append((start, i))
+                start = -1
+        if start >= 0:
+            spans.append((start, len(text)))
+        return spans
+
+    def match(
+        self,
+        query: Query,
+        table: SearchTable,
+        candidates: Sequence[int],
+        max_results: int,
+        boost: Mapping[int, float] | None = None,
+    ) -> tuple[list[int], list[int]]:
+        matches, best = self.rank(query, table, candidates, max_results, boost)
+        return matches, [i for _, i in best]
+
+    def rank(
+        self,
+        query: Query,
+        table: SearchTable,
+        candidates: Sequence[int],
+        max_results: int,
+        boost: Mapping[int, float] | None = None,
+    ) -> tuple[list[int], list[tuple[float, int]]]:
+        words = query.words
+        if not words:
+            matches = list(candidates)
+            return matches, _promote(matches, boost, max_results)
+        if (
+            self.numpy_threshold is not None
+            and len(candidates) >= self.numpy_threshold
+            and (
+                ranked := self._rank_vectorized(
+                    query, table, candidates, max_results, boost
+                )
+            )
+            is not None
+        ):
+            return ranked
+        matches = list(candidates)
+        keys = table.keys
+        for word in words:
+            _filter = _subsequence_filter(word)
+            matches = [i for i in matches if _filter(keys[i])]
+
+        texts = table.texts
+        title_lengths = table.title_lengths
+        score = self._scorer(query)
+        scored = [(score(keys[i], texts[i], title_lengths[i]), i) for i in matches]
+        if boost:
+            bonus = self.history_bonus
+            scored = [
+                (s + bonus * math.log2(1.0 + boost[i]), i) if i in boost else (s, i)
+                for s, i in scored
+            ]
+        # bounded heap selection; stable, so ties keep the list order
+        return matches, heapq.nlargest(max_results, scored, key=_first)
+
+    def _rank_vectorized(
+        self,
+        query: Query,
+        table: SearchTable,
+        candidates: Sequence[int],
+        max_results: int,
+        boost: Mapping[int, float] | None,
+    ) -> tuple[list[int], list[tuple[float, int]]] | None:
+        """Rank the candidates by bit operations on the position masks."""
+        if (masks := table.char_masks()) is None:
+            return None
+        np = _vectorized._import_numpy()
+        words = query.words
+        if len(candidates) == len(table):
+            rows = None  # all the commands, in the list order
+            indices = np.arange(len(table))
+        else:
+            for recent, array in self._recent:
+                if recent is candidates:
+                    rows = indices = array
+                    break
+            else:
+                rows = indices = np.asarray(candidates, dtype=np.intp)
+            # the candidates stay recent, as they are again after a backspace
+            self._recent = [(candidates, indices)]
+        result = _vectorized.fuzzy_scores(
+            masks,
+            words,
+            rows,
+            word_start_bonus=self.word_start_bonus,
+            camel_bonus=self.camel_bonus,
+            consecutive_bonus=self.consecutive_bonus,
+            title_bonus=self.title_bonus,
+            desc_bonus=self.desc_bonus,
+            gap_penalty=self.gap_penalty,
+        )
+        if result is None:
+            return None
+        positions, scores = result
+        # keys too long for the masks are matched by the loop
+        if (long := np.flatnonzero(masks.long[indices])).size:
+            keys, texts, title_lengths = table.keys, table.texts, table.title_lengths
+            filters = [_subsequence_filter(word) for word in words]
+            score = self._scorer(query)
+            found = [
+                (pos, score(keys[i], texts[i], title_lengths[i]))
+                for pos, i in zip(long.tolist(), indices[long].tolist())
+                if all(_filter(keys[i]) for _filter in filters)
+            ]
+            if found:
+                positions = np.concatenate([positions, [pos for pos, _ in found]])
+                scores = np.concatenate([scores, [value for _, value in found]])
+                order = np.argsort(positions, kind="stable")
+                positions, scores = positions[order], scores[order]
+        matched_indices = indices[positions]
+        if boost:
+            bonus = self.history_bonus
+            boosted = np.flatnonzero(np.isin(matched_indices, list(boost)))
+            for pos, i in zip(boosted.tolist(), matched_indices[boosted].tolist()):
+                scores[pos] += bonus * math.log2(1.0 + boost[i])
+        top = _vectorized.top_positions(scores, max_results)
+        # the ties are in the list order
+        top = top[np.argsort(-scores[top], kind="stable")]
+        best = list(zip(scores[top].tolist(), matched_indices[top].tolist()))
+        matches = masks.rows[matched_indices].tolist()
+        self._recent = self._recent[-1:] + [(matches, matched_indices)]
+        return matches, best
+
+
+def _substring_spans(query: Query, text: str) -> list[tuple[int, int]]:
+    """Spans of the occurrences of the query words."""
+    if not query.words:
+        return []
+    return [m.span() for m in query.pattern().finditer(text)]
+
+
+def _promote(
+    matches: list[int], boost: Mapping[int, float] | None, max_results: int
+) -> list[tuple[float, int]]:
+    """Select the best matches with their frecency, the boosted ones first."""
+    if not boost:
+        return [(_UNBOOSTED, i) for i in matches[:max_results]]
+    promoted = [(boost[i], i) for i in matches if i in boost]
+    # stable, so ties keep the list order
+    promoted.sort(key=_first, reverse=True)
+    best = promoted[:max_results]
+    if len(best) < max_results:
+        for i in matches:
+            if i not in boost:
+                best.append((_UNBOOSTED, i))
+                if len(best) >= max_results:
+                    break
+    return best
+
+
+def _at_boundary(text: str, pos: int) -> bool:
+    """True if the position is at a word start or a camelCase hump."""
+    return (
+        pos == 0
+        or not text[pos - 1].isalnum()
+        or (text[pos].isupper() and text[pos - 1].islower())
+    )
+
+
+def _is_subsequence(word: str, text: str, start: int) -> bool:
+    """True if the word is a subsequence of the text from the start position."""
+    index = start
+    for char in word[1:]:
+        index = text.find(char, index + 1)
+        if index < 0:
+            return False
+    return True
+
+
+def _subsequence_filter(word: str) -> Callable[[str], object]:
+    """Return a function that checks if the word is a subsequence of a text."""
+    if len(word) == 1:
+        return lambda text: word in text
+    # a linear pattern such as "a[^b]*b[^c]*c"
+    pattern = re.compile(
+        "".join(f"{re.escape(a)}[^{re.escape(b)}]*" for a, b in zip(word, word[1:]))
+        + re.escape(word[-1])
+    ).search
+    first, last = word[0], word[-1]
+
+    def _filter(text: str) -> object:
+        return word in text or (last in text and first in text and pattern(text))
+
+    return _filter
+
+
+def as_matcher(matcher: Matcher | str) -> Matcher:
+    """Convert a matcher name to a matcher instance."""
+    if isinstance(matcher, Matcher):
+        return matcher
+    if matcher == "substring":
+        return SubstringMatcher()
+    elif matcher == "fuzzy":
+        return FuzzyMatcher()
+    raise ValueError(f"Unknown matcher: {matcher!r}")
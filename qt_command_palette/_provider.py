@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
+from typing import Any, AsyncIterable, Callable, Iterable, Union
+
+from ._commands import Command
+
+logger = logging.getLogger(__name__)
+
+# interval in seconds to deliver the items of a slow provider even if the batch
+# is not full yet
+BATCH_INTERVAL = 0.05
+
+_ProviderFunction = Callable[
+    [str], Union[Iterable[Union[Command, Callable]], AsyncIterable[Any]]
+]
+
+
+class CommandProvider:
+    """
+    A source of commands that depend on the query.
+
+    The function is called with the input text and returns an iterable, or an
+    async iterable, of commands or callables. It is pulled in a background thread
+    and the items are delivered in batches of ``batch_size`` as they arrive.
+    Callables are converted into commands named after them.
+
+    >>> def recent_files(text: str):
+    ...     for path in iter_recent_files():
+    ...         if text in path:
+    ...             yield Command(lambda: open_file(path), "Open", path)
+    >>> provider = CommandProvider(recent_files)
+    """
+
+    def __init__(
+        self,
+        function: _ProviderFunction,
+        title: str = "",
+        *,
+        batch_size: int = 50,
+        wrap: Callable[[Command, str], Command] | None = None,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self._function = function
+        self._title = title
+        self._batch_size = batch_size
+        self._wrap = wrap
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._function!r}, title={self._title!r})"
+
+    @property
+    def function(self) -> _ProviderFunction:
+        """The function that provides the commands."""
+        return self._function
+
+    @property
+    def title(self) -> str:
+        """Title of the provided commands that have no title."""
+        return self._title
+
+    @property
+    def batch_size(self) -> int:
+        """Maximum number of the commands delivered at once."""
+        return self._batch_size
+
+    def stream(
+        self, text: str, callback: Callable[[list[Command]], Any]
+    ) -> ProviderStream:
+        """
+        Start providing the commands for the input text in a background thread.
+
+        The callback is called in the background thread with each batch.
+        """
+        return ProviderStream(self, text, callback)
+
+    def to_command(self, item: Command | Callable) -> Command:
+        """
+        Convert a provided item into a command.
+
+        A provided command is not changed, as it may be used elsewhere; a copy is
+        created if it needs the title of the provider.
+        """
+        if isinstance(item, Command):
+            cmd = item
+        elif callable(item):
+            desc = getattr(item, "__name__", repr(item))
+            tooltip = getattr(item, "__doc__", "") or ""
+            cmd = Command(item, self._title, desc, tooltip)
+        else:
+            raise TypeError(f"Provider yielded {item!r}, not a command or callable")
+        title = cmd.title or self._title
+        if self._wrap is not None:
+            return self._wrap(cmd, title)
+        if title != cmd.title:
+            cmd = Command(cmd.function, title, cmd.desc, cmd.tooltip, cmd.when)
+        return cmd
+
+
+class ProviderStream:
+    """A running provider, pulled in a background thread until cancelled."""
+
+    def __init__(
+        self,
+        provider: CommandProvider,
+        text: str,
+        callback: Callable[[list[Command]], Any],
+    ) -> None:
+        self._provider = provider
+        self._text = text
+        self._callback = callback
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+        self._batch: list[Command] = []
+        self._last_delivery = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="qt_command_palette_provider", daemon=True
+        )
+        self._thread.start()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._provider!r}, {self._text!r})"
+
+    @property
+    def text(self) -> str:
+        """The input text given to the provider."""
+        return self._text
+
+    def cancel(self) -> None:
+        """Stop pulling the provider; no more batch will be delivered."""
+        with self._lock:
+            self._cancelled.set()
+            if self._task is not None:
+                self._task.get_loop().call_soon_threadsafe(self._task.cancel)
+        return None
+
+    def cancelled(self) -> bool:
+        """True if the stream is cancelled."""
+        return self._cancelled.is_set()
+
+    def done(self) -> bool:
+        """True if the provider is exhausted, failed or cancelled."""
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait for the stream to be done."""
+        return self._done.wait(timeout)
+
+    def _run(self) -> None:
+        try:
+            items = self._provider.function(self._text)
+            if hasattr(items, "__aiter__") or inspect.isawaitable(items):
+                self._run_async(items)
+            else:
+                self._run_sync(items)
+            self._deliver()
+        except Exception:
+            logger.exception(f"Provider {self._provider!r} failed")
+        finally:
+            self._done.set()
+        return None
+
+    def _run_sync(self, items: Iterable[Command | Callable]) -> None:
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if self._cancelled.is_set():
+                    break
+                self._add(item)
+        finally:
+            if hasattr(iterator, "close"):
+                iterator.close()  # run the cleanup of a generator
+        return None
+
+    def _run_async(self, items: Any) -> None:
+        async def _consume():
+            nonlocal items
+            if inspect.isawaitable(items):
+                items = await items
+            if not hasattr(items, "__aiter__"):
+                return self._run_sync(items)
+            async for item in items:
+                if self._cancelled.is_set():
+                    break
+                self._add(item)
+
+        loop = asyncio.new_event_loop()
+        try:
+            task = loop.create_task(_consume())
+            with self._lock:
+                if self._cancelled.is_set():
+                    task.cancel()
+                self._task = task
+            try:
+                loop.run_until_complete(task)
+            except asyncio.CancelledError:
+                pass
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            with self._lock:
+                self._task = None
+            loop.close()
+        return None
+
+    def _add(self, item: Command | Callable) -> None:
+        self._batch.append(self._provider.to_command(item))
+        if (
+            len(self._batch) >= self._provider.batch_size
+            or time.perf_counter() - self._last_delivery > BATCH_INTERVAL
+        ):
+            self._deliver()
+        return None
+
+    def _deliver(self) -> None:
+        batch, self._batch = self._batch, []
+        self._last_delivery = time.perf_counter()
+        if batch and not self._cancelled.is_set():
+            self._callback(batch)
+        return None
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import heapq
+from itertools import accumulate, chain
+import logging
+import multiprocessing
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+import os
+import sys
+import threading
+from typing import Any, Mapping, NamedTuple, Sequence
+import weakref
+
+from ._commands import Query
+from ._matcher import Matcher, SearchTable, as_matcher, _first
+
+logger = logging.getLogger(__name__)
+
+# number of candidates above which the commands are matched in the process pool
+SHARD_THRESHOLD = 200_000
+
+
+class _Shard(NamedTuple):
+    """A contiguous part of a search table stored in a shared memory block."""
+
+    start: int  # index of the first command in the table
+    stop: int
+    keys: tuple[int, int]  # byte ranges in the block
+    texts: tuple[int, int]
+    key_lengths: tuple[int, int]
+    text_lengths: tuple[int, int]
+    title_lengths: tuple[int, int]
+
+
+class _ShardLayout:
+    """The columns of a search table copied to a shared memory block, in shards."""
+
+    def __init__(self, table: SearchTable, nshards: int) -> None:
+        size = len(table)
+        bounds = [size * i // nshards for i in range(nshards + 1)]
+        keys, texts, title_lengths = table.keys, table.texts, table.title_lengths
+        chunks: list[bytes] = []
+        offset = 0
+
+        def _put(data: bytes) -> tuple[int, int]:
+            nonlocal offset
+            chunks.append(data)
+            offset += len(data)
+            return offset - len(data), offset
+
+        shards: list[_Shard] = []
+        for start, stop in zip(bounds, bounds[1:]):
+            shards.append(
+                _Shard(
+                    start,
+                    stop,
+                    _put("".join(keys[start:stop]).encode("utf-8", "surrogatepass")),
+                    _put("".join(texts[start:stop]).encode("utf-8", "surrogatepass")),
+                    _put(array("q", map(len, keys[start:stop])).tobytes()),
+                    _put(array("q", map(len, texts[start:stop])).tobytes()),
+                    _put(array("q", title_lengths[start:stop]).tobytes()),
+                )
+            )
+        self.shards = shards
+        self.shm = SharedMemory(create=True, size=max(offset, 1))
+        self._finalizer = weakref.finalize(self, _release, self.shm)
+        position = 0
+        for data in chunks:
+            self.shm.buf[position : position + len(data)] = data
+            position += len(data)
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block."""
+        return self.shm.name
+
+    def release(self) -> None:
+        """Free the shared memory block."""
+        self._finalizer()
+        return None
+
+
+def _release(shm: SharedMemory) -> None:
+    shm.close()
+    shm.unlink()
+    return None
+
+
+class ShardedMatcher(Matcher):
+    """
+    A matcher that matches large command sets in a process pool.
+
+    The columns of the search table are copied to a shared memory block, split
+    into one shard per process, once per version of the commands. Each shard is
+    always matched by the same process, which decodes it once and returns the
+    local best matches, which are merged by their sort keys. Fewer candidates,
+    such as the ones narrowed down while typing, are matched in this process.
+
+    Parameters
+    ----------
+    matcher : Matcher or str, default "fuzzy"
+        The matcher to use in each process. It has to implement ``rank`` and to
+        be picklable.
+    processes : int, optional
+        Number of the processes. Defaults to the number of CPUs.
+    threshold : int, default 200000
+        Minimum number of candidates to use the process pool.
+    """
+
+    def __init__(
+        self,
+        matcher: Matcher | str = "fuzzy",
+        *,
+        processes: int | None = None,
+        threshold: int = SHARD_THRESHOLD,
+    ) -> None:
+        matcher = as_matcher(matcher)
+        if type(matcher).rank is Matcher.rank:
+            raise TypeError(f"{matcher!r} does not implement rank()")
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if processes < 1:
+            raise ValueError("processes must be positive")
+        self._matcher = matcher
+        self._processes = processes
+        self.threshold = threshold
+        # one process per shard, so that each process keeps only its shard
+        self._pools: list[ProcessPoolExecutor] = []
+        self._layouts: weakref.WeakKeyDictionary[
+            SearchTable, _ShardLayout
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._matcher!r}, processes={self._processes})"
+
+    @property
+    def matcher(self) -> Matcher:
+        """The matcher used in each process."""
+        return self._matcher
+
+    @property
+    def processes(self) -> int:
+        """Number of the processes."""
+        return self._processes
+
+    def refines(self, query: Query, other: Query) -> bool:
+        return self._matcher.refines(query, other)
+
+    def highlight(self, query: Query, text: str) -> list[tuple[int, int]]:
+        return self._matcher.highlight(query, text)
+
+    def match(
+        self,
+        query: Query,
+        table: SearchTable,
+        candidates: Sequence[int],
+        max_results: int,
+        boost: Mapping[int, float] | None = None,
+    ) -> tuple[list[int], list[int]]:
+        matches, best = self.rank(query, table, candidates, max_results, boost)
+        return matches, [i for _, i in best]
+
+    def rank(
+        self,
+        query: Query,
+        table: SearchTable,
+        candidates: Sequence[int],
+        max_results: int,
+        boost: Mapping[int, float] | None = None,
+    ) -> tuple[list[int], list[tuple[float, int]]]:
+        if len(candidates) < self.threshold or not query.words:
+            return self._matcher.rank(query, table, candidates, max_results, boost)
+        try:
+            return self._rank_sharded(query, table, candidates, max_results, boost)
+        except BrokenProcessPool:
+            logger.warning("Process pool of %r is broken; matching locally", self)
+            self.close()
+            return self._matcher.rank(query, table, candidates, max_results, boost)
+
+    def close(self) -> None:
+        """Shut down the processes and free the shared memory."""
+        with self._lock:
+            for pool in self._pools:
+                pool.shutdown(wait=False)
+            self._pools = []
+            for layout in list(self._layouts.values()):
+                layout.release()
+            self._layouts.clear()
+        return None
+
+    def _rank_sharded(
+        self,
+        query: Query,
+        table: SearchTable,
+        candidates: Sequence[int],
+        max_results: int,
+        boost: Mapping[int, float] | None,
+    ) -> tuple[list[int], list[tuple[float, int]]]:
+        with self._lock:
+            if (layout := self._layouts.get(table)) is None:
+                layout = self._layouts[table] = _ShardLayout(table, self._processes)
+            if not self._pools:
+                context = multiprocessing.get_context("spawn")
+                self._pools = [
+                    ProcessPoolExecutor(1, mp_context=context)
+                    for _ in range(self._processes)
+                ]
+            pools = self._pools
+        all_candidates = len(candidates) == len(table)
+        futures = []
+        for nth, shard in enumerate(layout.shards):
+            if all_candidates:
+                local_candidates = None
+            else:
+                # candidates are in the list order
+                start = bisect_left(candidates, shard.start)
+                stop = bisect_left(candidates, shard.stop, start)
+                local_candidates = array(
+                    "q", (i - shard.start for i in candidates[start:stop])
+                )
+                if not local_candidates:
+                    continue
+            local_boost = None
+            if boost:
+                local_boost = {
+                    i - shard.start: value
+                    for i, value in boost.items()
+                    if shard.start <= i < shard.stop
+                }
+            futures.append(
+                pools[nth].submit(
+                    _rank_shard,
+                    layout.name,
+                    nth,
+                    shard,
+                    self._matcher,
+                    query.text,
+                    local_candidates,
+                    max_results,
+                    local_boost,
+                )
+            )
+        matches: list[int] = []
+        bests: list[list[tuple[float, int]]] = []
+        for future in futures:
+            shard_matches, shard_best = future.result()
+            matches.extend(shard_matches)
+            bests.append(shard_best)
+        # shards are in the list order and the heap selection is stable, so ties
+        # keep the list order
+        return matches, heapq.nlargest(max_results, chain(*bests), key=_first)
+
+
+# the latest shard decoded in a worker process
+_worker_shard: dict[str, Any] = {"key": None, "table": None}
+
+
+def _rank_shard(
+    name: str,
+    nth: int,
+    shard: _Shard,
+    matcher: Matcher,
+    text: str,
+    candidates: Sequence[int] | None,
+    max_results: int,
+    boost: Mapping[int, float] | None,
+) -> tuple[array, list[tuple[float, int]]]:
+    """Rank the commands of a shard in a worker process."""
+    table = _shard_table(name, nth, shard)
+    if candidates is None:
+        candidates = range(len(table))
+    matches, best = matcher.rank(Query(text), table, candidates, max_results, boost)
+    offset = shard.start
+    return (
+        array("q", [i + offset for i in matches]),
+        [(key, i + offset) for key, i in best],
+    )
+
+
+def _shard_table(name: str, nth: int, shard: _Shard) -> SearchTable:
+    state = _worker_shard
+    if state["key"] != (name, nth):
+        state["table"] = None  # free the previous shard first
+        shm = _attach(name)
+        try:
+            buf = shm.buf
+            state["table"] = SearchTable.from_columns(
+                _split(buf, shard.keys, shard.key_lengths),
+                _split(buf, shard.texts, shard.text_lengths),
+                _lengths(buf, shard.title_lengths).tolist(),
+            )
+        finally:
+            shm.close()  # the columns are copied
+        state["key"] = (name, nth)
+    return state["table"]
+
+
+def _attach(name: str) -> SharedMemory:
+    """Attach to a shared memory block owned by the main process."""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    # Do not register the block to the resource tracker, as track=False does. A
+    # tracker of this process would unlink it on exit, and unregistering it from
+    # a tracker shared with the main process would forget the owner's record.
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _lengths(buf: memoryview, span: tuple[int, int]) -> array:
+    lengths = array("q")
+    lengths.frombytes(buf[span[0] : span[1]])
+    return lengths
+
+
+def _split(buf: memoryview, span: tuple[int, int], lengths: tuple[int, int]) -> list:
+    """Decode the joined strings and split them by their lengths."""
+    joined = bytes(buf[span[0] : span[1]]).decode("utf-8", "surrogatepass")
+    ends = list(accumulate(_lengths(buf, lengths)))
+    return [joined[start:stop] for start, stop in zip([0] + ends[:-1], ends)]
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+from contextlib import nullcontext
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, NamedTuple
+
+if TYPE_CHECKING:
+    from qtpy import QtCore
+
+# phases of the palette to be timed
+MATCH = "match"  # matching the commands to the query
+HIGHLIGHT = "highlight"  # rendering the markup of a row
+UPDATE = "update"  # updating the list widget with the matches
+WHEN = "when"  # evaluating the enabled state of a command
+GETTERS = "getters"  # resolving the arguments from the storage
+EXECUTE = "execute"  # executing a command
+
+# latencies are counted in power-of-two microsecond buckets
+_NBUCKETS = 32
+
+
+class PhaseStats(NamedTuple):
+    """Statistics of the latencies of a phase."""
+
+    count: int
+    total: float
+    min: float
+    max: float
+    histogram: tuple[int, ...]  # counts of [2^(i-1), 2^i) microseconds
+
+    @property
+    def mean(self) -> float:
+        """Mean latency in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Approximate the q-th percentile latency in seconds from the histogram."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        cumsum = 0
+        for i, n in enumerate(self.histogram):
+            cumsum += n
+            if cumsum >= rank:
+                # the upper bound of the bucket
+                return min((1 << i) * 1e-6, self.max)
+        return self.max
+
+
+class _Phase:
+    __slots__ = ("count", "total", "min", "max", "histogram")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.histogram = [0] * _NBUCKETS
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.histogram[min(int(seconds * 1e6).bit_length(), _NBUCKETS - 1)] += 1
+
+    def snapshot(self) -> PhaseStats:
+        return PhaseStats(
+            self.count,
+            self.total,
+            self.min if self.count else 0.0,
+            self.max,
+            tuple(self.histogram),
+        )
+
+
+class Instrumentation:
+    """
+    Opt-in timing of the phases of the command palettes.
+
+    Once enabled, the latencies of matching, highlighting, widget updates, ``when``
+    evaluation, getter resolution and command execution are counted. Callbacks
+    and the ``timed`` Qt signal of ``qt_signals()`` are notified of each timing,
+    and a profiler hook can wrap each phase in its own context manager.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._phases: dict[str, _Phase] = {}
+        self._callbacks: list[Callable[[str, float], Any]] = []
+        self._profiler_hook: Callable[[str], ContextManager] | None = None
+        self._qt_signals: _QtSignals | None = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(enabled={self.enabled})"
+
+    @property
+    def enabled(self) -> bool:
+        """True if the timings are recorded."""
+        return _ACTIVE is self
+
+    def enable(self, enabled: bool = True) -> None:
+        """Enable or disable the instrumentation."""
+        global _ACTIVE
+        if enabled:
+            _ACTIVE = self
+        elif _ACTIVE is self:
+            _ACTIVE = None
+        return None
+
+    def stats(self) -> dict[str, PhaseStats]:
+        """Statistics of each phase."""
+        with self._lock:
+            return {name: phase.snapshot() for name, phase in self._phases.items()}
+
+    def reset(self) -> None:
+        """Clear the statistics."""
+        with self._lock:
+            self._phases.clear()
+        return None
+
+    def add_callback(self, callback: Callable[[str, float], Any]) -> None:
+        """Add a callback called with the phase name and the seconds it took."""
+        self._callbacks.append(callback)
+        return None
+
+    def remove_callback(self, callback: Callable[[str, float], Any]) -> None:
+        """Remove a callback."""
+        self._callbacks.remove(callback)
+        return None
+
+    def set_profiler_hook(self, hook: Callable[[str], ContextManager] | None) -> None:
+        """
+        Set a function that returns a context manager to enter during each phase.
+
+        >>> instrumentation.set_profiler_hook(lambda phase: tracer.span(phase))
+        """
+        self._profiler_hook = hook
+        return None
+
+    def qt_signals(self) -> QtCore.QObject:
+        """The Qt object whose ``timed(str, float)`` signal notifies the timings."""
+        if self._qt_signals is None:
+            self._qt_signals = _make_qt_signals()
+            self.add_callback(self._qt_signals.timed.emit)
+        return self._qt_signals
+
+    def measure(self, phase: str) -> ContextManager:
+        """Context manager that records the time spent in it."""
+        return _Timer(self, phase)
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Record a timing of a phase."""
+        with self._lock:
+            if (stats := self._phases.get(phase)) is None:
+                stats = self._phases[phase] = _Phase()
+            stats.add(seconds)
+        for callback in self._callbacks:
+            callback(phase, seconds)
+        return None
+
+
+class _Timer:
+    __slots__ = ("_instrumentation", "_phase", "_start", "_hook")
+
+    def __init__(self, instrumentation: Instrumentation, phase: str) -> None:
+        self._instrumentation = instrumentation
+        self._phase = phase
+        self._hook: ContextManager | None = None
+
+    def __enter__(self) -> _Timer:
+        if (hook := self._instrumentation._profiler_hook) is not None:
+            self._hook = hook(self._phase)
+            self._hook.__enter__()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self._start
+        if self._hook is not None:
+            self._hook.__exit__(*exc_info)
+        self._instrumentation.record(self._phase, elapsed)
+        return None
+
+
+_ACTIVE: Instrumentation | None = None
+_INSTRUMENTATION = Instrumentation()
+_NULL_CONTEXT = nullcontext()
+
+
+def get_instrumentation() -> Instrumentation:
+    """Get the instrumentation of the command palettes."""
+    return _INSTRUMENTATION
+
+
+def measure(phase: str) -> ContextManager:
+    """Time the phase if the instrumentation is enabled."""
+    if _ACTIVE is None:
+        return _NULL_CONTEXT
+    return _ACTIVE.measure(phase)
+
+
+def active() -> Instrumentation | None:
+    """The enabled instrumentation, if any."""
+    return _ACTIVE
+
+
+if TYPE_CHECKING:
+
+    class _QtSignals(QtCore.QObject):
+        timed: QtCore.SignalInstance
+
+
+def _make_qt_signals() -> _QtSignals:
+    from qtpy import QtCore
+    from qtpy.QtCore import Signal
+
+    class QInstrumentationSignals(QtCore.QObject):
+        timed = Signal(str, float)  # phase, seconds
+
+    return QInstrumentationSignals()
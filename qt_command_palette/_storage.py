@@ -1,9 +1,29 @@
 from __future__ import annotations
+from enum import Enum
 from typing import Any, Callable, TypeVar, overload
 import inspect
+import os
+import sys
+import types
+import warnings
+import weakref
+
+from . import _stats
+from ._cache import LRUCache, _MISSING
 
 _R = TypeVar("_R")
 
+# number of cached plans of the callables that cannot be weakly referenced
+PLAN_CACHE_SIZE = 256
+
+
+class CacheScope(Enum):
+    """How long the value of a getter is cached."""
+
+    call = "call"  # evaluated once per call
+    session = "session"  # cached until the palette is shown again
+    persistent = "persistent"  # cached until invalidated or expired
+
 
 class Storage:
     """The variable storage."""
@@ -12,34 +32,81 @@ class Storage:
 
     def __init__(self):
         self._varmap: dict[str, Callable[..., Any]] = {}
+        # plans are dropped with their functions
+        self._plans: weakref.WeakKeyDictionary[
+            Callable[..., Any], ResolutionPlan
+        ] = weakref.WeakKeyDictionary()
+        self._other_plans: LRUCache[Callable[..., Any], ResolutionPlan] = LRUCache(
+            PLAN_CACHE_SIZE
+        )
+        self._cached_getters: dict[str, _CachedGetter] = {}
 
     @overload
-    def mark_getter(self, func: Callable[..., Any]) -> Callable[..., Any]:
+    def mark_getter(
+        self,
+        func: Callable[..., Any],
+        *,
+        scope: str = "call",
+        ttl: float | None = None,
+        maxsize: int | None = 128,
+    ) -> Callable[..., Any]:
         ...
 
     @overload
     def mark_getter(
-        self, name: str
+        self,
+        name: str | None = None,
+        *,
+        scope: str = "call",
+        ttl: float | None = None,
+        maxsize: int | None = 128,
     ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
         ...
 
-    def mark_getter(self, name, func=None):
+    def mark_getter(self, name=None, func=None, *, scope="call", ttl=None, maxsize=128):
+        """
+        Mark a function as the getter of a variable.
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the variable. The function name is used by default.
+        scope : str, default "call"
+            How long the value is cached. A getter is evaluated at most once per
+            call in any case. "session" caches the value until the palette is
+            shown again, and "persistent" until ``invalidate`` is called.
+        ttl : float, optional
+            If given, cached values expire after this many seconds.
+        maxsize : int, optional
+            The maximum number of cached values, one for each combination of
+            the arguments of the getter.
+        """
         if callable(name) and func is None:
             func = name
-            name = func.__name__
-        elif isinstance(name, str):
-            pass
-        else:
+            name = None
+        elif name is not None and not isinstance(name, str):
             raise TypeError(f"Invalid type for name: {type(name)}")
+        scope = CacheScope(scope)
+        if scope is CacheScope.call and ttl is not None:
+            raise ValueError("ttl cannot be used with the 'call' scope")
 
-        def wrapper(f: Callable[[], Any]):
-            self._varmap[name] = f
+        def wrapper(f: Callable[..., Any]):
+            _name = f.__name__ if name is None else name
+            self._cached_getters.pop(_name, None)
+            if scope is CacheScope.call:
+                self._varmap[_name] = f
+            else:
+                getter = _CachedGetter(f, scope, LRUCache(maxsize, ttl))
+                self._varmap[_name] = self._cached_getters[_name] = getter
+            self._invalidate_plans()
             return f
 
         return wrapper if func is None else wrapper(func)
 
     def mark_constant(self, name: str, value: Any):
+        self._cached_getters.pop(name, None)
         self._varmap[name] = lambda: value
+        self._invalidate_plans()
 
     @classmethod
     def instance(cls, name: str = "") -> Storage:
@@ -47,18 +114,260 @@ class Storage:
             cls._INSTANCES[name] = Storage()
         return cls._INSTANCES[name]
 
+    def resolve_args(self, func: Callable[..., Any], parent=None) -> list[Any]:
+        """Resolve the arguments of a function from the storage."""
+        with _stats.measure(_stats.GETTERS):
+            return self.plan(func).resolve(parent)
+
     def call(self, func: Callable[..., _R], parent=None) -> _R:
         """Call a function with variables from the storage."""
-        args = []
+        return func(*self.resolve_args(func, parent))
 
-        for v in inspect.getargs(func.__code__).args:
-            if v == "self" and parent is not None:
-                args.append(parent)
-            elif getter := self._varmap.get(v, None):
-                args.append(self.call(getter, parent=parent))
-            else:
-                raise ValueError(f"Variable {v} not found in storage")
-        return func(*args)
+    def plan(self, func: Callable[..., Any]) -> ResolutionPlan:
+        """
+        Get the compiled plan to resolve the arguments of a function.
+
+        Plans are cached until a getter or a constant is marked, or the function
+        is deleted. The plans of the callables that cannot be weakly referenced,
+        such as builtin functions, are kept in a bounded cache.
+        """
+        try:
+            if (plan := self._plans.get(func)) is None:
+                plan = self._plans[func] = ResolutionPlan.compile(func, self._varmap)
+            return plan
+        except TypeError:
+            # cannot be weakly referenced, or unhashable
+            pass
+        try:
+            if (plan := self._other_plans.get(func)) is None:
+                plan = ResolutionPlan.compile(func, self._varmap)
+                self._other_plans.put(func, plan)
+            return plan
+        except TypeError:
+            # unhashable callable object
+            return ResolutionPlan.compile(func, self._varmap)
+
+    def validate(self, func: Callable[..., Any]) -> None:
+        """
+        Check if the arguments of a function can be resolved.
+
+        Raises ValueError if the getters depend on each other cyclically. Warns if
+        some of the variables are not marked yet, as they may be marked later.
+        """
+        plan = self.plan(func)
+        if plan.cycle:
+            raise ValueError(f"Cyclic getters: {' -> '.join(plan.cycle)}")
+        if plan.missing:
+            warnings.warn(
+                f"Variables {sorted(plan.missing)} of {func!r} are not found in "
+                "the storage yet.",
+                UserWarning,
+                stacklevel=_user_stacklevel(),
+            )
+        return None
+
+    def invalidate(self, *names: str) -> None:
+        """Clear the cached values of the getters (all if no name is given)."""
+        if not names:
+            names = tuple(self._cached_getters)
+        for name in names:
+            if getter := self._cached_getters.get(name):
+                getter.cache.clear()
+        return None
+
+    def new_session(self) -> None:
+        """Clear the cached values of the session-scoped getters."""
+        for getter in self._cached_getters.values():
+            if getter.scope is CacheScope.session:
+                getter.cache.clear()
+        return None
+
+    def _invalidate_plans(self) -> None:
+        self._plans.clear()
+        self._other_plans.clear()
+        return None
+
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+
+def _user_stacklevel() -> int:
+    """Stack level of the first caller outside this package, for warnings."""
+    # level 1 is the function that calls warnings.warn
+    frame = sys._getframe(1)
+    level = 1
+    while frame.f_back is not None and frame.f_code.co_filename.startswith(
+        _PACKAGE_DIR
+    ):
+        frame = frame.f_back
+        level += 1
+    return level
+
+
+class _CachedGetter:
+    """A getter whose values are cached for each combination of the arguments."""
+
+    def __init__(
+        self, func: Callable[..., Any], scope: CacheScope, cache: LRUCache
+    ) -> None:
+        self.__wrapped__ = func  # for inspect.signature
+        self.scope = scope
+        self.cache = cache
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.__wrapped__!r}, {self.scope.value!r})"
+
+    def __call__(self, *args) -> Any:
+        try:
+            value = self.cache.get(args, _MISSING)
+        except TypeError:
+            # unhashable arguments
+            return self.__wrapped__(*args)
+        if value is _MISSING:
+            value = self.__wrapped__(*args)
+            self.cache.put(args, value)
+        return value
+
+
+# slot of the parent widget given by the "self" argument
+_PARENT = -1
+
+
+def _parameter_names(func: Callable[..., Any]) -> list[str]:
+    """Names of the arguments of a function to be resolved from the storage."""
+    if (
+        type(func) is types.FunctionType
+        and not hasattr(func, "__wrapped__")
+        and not hasattr(func, "__signature__")
+    ):
+        # read the code object instead of building the signature
+        code = func.__code__
+        names = list(code.co_varnames[: code.co_argcount])
+        ndefaults = len(func.__defaults__ or ())
+        for i in range(len(names) - ndefaults, len(names)):
+            names[i] = f"?{names[i]}"
+        return names
+    try:
+        sig = inspect.signature(func)
+    except (TypeError, ValueError):
+        # some builtins do not provide their signatures
+        return []
+    names: list[str] = []
+    for param in sig.parameters.values():
+        if param.kind not in (
+            inspect.Parameter.POSITIONAL_ONLY,
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+        ):
+            break
+        if param.default is not inspect.Parameter.empty:
+            # the default value is used if the variable is not marked
+            names.append(f"?{param.name}")
+        else:
+            names.append(param.name)
+    return names
+
+
+class ResolutionPlan:
+    """
+    A compiled plan to resolve the arguments of a function.
+
+    The getters the function depends on, directly or through other getters, are
+    sorted topologically, so that each of them is called once per resolution.
+    """
+
+    __slots__ = ("_steps", "_args", "_missing", "_cycle")
+
+    def __init__(
+        self,
+        steps: list[tuple[Callable[..., Any], tuple[int, ...]]],
+        args: tuple[int, ...],
+        missing: frozenset[str] = frozenset(),
+        cycle: tuple[str, ...] = (),
+    ) -> None:
+        self._steps = steps
+        self._args = args
+        self._missing = missing
+        self._cycle = cycle
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{len(self._steps)} getters>)"
+
+    @property
+    def missing(self) -> frozenset[str]:
+        """Names of the variables not found in the storage."""
+        return self._missing
+
+    @property
+    def cycle(self) -> tuple[str, ...]:
+        """Names of the getters that depend on each other cyclically, if any."""
+        return self._cycle
+
+    @classmethod
+    def compile(
+        cls, func: Callable[..., Any], varmap: dict[str, Callable[..., Any]]
+    ) -> ResolutionPlan:
+        """Compile the plan of a function with the given getters."""
+        steps: list[tuple[Callable[..., Any], tuple[int, ...]]] = []
+        slots: dict[str, int] = {}
+        visiting: list[str] = []
+        missing: set[str] = set()
+
+        def arg_slots(names: list[str]) -> tuple[int, ...]:
+            out: list[int] = []
+            for name in names:
+                optional = name.startswith("?")
+                name = name.lstrip("?")
+                if name == "self":
+                    out.append(_PARENT)
+                elif name in varmap:
+                    out.append(visit(name))
+                elif optional:
+                    break  # use the default values of the rest
+                else:
+                    missing.add(name)
+            return tuple(out)
+
+        def visit(name: str) -> int:
+            if (slot := slots.get(name)) is not None:
+                return slot
+            if name in visiting:
+                cycle = visiting[visiting.index(name) :] + [name]
+                raise _CycleError(tuple(cycle))
+            visiting.append(name)
+            getter = varmap[name]
+            args = arg_slots(_parameter_names(getter))
+            visiting.pop()
+            slot = slots[name] = len(steps)
+            steps.append((getter, args))
+            return slot
+
+        try:
+            args = arg_slots(_parameter_names(func))
+        except _CycleError as e:
+            return cls([], (), frozenset(missing), e.args[0])
+        if not steps and not args and not missing:
+            return _EMPTY_PLAN  # shared by the functions without arguments
+        return cls(steps, args, frozenset(missing))
+
+    def resolve(self, parent=None) -> list[Any]:
+        """Call the getters and return the arguments."""
+        if self._cycle:
+            raise ValueError(f"Cyclic getters: {' -> '.join(self._cycle)}")
+        if self._missing:
+            raise ValueError(f"Variable {min(self._missing)} not found in storage")
+        values: list[Any] = []
+        for getter, slots in self._steps:
+            values.append(
+                getter(*[parent if i == _PARENT else values[i] for i in slots])
+            )
+        return [parent if i == _PARENT else values[i] for i in self._args]
+
+
+_EMPTY_PLAN = ResolutionPlan([], ())
+
+
+class _CycleError(Exception):
+    pass
 
 
 def get_storage(name: str = "") -> Storage:
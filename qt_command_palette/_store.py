@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import itertools
+import threading
+from typing import Any, Callable, Iterable, Iterator
+import weakref
+
+from ._commands import Command
+from ._index import TrigramIndex
+from ._matcher import SearchTable
+from ._table import CommandTable
+
+# number of commands above which the substring search uses a trigram index
+INDEX_THRESHOLD = 10_000
+
+
+class CommandStore:
+    """
+    A versioned list of commands shared by the palette widgets.
+
+    Every change bumps the version, so that the views can tell if their cached
+    matches are stale. The search table is built once per version and shared by
+    all the views. Renaming a command in the store also bumps the version; the
+    commands refer to their stores weakly, so that only those are notified.
+
+    Once the store has ``index_threshold`` commands, a trigram index of the search
+    keys is created and updated incrementally as the commands are added and
+    removed. Set ``index_threshold`` to None to disable the index.
+
+    If a ``CommandTable`` is given, the commands are stored in its columns instead
+    of a list, and the store hands out the views of the table.
+    """
+
+    def __init__(
+        self,
+        commands: Iterable[Command] = (),
+        *,
+        index_threshold: int | None = INDEX_THRESHOLD,
+    ) -> None:
+        self._commands: list[Command] | CommandTable
+        if isinstance(commands, CommandTable):
+            self._commands = commands
+        else:
+            self._commands = list(commands)
+        self._version = 0
+        self._table: SearchTable | None = None
+        self._lock = threading.Lock()
+        # shared by the commands in the store, which notify it of their renames
+        self._refs = (weakref.ref(self),)
+        if isinstance(self._commands, CommandTable):
+            self._commands._stores = _joined(self._commands._stores, self._refs)
+        else:
+            self._own(self._commands)
+        # ids of the commands in the index, which increase in the order of addition
+        self._id_counter = itertools.count()
+        self._uids = [next(self._id_counter) for _ in self._commands]
+        self._index: TrigramIndex | None = None
+        self._index_threshold = index_threshold
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{len(self)} commands>, version={self._version})"
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def __iter__(self) -> Iterator[Command]:
+        return iter(self._commands)
+
+    def __getitem__(self, index: int) -> Command:
+        return self._commands[index]
+
+    @property
+    def version(self) -> int:
+        """The version number, incremented by every change."""
+        return self._version
+
+    @property
+    def commands(self) -> list[Command]:
+        """List of all the commands."""
+        return list(self._commands)
+
+    @property
+    def index(self) -> TrigramIndex | None:
+        """The trigram index of the search keys, if created."""
+        return self._index
+
+    def search_table(self) -> SearchTable:
+        """The search table of the current version."""
+        with self._lock:
+            if self._table is None:
+                table = SearchTable(self._commands)
+                if self._index is not None:
+                    self._reindex_renamed(table.keys)
+                elif (
+                    self._index_threshold is not None
+                    and len(table) >= self._index_threshold
+                ):
+                    self._index = TrigramIndex(zip(self._uids, table.keys))
+                if self._index is not None:
+                    table.index = self._index
+                    table.uids = self._uids.copy()
+                self._table = table
+            return self._table
+
+    def append(self, command: Command) -> None:
+        """Add a command."""
+        return self.extend([command])
+
+    def extend(self, commands: Iterable[Command]) -> None:
+        """Add commands."""
+        commands = list(commands)
+        uids = [next(self._id_counter) for _ in commands]
+        self._commands.extend(commands)
+        if not isinstance(self._commands, CommandTable):
+            self._own(commands)
+        self._uids.extend(uids)
+        if self._index is not None:
+            self._index.update(
+                (uid, cmd.search_key) for uid, cmd in zip(uids, commands)
+            )
+        return self._changed()
+
+    def remove(self, command: Command) -> None:
+        """Remove a command."""
+        if isinstance(self._commands, CommandTable):
+            index = self._commands.find(command)
+        else:
+            index = next(
+                (i for i, cmd in enumerate(self._commands) if cmd is command), -1
+            )
+        if index < 0:
+            raise ValueError(f"{command!r} is not in the store")
+        if not isinstance(self._commands, CommandTable):
+            self._disown([command])
+        del self._commands[index]
+        uid = self._uids.pop(index)
+        if self._index is not None:
+            self._index.remove(uid)
+        return self._changed()
+
+    def clear(self) -> None:
+        """Remove all the commands."""
+        if not isinstance(self._commands, CommandTable):
+            self._disown(self._commands)
+        self._commands.clear()
+        self._uids.clear()
+        if self._index is not None:
+            self._index.clear()
+        return self._changed()
+
+    def sort(self, key: Callable[[Command], Any], reverse: bool = False) -> None:
+        """Sort the commands."""
+        commands = self._commands
+        order = sorted(
+            range(len(commands)), key=lambda i: key(commands[i]), reverse=reverse
+        )
+        if isinstance(commands, CommandTable):
+            commands.reorder(order)
+        else:
+            self._commands = [commands[i] for i in order]
+        self._uids = [self._uids[i] for i in order]
+        return self._changed()
+
+    def _reindex_renamed(self, keys: list[str]) -> None:
+        """Index the commands whose texts are changed since they are added."""
+        index = self._index
+        assert index is not None
+        uids = self._uids
+        for i, key in enumerate(keys):
+            if index.key(uids[i]) != key:
+                index.remove(uids[i])
+                uids[i] = next(self._id_counter)
+                index.add(uids[i], key)
+        return None
+
+    def _own(self, commands: Iterable[Command]) -> None:
+        """Let the commands notify this store when they are renamed."""
+        refs = self._refs
+        for cmd in commands:
+            # the commands of one store share the tuple
+            cmd._stores = refs if not cmd._stores else _joined(cmd._stores, refs)
+        return None
+
+    def _disown(self, commands: Iterable[Command]) -> None:
+        """Stop the notifications of the removed commands."""
+        refs = self._refs
+        for cmd in commands:
+            if cmd._stores is refs:
+                cmd._stores = ()
+            else:
+                cmd._stores = tuple(ref for ref in cmd._stores if ref is not refs[0])
+        return None
+
+    def _changed(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._table = None
+        return None
+
+
+def _joined(
+    refs: tuple[weakref.ref[CommandStore], ...],
+    others: tuple[weakref.ref[CommandStore], ...],
+) -> tuple[weakref.ref[CommandStore], ...]:
+    """References to the stores of both, without the dead and duplicated ones."""
+    alive = tuple(ref for ref in refs if ref() is not None)
+    return alive + tuple(ref for ref in others if all(ref is not r for r in alive))
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+from array import array
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Sequence,
+    overload,
+    TYPE_CHECKING,
+)
+import weakref
+
+from ._commands import Command, _intern
+
+if TYPE_CHECKING:
+    from ._store import CommandStore
+
+# attributes of a command stored in the columns
+_COLUMNS = frozenset(["function", "title", "desc", "tooltip", "when"])
+
+
+class _CommandView(Command):
+    """A command handed out by a command table, written through to its row."""
+
+    __slots__ = ("_table", "_row")
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in _COLUMNS and (table := self._table) is not None:
+            table._write(self._row, name, value)
+
+
+class CommandTable(Sequence[Command]):
+    """
+    A column store of commands.
+
+    The functions, descriptions, tooltips, ``when`` conditions and search keys are
+    stored in columns, and each distinct title is stored once and referred to by
+    an array of indices. The formatted texts are not stored but built on demand.
+    No command object is kept per row; the commands are handed out as views
+    created on access, which are reused while they are referenced and write their
+    changes through to the table.
+
+    A table can be used as the container of a ``CommandStore``.
+    """
+
+    def __init__(self, commands: Iterable[Command] = ()) -> None:
+        self._functions: list[Callable[..., Any]] = []
+        self._titles: list[str] = [""]
+        self._title_ids: dict[str, int] = {"": 0}
+        self._title_index = array("I")
+        self._descs: list[str] = []
+        self._tooltips: list[str | Callable[[], str]] = []
+        self._whens: list[Any] = []
+        self._keys: list[str] = []
+        self._views: weakref.WeakValueDictionary[
+            int, _CommandView
+        ] = weakref.WeakValueDictionary()
+        # weak references to the stores of the table, notified of renames
+        self._stores: tuple[weakref.ref[CommandStore], ...] = ()
+        self.extend(commands)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{len(self)} commands>)"
+
+    def __len__(self) -> int:
+        return len(self._descs)
+
+    @overload
+    def __getitem__(self, index: int) -> Command:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Command]:
+        ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("command table index out of range")
+        if (view := self._views.get(index)) is None:
+            view = self._views[index] = self._make_view(index)
+        return view
+
+    def __iter__(self) -> Iterator[Command]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __delitem__(self, index: int) -> None:
+        if index < 0:
+            index += len(self)
+        for column in self._columns():
+            del column[index]
+        # shift the views of the following rows
+        views = dict(self._views.items())
+        self._views.clear()
+        for row, view in views.items():
+            if row == index:
+                object.__setattr__(view, "_table", None)  # detached
+            else:
+                new_row = row - 1 if row > index else row
+                object.__setattr__(view, "_row", new_row)
+                self._views[new_row] = view
+        return None
+
+    def texts(self) -> list[str]:
+        """Build the formatted texts of the commands."""
+        return self.text_builder()()
+
+    def text_builder(self) -> Callable[[], list[str]]:
+        """
+        Return a function that builds the formatted texts of the current rows.
+
+        The columns are copied, so that the texts are those of the current rows
+        even if the table is changed before the function is called.
+        """
+        titles = [f"{title}: " if title else "" for title in self._titles]
+        title_index = self._title_index[:]
+        descs = self._descs.copy()
+        return lambda: [titles[i] + desc for i, desc in zip(title_index, descs)]
+
+    @property
+    def keys(self) -> list[str]:
+        """The case-folded texts used for matching."""
+        return self._keys
+
+    def title_lengths(self) -> list[int]:
+        """Lengths of the titles of the commands."""
+        lengths = [len(title) for title in self._titles]
+        return [lengths[i] for i in self._title_index]
+
+    def append(self, command: Command) -> None:
+        """Add a command."""
+        return self.extend([command])
+
+    def extend(self, commands: Iterable[Command]) -> None:
+        """Add commands."""
+        for cmd in commands:
+            self._functions.append(cmd.function)
+            self._title_index.append(self._title_id(cmd.title))
+            self._descs.append(cmd.desc)
+            self._tooltips.append(cmd.tooltip)
+            self._whens.append(cmd.when)
+            self._keys.append(cmd.search_key)
+        return None
+
+    def find(self, command: Command) -> int:
+        """The row of the command view, or -1 if it is not handed out by this table."""
+        if isinstance(command, _CommandView) and command._table is self:
+            return command._row
+        return -1
+
+    def clear(self) -> None:
+        """Remove all the commands."""
+        for view in self._views.values():
+            object.__setattr__(view, "_table", None)
+        self._views.clear()
+        for column in self._columns():
+            del column[:]
+        self._titles[1:] = []
+        self._title_ids = {"": 0}
+        return None
+
+    def reorder(self, order: Sequence[int]) -> None:
+        """Rearrange the rows so that the ``order[i]``-th row becomes the i-th one."""
+        if sorted(order) != list(range(len(self))):
+            raise ValueError("order must be a permutation of the rows")
+        for column in self._columns():
+            reordered = [column[i] for i in order]
+            if isinstance(column, array):
+                column[:] = array(column.typecode, reordered)
+            else:
+                column[:] = reordered
+        new_rows = {old: new for new, old in enumerate(order)}
+        views = dict(self._views.items())
+        self._views.clear()
+        for row, view in views.items():
+            object.__setattr__(view, "_row", new_rows[row])
+            self._views[new_rows[row]] = view
+        return None
+
+    def _columns(self) -> list[list | array]:
+        return [
+            self._functions,
+            self._title_index,
+            self._descs,
+            self._tooltips,
+            self._whens,
+            self._keys,
+        ]
+
+    def _title_id(self, title: str) -> int:
+        if (title_id := self._title_ids.get(title)) is None:
+            title_id = self._title_ids[title] = len(self._titles)
+            self._titles.append(_intern(title))
+        return title_id
+
+    def _make_view(self, row: int) -> _CommandView:
+        view = _CommandView.__new__(_CommandView)
+        setattr_ = object.__setattr__
+        setattr_(view, "_table", None)
+        setattr_(view, "_row", row)
+        setattr_(view, "function", self._functions[row])
+        setattr_(view, "_title", self._titles[self._title_index[row]])
+        setattr_(view, "_desc", self._descs[row])
+        setattr_(view, "tooltip", self._tooltips[row])
+        setattr_(view, "when", self._whens[row])
+        setattr_(view, "_fmt", None)
+        setattr_(view, "_search_key", self._keys[row])
+        setattr_(view, "_stores", ())  # the table notifies its stores
+        setattr_(view, "_table", self)
+        return view
+
+    def _write(self, row: int, name: str, value: Any) -> None:
+        """Write a changed attribute of a view to its row."""
+        if name == "function":
+            self._functions[row] = value
+        elif name == "tooltip":
+            self._tooltips[row] = value
+        elif name == "when":
+            self._whens[row] = value
+        else:
+            if name == "title":
+                self._title_index[row] = self._title_id(value)
+            else:
+                self._descs[row] = value
+            self._keys[row] = self._views[row].search_key
+            for ref in self._stores:
+                if (store := ref()) is not None:
+                    store._changed()
+        return None
@@ -0,0 +1,385 @@
+"""
+Vectorized matching of the search keys with NumPy, if it is installed.
+
+Each search key is summarized by a 128-bit signature of the hashes of its
+character bigrams. A key can contain a word only if its signature has all the
+bits of the word's bigrams, so the commands that cannot match are dropped by a
+whole-array operation, and the rest are verified by the usual substring check.
+
+For fuzzy matching, the positions of each character in the keys, and the word
+starts and camelCase humps of the texts, are stored as 64-bit masks. Whether a
+word is a subsequence of a key, and where it occurs contiguously, are then
+found by bit operations on whole arrays.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_NBITS = 128
+# keys longer than this are not summarized and always verified
+MAX_KEY_LENGTH = 128
+
+# keys longer than this have no position masks and are matched by the loop
+MASK_WIDTH = 64
+# number of the cached position masks of the characters
+_MAX_CHAR_MASKS = 32
+
+_numpy: Any = None
+_char_classes: Any = None
+
+
+def _import_numpy():
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            _numpy = False
+        else:
+            _numpy = numpy
+    return _numpy or None
+
+
+def available() -> bool:
+    """True if NumPy is installed."""
+    return _import_numpy() is not None
+
+
+def _bigram_hashes(codes: np.ndarray) -> np.ndarray:
+    # same hash as _word_bits
+    return (codes[..., :-1] * 113 + codes[..., 1:]) & (_NBITS - 1)
+
+
+def signatures(keys: Sequence[str]) -> np.ndarray:
+    """Compute the bigram signatures of the keys as a (2, N) uint64 array."""
+    np = _import_numpy()
+    nkeys = len(keys)
+    width = min(max(map(len, keys), default=0), MAX_KEY_LENGTH)
+    if width < 2:
+        return np.zeros((2, nkeys), dtype=np.uint64)
+    # UCS4 code points, padded with zeros
+    codes = (
+        np.array(keys, dtype=f"U{width}")
+        .view(np.uint32)
+        .reshape(nkeys, width)
+        .astype(np.int64)
+    )
+    hashes = _bigram_hashes(codes)
+    hashes[codes[:, 1:] == 0] = _NBITS  # padding goes to a dummy column
+    presence = np.zeros((nkeys, _NBITS + 1), dtype=bool)
+    presence[np.arange(nkeys)[:, None], hashes] = True
+    packed = np.packbits(presence[:, :_NBITS], axis=1, bitorder="little")
+    sigs = packed.view(np.uint64).copy()
+    too_long = np.fromiter(
+        (len(key) > MAX_KEY_LENGTH for key in keys), dtype=bool, count=nkeys
+    )
+    sigs[too_long] = ~np.uint64(0)
+    # each half as a contiguous row, which is much faster to test
+    return np.ascontiguousarray(sigs.T)
+
+
+def _word_bits(words: Sequence[str]) -> np.ndarray | None:
+    """The signature bits required by the words, or None if nothing is required."""
+    np = _import_numpy()
+    presence = np.zeros(_NBITS, dtype=bool)
+    for word in words:
+        if len(word) > 1:
+            codes = np.array([ord(char) for char in word], dtype=np.int64)
+            presence[_bigram_hashes(codes)] = True
+    if not presence.any():
+        return None
+    return np.packbits(presence, bitorder="little").view(np.uint64)
+
+
+def prefilter(
+    sigs: np.ndarray, words: Sequence[str], candidates: Sequence[int]
+) -> list[int] | None:
+    """
+    Drop the candidates whose keys cannot contain all the words.
+
+    Returns the remaining candidates in the same order, or None if the words
+    cannot be used to filter or most of the candidates remain.
+    """
+    np = _import_numpy()
+    if any("\x00" in word for word in words):
+        return None  # zeros are treated as padding
+    if (required := _word_bits(words)) is None:
+        return None
+    if len(candidates) == sigs.shape[1]:
+        indices = None
+        low, high = sigs
+    else:
+        indices = np.asarray(candidates, dtype=np.intp)
+        low, high = sigs[:, indices]
+    ok = (low & required[0]) == required[0]
+    ok &= (high & required[1]) == required[1]
+    if np.count_nonzero(ok) * 2 > len(ok):
+        return None  # verifying all the candidates is as fast
+    if indices is None:
+        return np.flatnonzero(ok).tolist()
+    return indices[ok].tolist()
+
+
+def _classes() -> np.ndarray:
+    """Bit flags of the BMP characters: 1 if alphanumeric, 2 upper, 4 lower."""
+    global _char_classes
+    if _char_classes is None:
+        np = _import_numpy()
+        _char_classes = np.array(
+            [
+                char.isalnum() | char.isupper() << 1 | char.islower() << 2
+                for char in map(chr, range(0x10000))
+            ],
+            dtype=np.uint8,
+        )
+    return _char_classes
+
+
+def _codes(texts: Sequence[str], width: int) -> np.ndarray:
+    """UCS4 code points of the texts as a (N, width) array, padded with zeros."""
+    np = _import_numpy()
+    return np.array(texts, dtype=f"U{width}").view(np.uint32).reshape(len(texts), width)
+
+
+def _pack(bits: np.ndarray) -> np.ndarray:
+    """Pack a (N, width <= 64) boolean array into N masks, bit i for column i."""
+    np = _import_numpy()
+    packed = np.packbits(bits, axis=1, bitorder="little")
+    out = np.zeros((len(bits), 8), dtype=np.uint8)
+    out[:, : packed.shape[1]] = packed
+    return out.view("<u8").ravel().astype(np.uint64)
+
+
+class CharMasks:
+    """
+    Position masks of the search keys for the vectorized fuzzy matching.
+
+    Bit i of a mask stands for the i-th character of a key. The masks of each
+    character are computed on first use. Keys longer than ``MASK_WIDTH`` are
+    marked as ``long``.
+    """
+
+    def __init__(
+        self, keys: Sequence[str], texts: Sequence[str], title_lengths: Sequence[int]
+    ) -> None:
+        np = _import_numpy()
+        nkeys = len(keys)
+        lengths = np.fromiter(map(len, keys), dtype=np.intp, count=nkeys)
+        width = int(min(lengths.max(initial=1), MASK_WIDTH)) or 1
+        self.long = lengths > width
+        codes = _codes(keys, width)
+        if codes.max(initial=0) < 0x10000:
+            codes = codes.astype(np.uint16)
+        self._codes = codes
+        self._masks: OrderedDict[str, np.ndarray] = OrderedDict()
+        # the positions in the titles
+        self.titles = _pack(
+            np.arange(width) < np.asarray(title_lengths, dtype=np.intp)[:, None]
+        )
+
+        # the scorer uses the key if lower() changed the length of the text
+        texts = [
+            text if len(text) == len(key) else key for key, text in zip(keys, texts)
+        ]
+        text_codes = _codes(texts, width)
+        classes = np.zeros(text_codes.shape, dtype=np.uint8)
+        bmp = text_codes < 0x10000
+        classes[bmp] = _classes()[text_codes[bmp]]
+        for code in np.unique(text_codes[~bmp]):
+            char = chr(int(code))
+            flags = char.isalnum() | char.isupper() << 1 | char.islower() << 2
+            classes[text_codes == code] = flags
+        word_starts = np.ones(classes.shape, dtype=bool)
+        word_starts[:, 1:] = (classes[:, :-1] & 1) == 0
+        camels = np.zeros(classes.shape, dtype=bool)
+        camels[:, 1:] = ((classes[:, 1:] & 2) != 0) & ((classes[:, :-1] & 4) != 0)
+        self.word_starts = _pack(word_starts)
+        self.camels = _pack(camels)
+        self.boundaries = self.word_starts | self.camels
+        # the row numbers as Python ints, so that lists of them share the ints
+        self.rows = np.array(range(nkeys), dtype=object)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def mask(self, char: str) -> np.ndarray:
+        """The masks of the positions of a character in the keys."""
+        if (mask := self._masks.get(char)) is None:
+            np = _import_numpy()
+            code = ord(char)
+            if code > np.iinfo(self._codes.dtype).max:
+                mask = np.zeros(len(self._codes), dtype=np.uint64)
+            else:
+                mask = _pack(self._codes == code)
+            self._masks[char] = mask
+            if len(self._masks) > _MAX_CHAR_MASKS:
+                self._masks.popitem(last=False)
+        else:
+            self._masks.move_to_end(char)
+        return mask
+
+
+def _lowest_bit(masks: np.ndarray) -> np.ndarray:
+    """Keep only the lowest set bit of each mask."""
+    np = _import_numpy()
+    return masks & (~masks + np.uint64(1))
+
+
+def _above(bits: np.ndarray) -> np.ndarray:
+    """Masks of the positions after the single bits."""
+    np = _import_numpy()
+    return ~((bits << np.uint64(1)) - np.uint64(1))
+
+
+def _below_last(masks: np.ndarray) -> np.ndarray:
+    """Masks of the positions before the highest set bits."""
+    np = _import_numpy()
+    for shift in (1, 2, 4, 8, 16, 32):
+        masks = masks | (masks >> np.uint64(shift))
+    return masks >> np.uint64(1)
+
+
+def fuzzy_scores(
+    masks: CharMasks,
+    words: Sequence[str],
+    rows: np.ndarray | None,
+    *,
+    word_start_bonus: float,
+    camel_bonus: float,
+    consecutive_bonus: float,
+    title_bonus: float,
+    desc_bonus: float,
+    gap_penalty: float,
+) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Match and score the keys of the rows as ``FuzzyMatcher`` does.
+
+    Returns the positions of the matched rows and their scores. Long keys are not
+    matched. Returns None if the words cannot be matched by the masks.
+    """
+    np = _import_numpy()
+    if any("\x00" in word for word in words):
+        return None  # zeros are treated as padding
+    zero = np.uint64(0)
+    one = np.uint64(1)
+
+    # positions of each character from which the rest of the word follows
+    matched = ~(masks.long if rows is None else masks.long[rows])
+    word_masks: list[list[np.ndarray]] = []
+    word_suffixes: list[list[np.ndarray]] = []
+    for word in words:
+        char_masks = [masks.mask(char) for char in word]
+        if rows is not None:
+            char_masks = [char_mask[rows] for char_mask in char_masks]
+        suffixes = [char_masks[-1]]
+        for char_mask in reversed(char_masks[:-1]):
+            suffixes.insert(0, char_mask & _below_last(suffixes[0]))
+        matched &= suffixes[0] != zero
+        word_masks.append(char_masks)
+        word_suffixes.append(suffixes)
+
+    positions = np.flatnonzero(matched)
+    if rows is None and 2 * len(positions) > len(matched):
+        # most keys match, so scoring all of them is cheaper than gathering
+        scored = scored_rows = slice(None)
+    else:
+        scored = positions
+        scored_rows = positions if rows is None else rows[positions]
+    word_starts = masks.word_starts[scored_rows]
+    camels = masks.camels[scored_rows]
+    titles = masks.titles[scored_rows]
+    # positions where the boundary bonus is not zero
+    if word_start_bonus and camel_bonus:
+        rewarded = masks.boundaries[scored_rows]
+    else:
+        rewarded = np.zeros_like(word_starts)
+        if word_start_bonus:
+            rewarded |= word_starts
+        if camel_bonus:
+            rewarded |= camels & ~word_starts
+
+    def bonus_at(bits: np.ndarray) -> np.ndarray:
+        return np.where(
+            (bits & word_starts) != zero,
+            word_start_bonus,
+            np.where((bits & camels) != zero, camel_bonus, 0.0),
+        )
+
+    scores = np.zeros(len(word_starts), dtype=np.float64)
+    for word, char_masks, suffixes in zip(words, word_masks, word_suffixes):
+        nchars = len(word)
+        char_masks = [char_mask[scored] for char_mask in char_masks]
+        suffixes = [suffix[scored] for suffix in suffixes]
+
+        # contiguous hit: the first occurrence at a word start or with a bonus
+        starts = char_masks[0]
+        for shift, char_mask in enumerate(char_masks[1:], 1):
+            starts = starts & (char_mask >> np.uint64(shift))
+        first = _lowest_bit(starts)
+        at_bonus = starts & rewarded
+        hit = np.where(
+            ((first & word_starts) != zero) | (at_bonus == zero),
+            first,
+            _lowest_bit(at_bonus),
+        )
+        bonus = bonus_at(hit)
+        contiguous_score = (
+            nchars + bonus + (nchars - 1) * np.maximum(bonus, consecutive_bonus)
+        )
+        if nchars == 1:
+            # a character is always found contiguously
+            scores += contiguous_score
+            position = hit
+        else:
+            contiguous = starts != zero
+            # subsequence hit, starting and restarting at positions with bonuses
+            at_bonus = suffixes[0] & rewarded
+            index = np.where(
+                at_bonus != zero, _lowest_bit(at_bonus), _lowest_bit(char_masks[0])
+            )
+            start = index
+            run_bonus = bonus_at(index)
+            # added in the same order as the scorer, so that the sums are the same
+            subsequence_score = scores + (1.0 + run_bonus)
+            for char_mask, suffix in zip(char_masks[1:], suffixes[1:]):
+                following = _lowest_bit(char_mask & _above(index))
+                consecutive = following == (index << one)
+                gap_bonus = bonus_at(following)
+                ahead = _lowest_bit(suffix & rewarded & _above(following))
+                jump = (gap_bonus == 0.0) & (ahead != zero)
+                following = np.where(jump, ahead, following)
+                gap_bonus = np.where(jump, bonus_at(ahead), gap_bonus)
+                subsequence_score += np.where(
+                    consecutive,
+                    1.0 + np.maximum(run_bonus, consecutive_bonus),
+                    1.0 + gap_bonus - gap_penalty,
+                )
+                run_bonus = np.where(consecutive, run_bonus, gap_bonus)
+                index = np.where(consecutive, index << one, following)
+            scores = np.where(contiguous, scores + contiguous_score, subsequence_score)
+            position = np.where(contiguous, hit, start)
+        scores += np.where((position & titles) != zero, title_bonus, desc_bonus)
+    if scored is not positions:
+        scores = scores[positions]
+    return positions, scores
+
+
+def top_positions(values: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k largest values in ascending order; ties keep the order."""
+    np = _import_numpy()
+    if len(values) <= k:
+        return np.arange(len(values))
+    if k <= 0:
+        return np.arange(0)
+    kth = values.max()
+    if np.count_nonzero(values == kth) < k:
+        # partitioning is slow for a few distinct scores, as of short queries
+        kth = np.partition(values, len(values) - k)[len(values) - k]
+    greater = np.flatnonzero(values > kth)
+    equal = np.flatnonzero(values == kth)[: k - len(greater)]
+    return np.sort(np.concatenate([greater, equal]))
@@ -28,6 +28,7 @@ class QCommandLineEdit(QtW.QLineEdit):
                 return True
             elif key == Qt.Key.Key_Return:
                 palette = self.commandPalette()
+                palette.flush_filter()
                 if palette._list.can_execute():
                     self.commandPalette().hide()
                     self.commandPalette()._list.execute()
@@ -71,6 +72,9 @@ class QCommandPalette(QtW.QWidget):
         _layout.addWidget(self._list)
         self.setLayout(_layout)
 
+        # timer to debounce the text changes when filtering in a background thread
+        self._debounce_timer: QtCore.QTimer | None = None
+
         self._line.textChanged.connect(self._on_text_changed)
         self._list.commandClicked.connect(self._on_command_clicked)
         self._line.editingFinished.connect(self.hide)
@@ -83,6 +87,39 @@ class QCommandPalette(QtW.QWidget):
         """Set the color used for the matched characters."""
         self._list.matchColor = QtGui.QColor(color)
 
+    def set_async_filtering(self, enabled: bool = True, *, debounce: int = 30):
+        """
+        Enable or disable filtering commands in a background thread.
+
+        Parameters
+        ----------
+        enabled : bool, default True
+            If true, commands are filtered in a background thread and only the
+            result of the latest input text is displayed.
+        debounce : int, default 30
+            Text changes within this interval (in milliseconds) are coalesced
+            into one filtering.
+        """
+        if self._debounce_timer is not None:
+            self._debounce_timer.stop()
+            self._debounce_timer.deleteLater()
+            self._debounce_timer = None
+        if enabled:
+            self._debounce_timer = QtCore.QTimer(self)
+            self._debounce_timer.setSingleShot(True)
+            self._debounce_timer.setInterval(debounce)
+            self._debounce_timer.timeout.connect(self._on_debounce_timeout)
+        return None
+
+    def flush_filter(self):
+        """Apply the current input text if filtering is pending."""
+        if self._debounce_timer is None:
+            return None
+        if self._debounce_timer.isActive() or self._list.has_pending_filter():
+            self._debounce_timer.stop()
+            self._list.update_for_text(self._line.text())
+        return None
+
     def add_command(self, cmd: Command):
         self._list.add_command(cmd)
         return None
@@ -100,7 +137,22 @@ class QCommandPalette(QtW.QWidget):
         self.hide()
 
     def _on_text_changed(self, text: str):
-        self._list.update_for_text(text)
+        if self._debounce_timer is None:
+            self._list.update_for_text(text)
+        else:
+            self._debounce_timer.start()
+        return None
+
+    def _on_debounce_timeout(self):
+        self._list.update_for_text_async(self._line.text())
+        return None
+
+    def _reset_text(self):
+        self._list.reset_session()
+        self._line.setText("")
+        if self._debounce_timer is not None:
+            self._debounce_timer.stop()
+        self._list.update_for_text("")
         return None
 
     def _on_command_clicked(self, index: int):
@@ -113,8 +165,7 @@ class QCommandPalette(QtW.QWidget):
         return super().focusOutEvent(a0)
 
     def show(self):
-        self._line.setText("")
-        self._list.update_for_text("")
+        self._reset_text()
         super().show()
         if parent := self.parentWidget():
             parent_rect = parent.rect()
@@ -132,8 +183,7 @@ class QCommandPalette(QtW.QWidget):
 
     def show_center(self):
         """Show command palette widget in the center of the screen."""
-        self._line.setText("")
-        self._list.update_for_text("")
+        self._reset_text()
         self.setWindowFlags(Qt.WindowType.Dialog | Qt.WindowType.FramelessWindowHint)
         super().show()
 
@@ -155,5 +205,6 @@ class QCommandPalette(QtW.QWidget):
         return None
 
     def hide(self):
+        self._list.cancel_providers()
         self.hidden.emit()
         return super().hide()
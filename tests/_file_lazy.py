@@ -0,0 +1,9 @@
+def lazy_command(a):
+    """lazy tooltip"""
+    return a * 2
+
+
+class Namespace:
+    @staticmethod
+    def method():
+        return "method"
@@ -0,0 +1,46 @@
+import os
+import time
+
+import pytest
+
+from qt_command_palette import Command
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from qtpy import QtWidgets as QtW
+
+    app = QtW.QApplication.instance() or QtW.QApplication([])
+    yield app
+
+
+@pytest.fixture
+def wait_until(qapp):
+    """Process the Qt events until the predicate is true."""
+
+    def wait(predicate, timeout: float = 5.0):
+        t0 = time.perf_counter()
+        while not predicate():
+            if time.perf_counter() - t0 > timeout:
+                raise TimeoutError
+            qapp.processEvents()
+            time.sleep(0.001)
+        qapp.processEvents()
+
+    return wait
+
+
+@pytest.fixture
+def make_commands():
+    """Create commands of "desc" or "title: desc" texts."""
+
+    def make(*texts: str):
+        out = []
+        for text in texts:
+            title, desc = text.split(": ") if ": " in text else ("", text)
+            out.append(Command(lambda: None, title, desc))
+        return out
+
+    return make
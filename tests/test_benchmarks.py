@@ -0,0 +1,18 @@
+from benchmarks.run import compare, over_budget, run_benchmarks
+
+
+def test_benchmarks_run(qapp):
+    results = run_benchmarks("storage_call[1]", quick=True, repeat=1)
+    assert list(results) == ["storage_call[1]"]
+    base = {"storage_call[1]": dict(results["storage_call[1]"])}
+    base["storage_call[1]"]["median"] /= 2
+    assert compare(base, results) == ["storage_call[1]"]
+
+
+def test_over_budget():
+    results = {
+        "a": {"median": 2.0, "budget": 1.0},
+        "b": {"median": 0.5, "budget": 1.0},
+        "c": {"median": 2.0},
+    }
+    assert over_budget(results) == ["a"]
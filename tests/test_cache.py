@@ -0,0 +1,19 @@
+from qt_command_palette._cache import LRUCache
+
+
+def test_lru_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+    assert cache.pop("a") == 1
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (3, 0)  # "in" is not counted
+    assert cache.get("a") is None
+    assert cache.misses == 1
@@ -0,0 +1,52 @@
+from qt_command_palette import Command
+from qt_command_palette._commands import Query
+
+
+def _noop():
+    pass
+
+
+def test_search_key_is_cached():
+    cmd = Command(_noop, "File", "Open")
+    assert cmd.fmt() == "File: Open"
+    assert cmd.search_key == "file: open"
+    assert cmd.fmt() is cmd.fmt()
+    assert cmd.search_key is cmd.search_key
+
+
+def test_search_key_invalidated():
+    cmd = Command(_noop, "File", "Open")
+    assert cmd.matches("open")
+    cmd.desc = "Save"
+    assert cmd.fmt() == "File: Save"
+    assert not cmd.matches("open")
+    cmd.title = ""
+    assert cmd.fmt() == "Save"
+    assert not cmd.matches("file")
+
+
+def test_query_reused():
+    query = Query("FI  op")
+    assert query.words == ("fi", "op")
+    assert query.matches(Command(_noop, "File", "Open"))
+    assert not query.matches(Command(_noop, "File", "Save"))
+    assert Command(_noop, "File", "Open").matches(query)
+    assert Query("").matches(Command(_noop, "", "anything"))
+
+
+def test_query_refines():
+    assert Query("ab").refines(Query("a"))
+    assert Query("xab c").refines(Query("ab"))
+    assert Query("a b").refines(Query("b a"))
+    assert Query("a").refines(Query(""))
+    assert not Query("a").refines(Query("ab"))
+    assert not Query("a c").refines(Query("a b"))
+
+
+def test_compact_command():
+    title = "".join(["Fi", "le"])  # not interned
+    cmd = Command(_noop, title, "Open")
+    assert not hasattr(cmd, "__dict__")
+    assert cmd.title is Command(_noop, "File", "Save").title
+    assert cmd == Command(_noop, "File", "Open")
+    assert cmd != Command(_noop, "File", "Save")
@@ -0,0 +1,114 @@
+import pytest
+
+from qt_command_palette import Command, get_palette
+from qt_command_palette._context import ContextKeys, EnabledCache, WhenClause
+
+
+def _noop():
+    pass
+
+
+def test_when_clause():
+    clause = WhenClause("hasSelection && !readOnly")
+    assert clause.keys == {"hasSelection", "readOnly"}
+    assert clause.evaluate({"hasSelection": True})
+    assert not clause.evaluate({"hasSelection": True, "readOnly": True})
+    assert not clause.evaluate({})
+
+    clause = WhenClause("mode == 'a && b' or mode in ('x', 'y')")
+    assert clause.keys == {"mode"}
+    assert clause.evaluate({"mode": "a && b"})
+    assert clause.evaluate({"mode": "y"})
+    assert not clause.evaluate({"mode": "z"})
+    assert WhenClause("count != 0 || true").evaluate({})
+
+
+@pytest.mark.parametrize(
+    "expr", ["__import__('os')", "a.b", "f()", "a +", "[x for x in y]"]
+)
+def test_when_clause_invalid(expr):
+    with pytest.raises(ValueError):
+        WhenClause(expr)
+
+
+def test_enabled_cache():
+    context = ContextKeys()
+    ncalls = {"a": 0, "b": 0, "callable": 0}
+
+    def getter(key):
+        def _get():
+            ncalls[key] += 1
+            return True
+
+        return _get
+
+    def when():
+        ncalls["callable"] += 1
+        return True
+
+    context.add_getter("a", getter("a"))
+    context.add_getter("b", getter("b"))
+    cmds = [
+        Command(_noop, "", "1", when=WhenClause("a")),
+        Command(_noop, "", "2", when=WhenClause("a and b")),
+        Command(_noop, "", "3", when=when),
+    ]
+    cache = EnabledCache(context)
+    context.connect(cache.invalidate)
+    for _ in range(3):
+        assert all(cache.enabled(cmd) for cmd in cmds)
+    assert ncalls == {"a": 1, "b": 1, "callable": 1}
+
+    context.invalidate("b")
+    assert all(cache.enabled(cmd) for cmd in cmds)
+    assert ncalls == {"a": 1, "b": 2, "callable": 2}
+
+    context["a"] = False
+    assert [cache.enabled(cmd) for cmd in cmds] == [False, False, True]
+
+    context.invalidate()
+    assert [cache.enabled(cmd) for cmd in cmds] == [False, False, True]
+    assert ncalls == {"a": 1, "b": 2, "callable": 4}  # "a and b" short-circuits
+
+
+def test_palette_context(qapp):
+    palette = get_palette("test_palette_context")
+
+    @palette.register(when="editing")
+    def edit():
+        pass
+
+    widget = palette.get_widget()
+    widget._reset_text()
+    assert not widget._list.can_execute(0)
+    palette.context["editing"] = True
+    assert widget._list.can_execute(0)
+    palette.context["editing"] = False
+    assert not widget._list.can_execute(0)
+    with pytest.raises(ValueError):
+        palette.register(_noop, when="editing and")
+
+
+def test_states_kept_across_sessions(qapp):
+    palette = get_palette("test_states_kept_across_sessions")
+    ncalls = {"clause": 0, "callable": 0}
+
+    def getter():
+        ncalls["clause"] += 1
+        return True
+
+    def when():
+        ncalls["callable"] += 1
+        return True
+
+    palette.context.add_getter("editing", getter)
+    palette.register(_noop, desc="clause", when="editing")
+    palette.register(_noop, desc="callable", when=when)
+    widget = palette.get_widget()
+    for _ in range(3):
+        widget._reset_text()
+        assert widget._list.can_execute(0) and widget._list.can_execute(1)
+    assert ncalls == {"clause": 1, "callable": 3}
+    palette.context.invalidate("editing")
+    assert widget._list.can_execute(0)
+    assert ncalls["clause"] == 2
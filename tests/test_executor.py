@@ -0,0 +1,130 @@
+import asyncio
+import math
+import threading
+
+import pytest
+
+from qt_command_palette import Command, get_palette
+from qt_command_palette._executor import CommandExecutor
+
+
+def _command(desc: str = "cmd"):
+    return Command(lambda: None, "", desc)
+
+
+def test_sync(qapp):
+    executor = CommandExecutor()
+    finished = []
+    executor.finished.connect(lambda cmd, out: finished.append(out))
+    future = executor.submit(_command(), lambda x: x + 1, [1])
+    assert future.result() == 2
+    assert finished == [2]
+    with pytest.raises(ZeroDivisionError):
+        executor.submit(_command(), lambda: 1 / 0, [])
+
+
+def test_thread(qapp, wait_until):
+    executor = CommandExecutor()
+    finished, errored = [], []
+    executor.finished.connect(lambda cmd, out: finished.append(out))
+    executor.errored.connect(lambda cmd, exc: errored.append(exc))
+    future = executor.submit(_command(), lambda x: x * 2, [3], "thread")
+    wait_until(future.done)
+    assert future.result() == 6
+    assert finished == [6]
+
+    future = executor.submit(_command(), lambda: 1 / 0, [], "thread")
+    wait_until(future.done)
+    assert isinstance(future.exception(), ZeroDivisionError)
+    assert len(errored) == 1
+
+
+def test_asyncio(qapp, wait_until):
+    executor = CommandExecutor()
+
+    async def coro(x):
+        await asyncio.sleep(0.01)
+        return x * 3
+
+    future = executor.submit(_command(), coro, [2], "asyncio")
+    wait_until(future.done)
+    assert future.result() == 6
+    executor.shutdown()
+
+
+def test_process(qapp, wait_until):
+    executor = CommandExecutor(max_concurrent=1)
+    future = executor.submit(_command(), math.factorial, [5], "process")
+    wait_until(future.done, timeout=30)
+    assert future.result() == 120
+    executor.shutdown()
+
+
+def test_max_concurrent(qapp, wait_until):
+    executor = CommandExecutor(max_concurrent=1)
+    event = threading.Event()
+    first = executor.submit(_command(), event.wait, [5], "thread")
+    second = executor.submit(_command(), lambda: "second", [], "thread")
+    third = executor.submit(_command(), lambda: "third", [], "thread")
+    assert executor.in_flight() == 1
+    assert third.cancel()  # queued commands can be cancelled
+    assert not second.done()
+    event.set()
+    wait_until(second.done)
+    assert first.result() is True
+    assert second.result() == "second"
+    assert third.cancelled()
+    assert executor.in_flight() == 0
+
+
+def test_set_max_concurrent(qapp, wait_until):
+    executor = CommandExecutor(max_concurrent=1)
+    event = threading.Event()
+    first = executor.submit(_command(), event.wait, [5], "thread")
+    second = executor.submit(_command(), lambda: "second", [], "thread")
+    executor.set_max_concurrent(2)  # the queued command is started
+    wait_until(second.done)
+    assert not first.done()
+    executor.set_max_concurrent(1)
+    third = executor.submit(_command(), lambda: "third", [], "thread")
+    assert not third.done()
+    event.set()
+    wait_until(third.done)
+    assert executor.in_flight() == 0
+    with pytest.raises(ValueError):
+        executor.set_max_concurrent(0)
+    executor.shutdown()
+
+
+def test_palette_set_max_concurrent_keeps_executor(qapp):
+    palette = get_palette("test_palette_set_max_concurrent")
+    executor = palette.executor
+    palette.set_max_concurrent(2)
+    assert palette.executor is executor
+    assert executor.max_concurrent == 2
+
+
+def test_register_policy(qapp, wait_until):
+    palette = get_palette("test_register_policy")
+
+    @palette.register(policy="thread")
+    def run_in_thread():
+        return threading.current_thread().name
+
+    async def run_coroutine():
+        return "coroutine"
+
+    palette.register(run_coroutine)
+    with pytest.raises(ValueError):
+        palette.register(run_coroutine, policy="thread")
+
+    widget = palette.get_widget()
+    widget._list.update_for_text("run_in_thread")
+    future = widget._list.execute(0)
+    wait_until(future.done)
+    assert future.result() != threading.current_thread().name
+
+    widget._list.update_for_text("run_coroutine")
+    future = widget._list.execute(0)
+    wait_until(future.done)
+    assert future.result() == "coroutine"
@@ -0,0 +1,122 @@
+from qt_command_palette import FuzzyMatcher
+from qt_command_palette._commands import Query
+from qt_command_palette._history import UsageHistory
+from qt_command_palette._matcher import SearchTable, SubstringMatcher
+
+
+class _Clock:
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+def test_frecency(make_commands):
+    clock = _Clock()
+    history = UsageHistory(maxsize=2, half_life=10, clock=clock)
+    a, b, c = make_commands("a", "b", "c")
+    history.record(a)
+    history.record(a)
+    assert history.frecency(a) == 2
+    clock.time = 10
+    assert history.frecency(a) == 1  # half-life
+    history.record(b)
+    history.record(c)  # "a" is the least recently used
+    assert list(history.most_recent()) == ["c", "b"]
+    assert history.frecency(a) == 0
+
+
+def test_boosts_of_same_texts(make_commands):
+    from qt_command_palette._table import CommandTable
+
+    commands = make_commands("open", "save", "open", "close")
+    history = UsageHistory(clock=_Clock())
+    history.record(commands[0])
+    history.record(commands[3])
+    history.record(make_commands("removed")[0])
+    for table in [SearchTable(commands), SearchTable(CommandTable(commands))]:
+        assert table.find_text("open") == [0, 2]
+        assert table.find_text("save") == [1]
+        assert table.find_text("missing") == []
+        assert history.boosts(table) == {0: 1.0, 2: 1.0, 3: 1.0}
+
+
+def test_boosted_ranking(make_commands):
+    commands = make_commands("open", "save", "save as", "close")
+    table = SearchTable(commands)
+    history = UsageHistory()
+    for _ in range(3):
+        history.record(commands[2])
+    history.record(commands[3])
+    boost = history.boosts(table)
+    assert boost.keys() == {2, 3}
+
+    matcher = SubstringMatcher()
+    _, best = matcher.match(Query(""), table, range(4), 10, boost)
+    assert best == [2, 3, 0, 1]
+    _, best = matcher.match(Query("s"), table, range(4), 2, boost)
+    assert best == [2, 3]
+
+    # match quality and frecency are combined
+    matcher = FuzzyMatcher()
+    _, best = matcher.match(Query("save"), table, range(4), 10)
+    assert best == [1, 2]
+    _, best = matcher.match(Query("save"), table, range(4), 10, boost)
+    assert best == [2, 1]
+
+
+def test_persistent_history(tmp_path, make_commands):
+    from qt_command_palette._history import PersistentHistory
+
+    path = tmp_path / "sub" / "palette.history"
+    a, b = make_commands("File: open", "tab\tand\nnewline")
+    history = PersistentHistory(path)
+    history.record(a)
+    history.record(b)
+    history.record(a)
+    history.close()
+
+    # broken last line of a crash is ignored
+    with open(path, "a") as f:
+        f.write("E\t123")
+    loaded = PersistentHistory(path)
+    assert not loaded._loaded  # loaded lazily
+    assert list(loaded.most_recent()) == ["File: open", "tab\tand\nnewline"]
+    assert abs(loaded.frecency(a) - history.frecency(a)) < 1e-6
+
+    # recorded after an incomplete line that looks complete
+    with open(path, "a") as f:
+        f.write("E\t101.0\tFile: op")
+    loaded = PersistentHistory(path)
+    loaded.record(b)
+    loaded.close()
+    reloaded = PersistentHistory(path)
+    assert list(reloaded.most_recent()) == ["tab\tand\nnewline", "File: open"]
+
+
+def test_history_compaction(tmp_path, make_commands):
+    import time
+    from qt_command_palette._history import PersistentHistory
+
+    path = tmp_path / "palette.history"
+    history = PersistentHistory(path, maxsize=10, compact_threshold=50)
+    commands = make_commands(*[f"command {i}" for i in range(20)])
+    for i in range(200):
+        history.record(commands[i % 20])
+    history.flush()
+    with open(path) as f:
+        assert len(f.readlines()) <= 60
+    history.close()
+
+    loaded = PersistentHistory(path, maxsize=10)
+    assert list(loaded.most_recent()) == list(history.most_recent())
+
+    # loading many events
+    lines = "".join(f"E\t{i}.0\tcommand {i % 1000}\n" for i in range(100_000))
+    path.write_text(lines)
+    t0 = time.perf_counter()
+    loaded = PersistentHistory(path, maxsize=512)
+    assert len(loaded) == 512
+    assert time.perf_counter() - t0 < 5.0
+    loaded.close()
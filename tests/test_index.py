@@ -0,0 +1,52 @@
+from qt_command_palette._index import TrigramIndex
+from qt_command_palette._matcher import SubstringMatcher
+from qt_command_palette._commands import Query
+from qt_command_palette._store import CommandStore
+
+
+def _match(store: CommandStore, text: str):
+    table = store.search_table()
+    _, best = SubstringMatcher().match(Query(text), table, range(len(table)), 100)
+    return [table.commands[i].desc for i in best]
+
+
+def test_lookup():
+    index = TrigramIndex([(0, "open file"), (1, "save file"), (2, "close")])
+    assert index.lookup(["fil"]) == {0, 1}
+    assert index.lookup(["file", "sav"]) == {1}
+    assert index.lookup(["xyz"]) == set()
+    assert index.lookup(["fi", "x"]) is None  # too short to narrow down
+    index.remove(0)
+    index.add(3, "profile")
+    assert index.lookup(["file"]) == {1, 3}
+    index.remove(3)  # removed before indexed
+    assert index.lookup(["file"]) == {1}
+    assert len(index) == 2
+
+
+def test_store_index(make_commands):
+    store = CommandStore(make_commands("open", "save", "close"), index_threshold=4)
+    _match(store, "clo")
+    assert store.index is None
+
+    cmds = make_commands("save as", "close all")
+    store.extend(cmds)
+    assert _match(store, "clo") == ["close", "close all"]
+    assert store.index is not None and len(store.index) == 5
+
+    # updated incrementally
+    store.remove(cmds[1])
+    store.append(make_commands("reopen closed")[0])
+    assert _match(store, "clo") == ["close", "reopen closed"]
+    store.sort(key=lambda cmd: cmd.desc)
+    assert _match(store, "clo") == ["close", "reopen closed"]
+    assert _match(store, "sa") == ["save", "save as"]
+
+    # renamed after added
+    cmds[0].desc = "cloned"
+    store.append(make_commands("dummy")[0])
+    assert _match(store, "clo") == ["close", "reopen closed", "cloned"]
+
+    store.clear()
+    assert _match(store, "clo") == []
+    assert len(store.index) == 0
@@ -0,0 +1,206 @@
+from qt_command_palette import Command
+from qt_command_palette._list import QCommandList
+
+
+def test_update_for_text(qapp, make_commands):
+    qlist = QCommandList()
+    qlist.extend_command(make_commands("open", "save", "save as", "close"))
+    qlist.update_for_text("sa")
+    assert [cmd.desc for cmd in qlist.iter_command()] == ["save", "save as"]
+    qlist.update_for_text("")
+    assert len(list(qlist.iter_command())) == 4
+
+
+def test_narrowing(qapp, make_commands):
+    qlist = QCommandList()
+    qlist.extend_command(make_commands("open", "save", "save as", "close"))
+    for text in ["s", "sa", "sav", "save", "save ", "save as"]:
+        qlist.update_for_text(text)
+    assert [cmd.desc for cmd in qlist.iter_command()] == ["save as"]
+    assert len(qlist._match_stack) == 5  # "save " is equivalent to "save"
+
+    # backspace reuses the cached result
+    cached = qlist._match_stack[1]
+    qlist.update_for_text("sa")
+    assert qlist._match_stack[-1] is cached
+    assert [cmd.desc for cmd in qlist.iter_command()] == ["save", "save as"]
+
+    # a new command invalidates the cache
+    qlist.add_command(make_commands("sample")[0])
+    qlist.update_for_text("sa")
+    assert [cmd.desc for cmd in qlist.iter_command()] == ["save", "save as", "sample"]
+
+
+def test_fuzzy_matcher(qapp, make_commands):
+    qlist = QCommandList()
+    qlist.extend_command(make_commands("show terminal", "toggle line", "tag list"))
+    qlist.set_matcher("fuzzy")
+    qlist.update_for_text("tl")
+    assert [cmd.desc for cmd in qlist.iter_command()] == [
+        "toggle line",
+        "tag list",
+        "show terminal",
+    ]
+
+
+def test_model_and_delegate(qapp, make_commands):
+    from qtpy.QtCore import Qt
+
+    qlist = QCommandList()
+    commands = make_commands(*[f"command {i}" for i in range(500)])
+    commands[1].when = lambda: False
+    qlist.extend_command(commands)
+    qlist.set_max_rows(1000)
+    qlist.update_for_text("comm (")
+    assert qlist.model().rowCount() == 0
+    assert not qlist.can_execute()
+    qlist.update_for_text("comm")
+    model = qlist.model()
+    assert model.rowCount() == 500
+    index = model.index(1)
+    assert model.data(index, Qt.ItemDataRole.DisplayRole) == "command 1"
+    assert model.data(index, Qt.ItemDataRole.UserRole) is commands[1]
+    qlist.resize(200, 100)
+    qlist.grab()  # paint the visible rows
+
+    qlist.set_max_rows(3)
+    qlist.update_for_text("comm")
+    assert model.rowCount() == 3
+
+
+def test_shared_store(qapp, make_commands):
+    from qt_command_palette._store import CommandStore
+
+    store = CommandStore(make_commands("open", "save", "close"))
+    list_0, list_1 = QCommandList(), QCommandList()
+    list_0.set_store(store)
+    list_1.set_store(store)
+    list_0.update_for_text("")
+    list_1.update_for_text("")
+    assert list_0._search_table is list_1._search_table
+
+    # changes are visible to all the lists
+    store.append(Command(lambda _: None, "", "save as"))
+    list_1.update_for_text("save")
+    assert [cmd.desc for cmd in list_1.iter_command()] == ["save", "save as"]
+
+    # the usage history can also be shared
+    list_1.set_history(list_0.history())
+    list_1.execute(1)  # "save as"
+    list_0.update_for_text("")
+    assert [cmd.desc for cmd in list_0.iter_command()][0] == "save as"
+    assert [cmd.desc for cmd in store] == ["open", "save", "close", "save as"]
+
+
+def test_markup_cache(qapp, make_commands):
+    from qt_command_palette import SubstringMatcher
+
+    class CountingMatcher(SubstringMatcher):
+        ncalls = 0
+
+        def highlight(self, query, text):
+            self.ncalls += 1
+            return super().highlight(query, text)
+
+    matcher = CountingMatcher()
+    qlist = QCommandList()
+    qlist.set_matcher(matcher)
+    qlist.extend_command(make_commands("<b>a+b</b>", "c(d)"))
+    for text in ["a+", "(", "a+"]:
+        qlist.update_for_text(text)
+        for cmd in qlist.iter_command():
+            qlist.markup(cmd)
+            qlist.markup(cmd)
+    assert matcher.ncalls == 2
+    markup = qlist.markup(qlist.command_at(0))
+    assert markup.startswith("&lt;b&gt;<b><font color=")
+    assert "a+</font></b>b&lt;/b&gt;" in markup
+
+
+def test_empty_query_cached(qapp, make_commands):
+    qlist = QCommandList()
+    qlist.extend_command(make_commands("open", "save"))
+    qlist.update_for_text("")
+    matches = qlist.model()._matches
+    qlist.update_for_text("sa")
+    qlist.update_for_text("")
+    assert qlist._empty_best == [0, 1]
+    assert qlist.model()._matches == matches
+
+    # recomputed after the commands or the history are changed
+    qlist.add_command(make_commands("close")[0])
+    qlist.update_for_text("")
+    assert [cmd.desc for cmd in qlist.iter_command()] == ["open", "save", "close"]
+    qlist.history().record(qlist.command_at(2))
+    qlist.update_for_text("")
+    assert [cmd.desc for cmd in qlist.iter_command()] == ["close", "open", "save"]
+
+
+def test_result_cache(qapp):
+    from qt_command_palette import get_palette
+
+    palette = get_palette("test_result_cache")
+    palette.register(lambda: None, desc="save")
+    palette.register(lambda: None, desc="export")
+    qlist = palette.get_widget()._list
+    cache = palette.result_cache
+    assert qlist.result_cache() is cache
+
+    qlist.update_for_text("exp")
+    qlist.update_for_text("save")
+    qlist.update_for_text("exp")
+    assert cache.hits == 1
+    assert qlist._result is not None and qlist._result.best == [1]
+    qlist.markup(qlist.command_at(0))
+    assert qlist._result.spans == {"export": [(0, 3)]}
+
+    # registering a command invalidates the results
+    palette.register(lambda: None, desc="export all")
+    qlist.update_for_text("exp")
+    assert [cmd.desc for cmd in qlist.iter_command()] == ["export", "export all"]
+    assert cache.hits == 1
+
+    palette.set_result_cache_size(1)
+    assert qlist.result_cache() is palette.result_cache is not cache
+
+
+def test_result_cache_ranked_again_by_history(qapp):
+    from qt_command_palette import get_palette
+
+    palette = get_palette("test_result_cache_ranked_again_by_history")
+    for desc in ["open file", "open folder", "open recent", "save"]:
+        palette.register(lambda: None, desc=desc)
+    qlist = palette.get_widget()._list
+    cache = palette.result_cache
+
+    qlist.update_for_text("open")
+    assert qlist._result.matches == [0, 1, 2]
+    qlist.execute(2)  # "open recent"
+    # the cached matches are ranked again
+    qlist.update_for_text("open")
+    assert [cmd.desc for cmd in qlist.iter_command()] == [
+        "open recent",
+        "open file",
+        "open folder",
+    ]
+    assert (cache.hits, cache.misses) == (1, 1)
+    qlist.update_for_text("save")
+    qlist.update_for_text("open")
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert qlist._result.best == [2, 0, 1]
+
+
+def test_rename_registered_command(qapp):
+    from qt_command_palette import get_palette
+
+    palette = get_palette("test_rename_registered_command")
+    palette.register(lambda: None, "T", "foo")
+    qlist = palette.get_widget()._list
+    qlist.update_for_text("foo")
+    assert [cmd.desc for cmd in qlist.iter_command()] == ["foo"]
+
+    palette.commands[0].desc = "bar"
+    qlist.update_for_text("bar")
+    assert [cmd.fmt() for cmd in qlist.iter_command()] == ["T: bar"]
+    qlist.update_for_text("foo")
+    assert list(qlist.iter_command()) == []
@@ -0,0 +1,85 @@
+from qt_command_palette import FuzzyMatcher, SubstringMatcher
+from qt_command_palette._commands import Query
+from qt_command_palette._matcher import SearchTable
+
+
+def _match(matcher, text, commands, max_results=80):
+    table = SearchTable(commands)
+    _, best = matcher.match(Query(text), table, range(len(table)), max_results)
+    return [table.commands[i].fmt() for i in best]
+
+
+def test_substring_matcher_keeps_order(make_commands):
+    commands = make_commands("View: zoom out", "View: zoom in", "Edit: undo")
+    assert _match(SubstringMatcher(), "zoom", commands) == [
+        "View: zoom out",
+        "View: zoom in",
+    ]
+
+
+def test_fuzzy_subsequence(make_commands):
+    commands = make_commands("Edit: toggle line comment", "Edit: undo", "View: tiles")
+    assert _match(FuzzyMatcher(), "tgl", commands) == ["Edit: toggle line comment"]
+    assert _match(FuzzyMatcher(), "xyz", commands) == []
+
+
+def test_fuzzy_ranking(make_commands):
+    commands = make_commands(
+        "File: inexpensive",  # contiguous, not at a word start
+        "File: Exporter",  # contiguous at a word start
+        "Export: save",  # hit in the title
+        "File: e x p",  # scattered, at word starts
+    )
+    assert _match(FuzzyMatcher(), "exp", commands) == [
+        "File: Exporter",
+        "Export: save",
+        "File: e x p",
+        "File: inexpensive",
+    ]
+
+
+def test_fuzzy_camel_case(make_commands):
+    commands = make_commands(
+        "Plugins: my_plugin", "Plugins: MyPlugin", "Plugins: myplugin"
+    )
+    assert _match(FuzzyMatcher(), "plugin", commands) == [
+        "Plugins: my_plugin",
+        "Plugins: MyPlugin",
+        "Plugins: myplugin",
+    ]
+
+
+def test_fuzzy_top_k_is_stable(make_commands):
+    commands = make_commands(*[f"Group: command {i}" for i in range(100)])
+    assert _match(FuzzyMatcher(), "command", commands, 3) == [
+        "Group: command 0",
+        "Group: command 1",
+        "Group: command 2",
+    ]
+
+
+def test_fuzzy_special_characters(make_commands):
+    commands = make_commands("Math: a+b", "Math: (a)", "Math: a]b")
+    assert _match(FuzzyMatcher(), "a+", commands) == ["Math: a+b"]
+    assert _match(FuzzyMatcher(), "(", commands) == ["Math: (a)"]
+    assert _match(FuzzyMatcher(), "]b", commands) == ["Math: a]b"]
+
+
+def test_highlight():
+    query = Query("a+ (b")
+    assert SubstringMatcher().highlight(query, "A+ x (B a+") == [
+        (0, 2),
+        (5, 7),
+        (8, 10),
+    ]
+    assert SubstringMatcher().highlight(Query(""), "text") == []
+    fuzzy = FuzzyMatcher()
+    assert fuzzy.highlight(Query("tlc"), "Toggle Line Comment") == [
+        (0, 1),
+        (7, 8),
+        (12, 13),
+    ]
+    assert fuzzy.highlight(Query("line com"), "Toggle Line Comment") == [
+        (7, 11),
+        (12, 15),
+    ]
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+
+from qt_command_palette import Command, CommandProvider, get_palette
+from qt_command_palette._list import QCommandList
+
+
+def _descs(qlist: QCommandList):
+    return [cmd.desc for cmd in qlist.iter_command()]
+
+
+def test_progressive_results(qapp, wait_until):
+    provided = []
+
+    def provide(text: str):
+        for i in range(5):
+            provided.append(Command(lambda _: None, "", f"{text} {i}"))
+            yield provided[-1]
+
+    qlist = QCommandList()
+    qlist.extend_command([Command(lambda _: None, "", "static")])
+    qlist.set_providers([CommandProvider(provide, "File", batch_size=2)])
+    qlist.update_for_text("x")
+    wait_until(lambda: not qlist.has_pending_providers() and len(_descs(qlist)) == 5)
+    assert _descs(qlist) == [f"x {i}" for i in range(5)]
+    assert qlist.command_at(0).title == "File"
+    assert [cmd.title for cmd in provided] == [""] * 5  # not changed
+
+    qlist.update_for_text("")
+    wait_until(lambda: len(_descs(qlist)) == 6)
+    assert _descs(qlist)[0] == "static"
+
+
+def test_cancel_on_new_query(qapp, wait_until):
+    release = threading.Event()
+    closed = []
+
+    def provide(text: str):
+        try:
+            yield Command(lambda _: None, "", f"{text} first")
+            release.wait(5)
+            yield Command(lambda _: None, "", f"{text} second")
+        finally:
+            closed.append(text)
+
+    qlist = QCommandList()
+    qlist.set_providers([CommandProvider(provide, batch_size=1)])
+    qlist.update_for_text("old")
+    wait_until(lambda: _descs(qlist) == ["old first"])
+    stream = qlist._streams[0]
+    qlist.update_for_text("new")
+    release.set()
+    assert stream.wait(5)
+    assert stream.cancelled()
+    wait_until(lambda: not qlist.has_pending_providers())
+    assert "old" in closed
+    assert _descs(qlist) == ["new first", "new second"]
+
+    qlist.cancel_providers()
+    assert qlist._provider_text is None
+
+
+def test_async_provider(qapp, wait_until):
+    async def provide(text: str):
+        for i in range(3):
+            await asyncio.sleep(0)
+            yield Command(lambda _: None, "", f"async {i}")
+
+    async def never_ends(text: str):
+        await asyncio.sleep(100)
+        yield Command(lambda _: None, "", "never")
+
+    qlist = QCommandList()
+    qlist.set_providers([CommandProvider(provide), CommandProvider(never_ends)])
+    qlist.update_for_text("")
+    wait_until(lambda: len(_descs(qlist)) == 3)
+    streams = qlist._streams
+    qlist.cancel_providers()
+    for stream in streams:
+        assert stream.wait(5)  # the pending await is cancelled
+
+
+def test_palette_provider(qapp, wait_until):
+    palette = get_palette(name=__name__)
+    results = []
+
+    @palette.register_provider
+    def provide(text: str):
+        def run():
+            results.append(text)
+
+        yield run
+
+    widget = palette.get_widget()
+    widget._list.update_for_text("x")
+    wait_until(lambda: len(_descs(widget._list)) == 1)
+    assert _descs(widget._list) == ["run"]
+    widget._list.execute(0)
+    assert results == ["x"]
+
+    palette.remove_provider(provide)
+    widget._list.update_for_text("y")
+    assert _descs(widget._list) == []
+
+
+def test_palette_provider_title(qapp, wait_until):
+    palette = get_palette("test_palette_provider_title")
+    provided = Command(lambda: None, "", "open")
+    palette.register_provider(lambda text: [provided], title="Recent")
+    qlist = palette.get_widget()._list
+    qlist.update_for_text("o")
+    wait_until(lambda: len(_descs(qlist)) == 1)
+    assert qlist.command_at(0).fmt() == "Recent: open"
+    assert provided.title == ""
@@ -1,3 +1,5 @@
+import pytest
+
 from qt_command_palette import get_palette
 
 palette = get_palette(name=__name__)
@@ -48,3 +50,156 @@ def test_register_with_app_name():
     from . import _file_0, _file_1  # noqa
 
     assert len(palette.commands) == 2
+
+
+def test_register_after_get_widget(qapp):
+    palette = get_palette("test_register_after_get_widget")
+
+    class Parent:
+        pass
+
+    parents = [Parent(), Parent()]
+    widget_0 = palette.get_widget(parents[0])
+    widget_1 = palette.get_widget(parents[1])
+
+    @palette.register
+    def new_command():
+        pass
+
+    for widget in [widget_0, widget_1]:
+        widget._list.update_for_text("new")
+        assert [cmd.desc for cmd in widget._list.iter_command()] == ["new_command"]
+
+
+def test_lazy_install(qapp):
+    from qtpy import QtWidgets as QtW
+
+    palette = get_palette("test_lazy_install")
+    parents = [QtW.QWidget(), QtW.QWidget()]
+    palette.install(parents[0], "Ctrl+Shift+P")
+    assert len(palette._parent_to_palette_map) == 0
+    palette.show_widget(parents[0])
+    widget = palette.get_widget(parents[0])
+    assert widget.parentWidget() is parents[0]
+
+    palette.install(parents[1], prewarm=True)
+    assert id(parents[1]) not in palette._parent_to_palette_map
+    qapp.processEvents()
+    assert palette.get_widget(parents[1]).parentWidget() is parents[1]
+    widget.hide()
+
+
+def test_set_max_rows_before_built(qapp):
+    from qtpy import QtWidgets as QtW
+
+    palette = get_palette("test_set_max_rows_before_built")
+    for i in range(20):
+        palette.register(lambda: None, desc=f"command {i}")
+    parent = QtW.QWidget()
+    palette.install(parent, "Ctrl+Shift+P")
+    palette.set_max_rows(5)
+    palette.show_widget(parent)
+    widget = palette.get_widget(parent)
+    assert widget._list.model().rowCount() == 5
+    widget.hide()
+
+
+def test_register_lazy(qapp):
+    import sys
+    from qt_command_palette import get_storage
+
+    palette = get_palette("test_register_lazy")
+    get_storage("test_register_lazy").mark_constant("a", 21)
+    group = palette.add_group("Lazy")
+    group.register_lazy("tests._file_lazy:lazy_command")
+    palette.register_lazy("tests._file_lazy:Namespace.method", tooltip="given")
+    with pytest.raises(ValueError):
+        palette.register_lazy("tests._file_lazy.lazy_command")
+    assert "tests._file_lazy" not in sys.modules
+
+    cmd_0, cmd_1 = palette.commands
+    assert cmd_0.fmt() == "Lazy: lazy_command"
+    assert cmd_1.get_tooltip() == "given"
+    assert "tests._file_lazy" not in sys.modules
+    assert cmd_0.get_tooltip() == "lazy tooltip"
+    assert "tests._file_lazy" in sys.modules
+
+    widget = palette.get_widget()
+    widget._list.update_for_text("lazy")
+    assert widget._list.execute(0).result() == 42
+    widget._list.update_for_text("method")
+    assert widget._list.execute(0).result() == "method"
+
+
+def _define(name: str):
+    def fn():
+        pass
+
+    fn.__name__ = name
+    return fn
+
+
+def test_register_many():
+    palette = get_palette("test_register_many")
+    version = palette._store.version
+    group = palette.add_group("Group")
+    cmds = palette.register_many(
+        [
+            _define("f0"),
+            {"func": _define("f1"), "title": "Title", "desc": "desc", "when": "x"},
+            {"func": "tests._file_lazy:lazy_command"},
+        ]
+    )
+    cmds += group.register_many([_define(f"g{i}") for i in range(3)])
+    assert palette._store.version == version + 2
+    assert [cmd.fmt() for cmd in palette.commands] == [
+        "f0",
+        "Title: desc",
+        "lazy_command",
+        "Group: g0",
+        "Group: g1",
+        "Group: g2",
+    ]
+    with pytest.raises(ValueError):
+        palette.register_many([{"func": _define("f"), "unknown": 0}])
+    with pytest.raises(ValueError):
+        group.register_many([{"func": _define("f"), "title": "x"}])
+
+
+def test_load_manifest(tmp_path):
+    import json
+
+    palette = get_palette("test_load_manifest")
+    entries = [
+        {"func": "tests._file_lazy:lazy_command", "title": "JSON"},
+        {"func": "tests._file_lazy:Namespace.method", "desc": "method"},
+    ]
+    path = tmp_path / "commands.json"
+    path.write_text(json.dumps({"commands": entries}))
+    palette.load_manifest(path)
+
+    path = tmp_path / "commands.toml"
+    path.write_text(
+        '[[commands]]\nfunc = "tests._file_lazy:lazy_command"\ntitle = "TOML"\n'
+        'when = "hasSelection"\n'
+    )
+    palette.load_manifest(str(path))
+    assert [cmd.fmt() for cmd in palette.commands] == [
+        "JSON: lazy_command",
+        "method",
+        "TOML: lazy_command",
+    ]
+
+
+def test_missing_variable_warning_points_to_caller():
+    palette = get_palette("test_missing_variable_warning")
+    group = palette.add_group("Group")
+    for register in [
+        palette.register,
+        lambda f: palette.register(title="x")(f),
+        lambda f: palette.register_many([f]),
+        group.register,
+    ]:
+        with pytest.warns(UserWarning, match="not found") as record:
+            register(lambda missing_variable: missing_variable)
+        assert record[0].filename == __file__
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from qt_command_palette import Command, FuzzyMatcher, Matcher, SubstringMatcher
+from qt_command_palette._commands import Query
+from qt_command_palette._matcher import SearchTable
+from qt_command_palette._sharded import ShardedMatcher
+
+_WORDS = ["open", "save", "close", "file", "Toggle", "lineComment", "日本", "panel"]
+
+
+@pytest.fixture(scope="module")
+def table():
+    rng = random.Random(0)
+    return SearchTable(
+        [
+            Command(
+                lambda: None, rng.choice(_WORDS), " ".join(rng.choices(_WORDS, k=3))
+            )
+            for _ in range(3000)
+        ]
+    )
+
+
+@pytest.mark.parametrize("inner", [FuzzyMatcher(), SubstringMatcher()])
+def test_same_results(table: SearchTable, inner):
+    matcher = ShardedMatcher(inner, processes=3, threshold=0)
+    try:
+        boost = {5: 2.0, 1500: 3.0, 2999: 2.0}
+        for text in ["tog com", "file", "fi sa", "日本", "xyz"]:
+            query = Query(text)
+            expected = inner.match(query, table, range(len(table)), 20, boost)
+            assert matcher.match(query, table, range(len(table)), 20, boost) == expected
+            subset = list(range(0, len(table), 7))
+            expected = inner.match(query, table, subset, 20)
+            assert matcher.match(query, table, subset, 20) == expected
+        assert len(matcher._layouts) == 1  # built once for the table
+    finally:
+        matcher.close()
+
+
+def test_requires_rank():
+    class MyMatcher(SubstringMatcher):
+        pass
+
+    ShardedMatcher(MyMatcher())
+
+    class Unranked(Matcher):
+        def match(self, query, table, candidates, max_results, boost=None):
+            return [], []
+
+    with pytest.raises(TypeError):
+        ShardedMatcher(Unranked())
+
+
+def test_worker_keeps_one_shard(table: SearchTable):
+    from qt_command_palette import _sharded
+
+    layout = _sharded._ShardLayout(table, 3)
+    try:
+        for nth, shard in enumerate(layout.shards):
+            shard_table = _sharded._shard_table(layout.name, nth, shard)
+            assert shard_table.keys == table.keys[shard.start : shard.stop]
+            assert _sharded._worker_shard["key"] == (layout.name, nth)
+        # the block is not kept open by the worker
+        assert _sharded._shard_table(layout.name, 2, shard) is shard_table
+    finally:
+        layout.release()
+        _sharded._worker_shard.update(key=None, table=None)
@@ -0,0 +1,83 @@
+from contextlib import contextmanager
+import time
+
+from qt_command_palette import Command, get_instrumentation, get_storage
+from qt_command_palette import _stats
+from qt_command_palette._context import ContextKeys, WhenClause
+from qt_command_palette._executor import CommandExecutor
+from qt_command_palette._list import QCommandList
+
+storage = get_storage(name=__name__)
+
+
+@storage.mark_getter
+def value():
+    return 1
+
+
+def test_phases(qapp):
+    instrumentation = get_instrumentation()
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        qlist = QCommandList()
+        context = ContextKeys()
+        context["editing"] = True
+        qlist.set_context(context)
+        cmd = Command(lambda _: None, "", "save", when=WhenClause("editing"))
+        qlist.extend_command([cmd, Command(lambda _: None, "", "open")])
+        qlist.update_for_text("sa")
+        qlist.markup(cmd)
+        qlist.markup(cmd)  # cached
+        storage.call(lambda value: value)
+        CommandExecutor().submit(cmd, lambda: None, [])
+        stats = instrumentation.stats()
+    finally:
+        instrumentation.enable(False)
+    for phase in [_stats.MATCH, _stats.UPDATE, _stats.WHEN, _stats.GETTERS]:
+        assert stats[phase].count >= 1
+    assert stats[_stats.HIGHLIGHT].count == 1
+    assert stats[_stats.EXECUTE].count == 1
+    assert sum(stats[_stats.MATCH].histogram) == stats[_stats.MATCH].count
+
+
+def test_disabled():
+    instrumentation = get_instrumentation()
+    instrumentation.reset()
+    assert not instrumentation.enabled
+    assert _stats.measure(_stats.MATCH) is _stats.measure(_stats.UPDATE)
+    storage.call(lambda value: value)
+    assert instrumentation.stats() == {}
+
+
+def test_callbacks_and_hook(qapp):
+    instrumentation = _stats.Instrumentation()
+    timings, signals, entered = [], [], []
+    instrumentation.add_callback(lambda phase, sec: timings.append(phase))
+    instrumentation.qt_signals().timed.connect(lambda phase, sec: signals.append(sec))
+
+    @contextmanager
+    def hook(phase):
+        entered.append(phase)
+        yield
+
+    instrumentation.set_profiler_hook(hook)
+    instrumentation.enable()
+    try:
+        with _stats.measure(_stats.MATCH):
+            time.sleep(0.002)
+    finally:
+        instrumentation.enable(False)
+    assert timings == entered == [_stats.MATCH]
+    assert len(signals) == 1 and signals[0] >= 0.002
+
+
+def test_percentile():
+    instrumentation = _stats.Instrumentation()
+    for ms in [1, 1, 1, 100]:
+        instrumentation.record("phase", ms * 1e-3)
+    stats = instrumentation.stats()["phase"]
+    assert stats.count == 4
+    assert stats.min == 1e-3 and stats.max == 0.1
+    assert 1e-3 <= stats.percentile(50) < 3e-3
+    assert stats.percentile(100) == 0.1
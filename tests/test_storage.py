@@ -1,3 +1,5 @@
+import pytest
+
 from qt_command_palette import get_palette, get_storage
 
 palette = get_palette(name=__name__)
@@ -36,3 +38,145 @@ def test_mark_getter_with_params():
 
 def test_mark_constant():
     assert storage.call(lambda const: const) == 2
+
+
+def test_plan_is_cached_and_invalidated():
+    from qt_command_palette._storage import Storage
+
+    s = Storage()
+    s.mark_constant("x", 1)
+
+    def f(x):
+        return x
+
+    plan = s.plan(f)
+    assert s.plan(f) is plan
+    s.mark_constant("x", 2)
+    assert s.plan(f) is not plan
+    assert s.call(f) == 2
+
+
+def test_plan_does_not_keep_function_alive():
+    import gc
+    import weakref
+    from qt_command_palette._storage import Storage
+
+    s = Storage()
+    s.mark_constant("x", 1)
+
+    def f(x):
+        return x
+
+    s.plan(f)
+    ref = weakref.ref(f)
+    del f
+    gc.collect()
+    assert ref() is None
+    assert len(s._plans) == 0
+    # builtins cannot be weakly referenced
+    assert s.plan(len) is s.plan(len)
+
+
+def test_getter_called_once_per_call():
+    from qt_command_palette._storage import Storage
+
+    s = Storage()
+    ncalls = []
+
+    @s.mark_getter
+    def x():
+        ncalls.append(1)
+        return 1
+
+    @s.mark_getter
+    def y(x):
+        return x + 1
+
+    assert s.call(lambda x, y: (x, y)) == (1, 2)
+    assert len(ncalls) == 1
+
+
+def test_cycle_and_missing():
+    from qt_command_palette._storage import Storage
+
+    s = Storage()
+    s.mark_getter("p", lambda q: q)
+    s.mark_getter("q", lambda p: p)
+    with pytest.raises(ValueError, match="Cyclic"):
+        s.validate(lambda p: p)
+    with pytest.warns(UserWarning):
+        s.validate(lambda missing: missing)
+    with pytest.raises(ValueError, match="missing"):
+        s.call(lambda missing: missing)
+
+
+def test_callables_without_code():
+    from functools import partial
+
+    class Adder:
+        def __call__(self, a, const):
+            return a + const
+
+        def method(self, const):
+            return const * 10
+
+    assert storage.call(partial(lambda x, a: x + a, 100)) == 101
+    assert storage.call(Adder()) == 3
+    assert storage.call(Adder().method) == 20
+    assert storage.call(lambda a, unknown=5: a + unknown) == 6
+
+
+def test_getter_scopes():
+    from qt_command_palette._storage import Storage
+
+    s = Storage()
+    ncalls = {"session": 0, "persistent": 0}
+
+    @s.mark_getter(scope="session")
+    def session_value():
+        ncalls["session"] += 1
+        return ncalls["session"]
+
+    @s.mark_getter("persistent_value", scope="persistent", maxsize=2)
+    def _(session_value):
+        ncalls["persistent"] += 1
+        return session_value * 10
+
+    def f(session_value, persistent_value):
+        return (session_value, persistent_value)
+
+    assert s.call(f) == (1, 10)
+    assert s.call(f) == (1, 10)
+    assert ncalls == {"session": 1, "persistent": 1}
+    s.new_session()
+    assert s.call(f) == (2, 20)
+    assert ncalls == {"session": 2, "persistent": 2}
+    s.invalidate("persistent_value")
+    assert s.call(f) == (2, 20)
+    assert ncalls == {"session": 2, "persistent": 3}
+
+
+def test_getter_ttl():
+    import time
+    from qt_command_palette._storage import Storage
+
+    s = Storage()
+    values = iter(range(10))
+    s.mark_getter("v", lambda: next(values), scope="persistent", ttl=0.05)
+    assert s.call(lambda v: v) == 0
+    assert s.call(lambda v: v) == 0
+    time.sleep(0.1)
+    assert s.call(lambda v: v) == 1
+    with pytest.raises(ValueError):
+        s.mark_getter("w", lambda: 0, ttl=1)
+
+
+def test_parameter_names():
+    from qt_command_palette._storage import _parameter_names
+
+    def f(a, b=1, *args, c, **kwargs):
+        pass
+
+    assert _parameter_names(f) == ["a", "?b"]
+    assert _parameter_names(lambda: None) == []
+    assert storage.plan(lambda: None) is storage.plan(lambda: 0)  # shared
@@ -0,0 +1,134 @@
+import gc
+
+from qt_command_palette import Command
+from qt_command_palette._list import QCommandList
+from qt_command_palette._matcher import SearchTable
+from qt_command_palette._store import CommandStore
+from qt_command_palette._table import CommandTable
+
+
+def _noop(_=None):
+    pass
+
+
+def _table():
+    return CommandTable(
+        [
+            Command(_noop, "File", "Open"),
+            Command(_noop, "File", "Save"),
+            Command(_noop, "", "Close", tooltip="Close the window"),
+        ]
+    )
+
+
+def test_views():
+    table = _table()
+    assert len(table) == 3
+    assert [cmd.fmt() for cmd in table] == ["File: Open", "File: Save", "Close"]
+    assert table.texts() == ["File: Open", "File: Save", "Close"]
+    assert table.keys == ["file: open", "file: save", "close"]
+    assert table.title_lengths() == [4, 4, 0]
+    assert table[2].get_tooltip() == "Close the window"
+    assert table[0] is table[0]  # reused while referenced
+    assert table[-1].desc == "Close"
+    assert table._titles == ["", "File"]  # each title is stored once
+
+
+def test_write_through():
+    table = _table()
+    cmd = table[1]
+    cmd.desc = "Save As"
+    cmd.title = "Edit"
+    del cmd
+    gc.collect()
+    assert table[1].fmt() == "Edit: Save As"
+    assert table.keys[1] == "edit: save as"
+
+
+def test_delete_and_reorder():
+    table = _table()
+    first, last = table[0], table[2]
+    del table[1]
+    assert table[1] is last
+    table.reorder([1, 0])
+    assert table[0] is last and table[1] is first
+    assert table.find(first) == 1
+    table.clear()
+    assert len(table) == 0
+    assert table.find(first) == -1
+
+
+def test_store_with_table(qapp):
+    store = CommandStore(CommandTable())
+    store.extend([Command(_noop, "", desc) for desc in ["open", "save", "save as"]])
+    qlist = QCommandList()
+    qlist.set_store(store)
+    qlist.update_for_text("sa")
+    assert [cmd.desc for cmd in qlist.iter_command()] == ["save", "save as"]
+    store.remove(qlist.command_at(0))
+    qlist.update_for_text("sa")
+    assert [cmd.desc for cmd in qlist.iter_command()] == ["save as"]
+    qlist.set_matcher("fuzzy")
+    qlist.update_for_text("sas")
+    assert [cmd.desc for cmd in qlist.iter_command()] == ["save as"]
+
+
+def test_compact_palette(qapp):
+    from qt_command_palette import get_palette
+
+    palette = get_palette("test_compact_palette", compact=True)
+    palette.register(_noop, "Group", "run")
+    palette.register(_noop, "Group", "other")
+    assert isinstance(palette._store._commands, CommandTable)
+    qlist = palette.get_widget()._list
+    qlist.update_for_text("run")
+    assert [cmd.fmt() for cmd in qlist.iter_command()] == ["Group: run"]
+
+    # the executed view is reported, which is renamed with its row
+    started = []
+    palette.executor.started.connect(started.append)
+    qlist.execute(0)
+    assert started == [qlist.command_at(0)]
+    assert type(started[0]) is not Command
+    started[0].desc = "renamed"
+    assert palette.commands[0].fmt() == "Group: renamed"
+
+
+def test_search_table_texts_snapshot():
+    table = _table()
+    search_table = SearchTable(table)
+    table[0].desc = "Renamed"
+    table.append(Command(_noop, "", "New"))
+    assert search_table.texts == ["File: Open", "File: Save", "Close"]
+
+
+def test_rename_notifies_own_stores(make_commands):
+    open_, save = make_commands("open", "save")
+    store = CommandStore([open_])
+    other = CommandStore([save])
+    both = CommandStore([open_, save])
+    versions = (store.version, other.version, both.version)
+    open_.desc = "reopen"
+    assert (store.version, other.version, both.version) == (
+        versions[0] + 1,
+        versions[1],
+        versions[2] + 1,
+    )
+    assert store.search_table().keys == ["reopen"]
+
+    # a removed command does not notify the store
+    both.remove(open_)
+    version = both.version
+    open_.desc = "open"
+    assert both.version == version
+    assert store.search_table().keys == ["open"]
+    del store
+    gc.collect()
+    open_.desc = "reopen"  # the store is deleted
+
+    # renamed through a view of a table
+    table_store = CommandStore(_table())
+    version = table_store.version
+    table_store[0].desc = "Reopen"
+    assert table_store.version == version + 1
+    assert table_store.search_table().keys[0] == "file: reopen"
@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from qt_command_palette import Command, FuzzyMatcher
+from qt_command_palette._commands import Query
+from qt_command_palette._matcher import SearchTable, SubstringMatcher
+
+pytest.importorskip("numpy")
+
+_ALPHABET = "abcdefg xyzäé日本語🐍"
+
+
+def _random_text(rng: random.Random, max_length: int) -> str:
+    return "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(0, max_length)))
+
+
+def test_same_results_as_loop():
+    rng = random.Random(0)
+    commands = [
+        Command(lambda: None, _random_text(rng, 4), _random_text(rng, 20))
+        for _ in range(2000)
+    ]
+    commands.append(Command(lambda: None, "", "long " * 100 + "abc"))  # not summarized
+    table = SearchTable(commands)
+    vectorized = SubstringMatcher(numpy_threshold=0)
+    loop = SubstringMatcher(numpy_threshold=None)
+    queries = ["ab", "a b", "abc", "日本", "🐍a", "Äé", "ex yz", "e", "long abc"]
+    queries += [_random_text(rng, 5) for _ in range(50)]
+    for text in queries:
+        query = Query(text)
+        expected = [i for i, cmd in enumerate(commands) if cmd.matches(query)]
+        matches, _ = vectorized.match(query, table, range(len(table)), 10)
+        assert matches == expected
+        assert loop.match(query, table, range(len(table)), 10)[0] == expected
+        # a subset of the candidates
+        subset = range(0, len(table), 3)
+        matches, _ = vectorized.match(query, table, subset, 10)
+        assert matches == [i for i in expected if i % 3 == 0]
+
+
+def test_prefilter():
+    table = SearchTable(
+        [Command(lambda: None, "", desc) for desc in ["open file", "save", "close"]]
+    )
+    assert table.prefilter(["fi"], range(3)) == [0]
+    assert table.prefilter(["s", "e"], range(3)) is None  # too short to filter
+    assert table.prefilter(["lo"], [2, 1]) == [2]
+    assert table.prefilter(["lo"], [2]) is None  # nothing to drop
+
+
+_WORDS = ["open", "fileName", "toggleView", "aBc", "abab", "x_y", "a-b", "éA", "İx"]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"word_start_bonus": 0.0, "camel_bonus": 0.0},
+        {"title_bonus": 1.3, "desc_bonus": 0.2, "gap_penalty": 0.7},
+    ],
+)
+def test_fuzzy_same_results_as_loop(params):
+    rng = random.Random(0)
+
+    def text():
+        return " ".join(rng.choices(_WORDS, k=rng.randint(0, 4)))
+
+    commands = [Command(lambda: None, text(), text()) for _ in range(1000)]
+    commands.append(Command(lambda: None, "", "x" * 70 + " open"))  # long key
+    table = SearchTable(commands)
+    vectorized = FuzzyMatcher(numpy_threshold=0, **params)
+    loop = FuzzyMatcher(numpy_threshold=None, **params)
+    queries = ["o", "op", "opn", "aba", "fn", "tgv", "ob a", "x y", "i", "open"]
+    queries += [
+        "".join(rng.choices("abefilnopvx ", k=rng.randint(1, 5))) for _ in range(50)
+    ]
+    boost = {3: 2.0, 500: 1.0, 1000: 4.0}
+    for text in queries:
+        query = Query(text)
+        for candidates in [range(len(table)), list(range(0, len(table), 3))]:
+            for max_results in [1, 20]:
+                expected = loop.rank(query, table, candidates, max_results, boost)
+                assert (
+                    vectorized.rank(query, table, candidates, max_results, boost)
+                    == expected
+                )
+
+    # typed and erased, with the previous matches as the candidates
+    stack = [list(range(len(table)))]
+    for text in ["o", "op", "ope", "op", "ope", "open", "o", "op"]:
+        while len(stack) > len(text):
+            stack.pop()
+        query = Query(text)
+        ranked = vectorized.rank(query, table, stack[-1], 20, boost)
+        assert ranked == loop.rank(query, table, stack[-1], 20, boost)
+        stack.append(ranked[0])
@@ -0,0 +1,63 @@
+import time
+
+from qt_command_palette._widget import QCommandPalette
+
+
+def test_async_filtering(qapp, make_commands, wait_until):
+    widget = QCommandPalette()
+    widget.extend_command(make_commands("open", "save", "save as", "close"))
+    widget.set_async_filtering(debounce=0)
+    widget.show()
+    for char in "save as":
+        widget._line.insert(char)
+    wait_until(lambda: widget._list._input_text == "save as")
+    assert [cmd.desc for cmd in widget._list.iter_command()] == ["save as"]
+    widget.hide()
+
+
+def test_async_filtering_drops_stale_results(qapp, make_commands, wait_until):
+    widget = QCommandPalette()
+    widget.extend_command(make_commands("open", "save", "save as", "close"))
+    qlist = widget._list
+    qlist.update_for_text_async("o")
+    qlist.update_for_text_async("cl")
+    wait_until(lambda: not qlist.has_pending_filter())
+    qapp.processEvents()
+    assert qlist._input_text == "cl"
+    assert [cmd.desc for cmd in qlist.iter_command()] == ["close"]
+
+    # a synchronous update supersedes the background filtering
+    qlist.update_for_text_async("sa")
+    qlist.update_for_text("op")
+    time.sleep(0.05)
+    qapp.processEvents()
+    assert [cmd.desc for cmd in qlist.iter_command()] == ["open"]
+
+
+def test_flush_filter(qapp, make_commands):
+    widget = QCommandPalette()
+    widget.extend_command(make_commands("open", "save", "close"))
+    widget.set_async_filtering(debounce=10000)
+    widget.show()
+    widget._line.setText("clo")
+    assert widget._list._input_text == ""
+    widget.flush_filter()
+    assert [cmd.desc for cmd in widget._list.iter_command()] == ["close"]
+    widget.hide()
+
+
+def test_async_filtering_after_store_changed(qapp, make_commands, wait_until):
+    from qt_command_palette._store import CommandStore
+    from qt_command_palette._table import CommandTable
+
+    widget = QCommandPalette()
+    qlist = widget._list
+    store = CommandStore(
+        CommandTable(make_commands("open", "save", "save as", "close"))
+    )
+    qlist.set_store(store)
+    qlist.update_for_text_async("close")
+    store.remove(store[0])  # the rows are shifted before the result arrives
+    wait_until(lambda: not qlist.has_pending_filter())
+    qapp.processEvents()
+    assert [cmd.desc for cmd in qlist.iter_command()] == ["close"]